@@ -0,0 +1,256 @@
+"""Generate many projects from a single template in one process."""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import logging
+import os
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from cookiecutter.cache import get_cache_dir, prune_cache
+from cookiecutter.config import get_user_config
+from cookiecutter.exceptions import CookiecutterException, InvalidModeException
+from cookiecutter.generate import (
+    apply_overwrites_to_context,
+    generate_context,
+    generate_files,
+)
+from cookiecutter.hooks import (
+    HookLimits,
+    find_hooks,
+    has_hook_dependencies,
+    run_pre_prompt_hook,
+)
+from cookiecutter.prompt import prompt_for_config
+from cookiecutter.repository import determine_repo_dir
+from cookiecutter.utils import patch_import_path_for_repo, rmtree
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class BatchResult(NamedTuple):
+    """Outcome of generating one project of a batch.
+
+    :param extra_context: The context overrides the project was generated with.
+    :param project_dir: Path to the generated project, `None` if it failed.
+    :param error: The exception that stopped the generation, `None` on success.
+    """
+
+    extra_context: dict[str, Any]
+    project_dir: str | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the project was generated."""
+        return self.error is None
+
+
+def _build_context(
+    base_context: dict[str, Any],
+    extra_context: dict[str, Any],
+    template: str,
+    repo_dir: str,
+    output_dir: str,
+    checkout: str | None,
+) -> dict[str, Any]:
+    """Build the full context of one project without prompting."""
+    context = copy.deepcopy(base_context)
+    apply_overwrites_to_context(context['cookiecutter'], extra_context)
+    context['_cookiecutter'] = {
+        k: v for k, v in context['cookiecutter'].items() if not k.startswith("_")
+    }
+    context['cookiecutter'].update(prompt_for_config(context, no_input=True))
+    context['cookiecutter']['_template'] = template
+    context['cookiecutter']['_output_dir'] = os.path.abspath(output_dir)
+    context['cookiecutter']['_repo_dir'] = f"{repo_dir}"
+    context['cookiecutter']['_checkout'] = checkout
+    return context
+
+
+def _generate_one(
+    extra_context: dict[str, Any],
+    base_context: dict[str, Any],
+    template: str,
+    repo_dir: str,
+    output_dir: str,
+    checkout: str | None,
+    generate_kwargs: dict[str, Any],
+) -> BatchResult:
+    """Generate a single project, capturing any error in the result."""
+    try:
+        with patch_import_path_for_repo(repo_dir):
+            context = _build_context(
+                base_context, extra_context, template, repo_dir, output_dir, checkout
+            )
+            project_dir = generate_files(
+                repo_dir=repo_dir,
+                context=context,
+                output_dir=output_dir,
+                **generate_kwargs,
+            )
+    except Exception as error:
+        logger.debug('Generating %s failed: %s', extra_context, error)
+        try:
+            pickle.dumps(error)
+        except Exception:
+            # Results travel back from worker processes, keep them picklable.
+            error = CookiecutterException(f'{type(error).__name__}: {error}')
+        return BatchResult(extra_context, error=error)
+    return BatchResult(extra_context, project_dir=project_dir)
+
+
+def _worker_result(
+    future: Future[BatchResult], extra_context: dict[str, Any]
+) -> BatchResult:
+    """Return the result of a worker, or its failure if the worker died."""
+    try:
+        return future.result()
+    except Exception as error:
+        # A crashed worker breaks the pool, the other projects still get a result.
+        logger.debug('Generating %s failed: %s', extra_context, error)
+        return BatchResult(extra_context, error=error)
+
+
+def generate_many(
+    template: str,
+    contexts: Iterable[dict[str, Any]],
+    output_dir: str = '.',
+    jobs: int = 1,
+    checkout: str | None = None,
+    config_file: str | None = None,
+    default_config: bool = False,
+    password: str | None = None,
+    directory: str | None = None,
+    overwrite_if_exists: bool = False,
+    skip_if_file_exists: bool = False,
+    accept_hooks: bool = True,
+    keep_project_on_failure: bool = False,
+    template_cache: bool = True,
+    manifest: bool = False,
+    shallow_clone: bool = False,
+) -> list[BatchResult]:
+    """Generate one project per context from a single template.
+
+    The template is located, cloned or unzipped and its ``cookiecutter.json``
+    read only once. Each entry of `contexts` then overrides the template
+    defaults the same way ``extra_context`` does for `cookiecutter()`, without
+    prompting. A failing project does not stop the batch, its error is
+    returned in the matching result instead.
+
+    :param template: A directory containing a project template directory,
+        or a URL to a git repository.
+    :param contexts: Context overrides, one dictionary per project.
+    :param output_dir: Where to output the generated project dirs into.
+    :param jobs: Number of projects generated in parallel worker processes.
+    :param checkout: The branch, tag or commit ID to checkout after clone.
+    :param config_file: User configuration file path.
+    :param default_config: Use default values rather than a config file.
+    :param password: The password to use when extracting the repository.
+    :param directory: Relative path to a cookiecutter template in a repository.
+    :param overwrite_if_exists: Overwrite the contents of the output directories
+        if they exist.
+    :param skip_if_file_exists: Skip the files in the corresponding directories
+        if they already exist.
+    :param accept_hooks: Accept pre and post hooks if set to `True`.
+    :param keep_project_on_failure: If `True` keep generated project directories
+        even when generation fails.
+    :param template_cache: Keep compiled templates and unpacked zip files in
+        the cache directory between runs.
+    :param manifest: Keep a manifest of the generated files in each project
+        and only regenerate the files whose inputs changed.
+    :param shallow_clone: Only download what is needed to check out
+        `checkout` when cloning a git repository.
+    :return: One `BatchResult` per context, in the order of `contexts`.
+    """
+    config_dict = get_user_config(
+        config_file=config_file,
+        default_config=default_config,
+    )
+    cache_dir = get_cache_dir(config_dict) if template_cache else None
+    hook_limits = HookLimits.from_dict(config_dict['hook_limits'])
+    # The template is locked until every project is generated, see
+    # `determine_repo_dir()`.
+    with contextlib.ExitStack() as template_locks:
+        base_repo_dir, cleanup_base_repo_dir = determine_repo_dir(
+            template=template,
+            abbreviations=config_dict['abbreviations'],
+            clone_to_dir=config_dict['cookiecutters_dir'],
+            checkout=checkout,
+            no_input=True,
+            password=password,
+            directory=directory,
+            shallow_clone=shallow_clone or config_dict['shallow_clone'],
+            refresh=config_dict['refresh'],
+            refresh_ttl=config_dict['refresh_ttl'],
+            content_addressed=config_dict['content_addressed_clones'],
+            download_chunk_size=config_dict['download_chunk_size'],
+            archive_cache_dir=cache_dir,
+            lock_stack=template_locks,
+        )
+        repo_dir = (
+            str(run_pre_prompt_hook(base_repo_dir, hook_limits))
+            if accept_hooks
+            else base_repo_dir
+        )
+        cleanup = repo_dir != base_repo_dir
+
+        try:
+            with patch_import_path_for_repo(repo_dir):
+                base_context = generate_context(
+                    context_file=os.path.join(repo_dir, 'cookiecutter.json'),
+                    default_context=config_dict['default_context'],
+                )
+            if {"template", "templates"} & set(base_context["cookiecutter"].keys()):
+                msg = 'Batch generation does not support nested templates.'
+                raise InvalidModeException(msg)
+
+            generate_kwargs = {
+                'overwrite_if_exists': overwrite_if_exists,
+                'skip_if_file_exists': skip_if_file_exists,
+                'accept_hooks': accept_hooks,
+                'keep_project_on_failure': keep_project_on_failure,
+                'cache_dir': cache_dir,
+                'manifest': manifest,
+                # Look the hooks of the template up once for the whole batch.
+                'hook_scripts': find_hooks(
+                    repo_dir, has_hook_dependencies(base_context)
+                ),
+                'hook_limits': hook_limits,
+            }
+            args = (base_context, template, repo_dir, output_dir, checkout)
+
+            contexts = list(contexts)
+            if jobs > 1 and len(contexts) > 1:
+                logger.debug(
+                    'Generating %d projects with %d workers', len(contexts), jobs
+                )
+                with ProcessPoolExecutor(max_workers=jobs) as executor:
+                    futures = [
+                        executor.submit(_generate_one, extra, *args, generate_kwargs)
+                        for extra in contexts
+                    ]
+                    results = [
+                        _worker_result(future, extra)
+                        for future, extra in zip(futures, contexts, strict=True)
+                    ]
+            else:
+                results = [
+                    _generate_one(extra, *args, generate_kwargs) for extra in contexts
+                ]
+
+            if cache_dir is not None:
+                prune_cache(cache_dir, config_dict['cache_max_size'])
+        finally:
+            if cleanup:
+                rmtree(repo_dir)
+            if cleanup_base_repo_dir:
+                rmtree(base_repo_dir)
+
+    return results
@@ -0,0 +1,399 @@
+"""Helpers for the on-disk caches Cookiecutter keeps between runs."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import jinja2
+from binaryornot.check import is_binary
+from binaryornot.helpers import CHUNK_SIZE, has_binary_extension, is_binary_string
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+
+from cookiecutter.utils import file_lock, make_sure_path_exists, rmtree
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = '.cache'
+LAST_USED_FILE = '.last-used'
+LOCKS_DIR_NAME = '.locks'
+FILE_INDEX_VERSION = 1
+CLONE_INDEX_FILE = 'index.json'
+CLONE_INDEX_VERSION = 1
+
+
+def get_cache_dir(config_dict: dict[str, Any]) -> str:
+    """Return the cache directory configured in the user config.
+
+    Falls back to a ``.cache`` directory inside ``cookiecutters_dir`` when no
+    ``cache_dir`` is configured.
+
+    :param config_dict: The user config, as returned by `get_user_config()`.
+    """
+    cache_dir = config_dict.get('cache_dir')
+    if cache_dir:
+        return str(cache_dir)
+    return os.path.join(config_dict['cookiecutters_dir'], CACHE_DIR_NAME)
+
+
+def touch_entry(entry_dir: Path | str) -> None:
+    """Mark a cache entry directory as just used.
+
+    `prune_cache()` keeps or evicts such a directory as a whole, by the last
+    time it was used.
+    """
+    Path(entry_dir, LAST_USED_FILE).touch()
+
+
+def entry_lock_path(entry_dir: Path | str) -> str:
+    """Return the lock file guarding a cache entry directory.
+
+    Runs using the entry hold a shared lock on it, which `prune_cache()`
+    respects. The lock file lives next to the entry, so it outlives it.
+    """
+    parent, name = os.path.split(os.path.normpath(entry_dir))
+    return os.path.join(parent, LOCKS_DIR_NAME, f'{name}.lock')
+
+
+def _entry_size(entry_dir: str) -> int:
+    size = 0
+    for root, _dirs, files in os.walk(entry_dir):
+        for name in files:
+            with contextlib.suppress(OSError):
+                size += os.lstat(os.path.join(root, name)).st_size
+    return size
+
+
+def prune_cache(cache_dir: Path | str, max_size: int) -> None:
+    """Evict the least recently used files until the cache fits in `max_size`.
+
+    Directories marked with `touch_entry()` count as a single entry, used
+    when last marked, and are evicted as a whole. Entries locked by a run
+    using them, see `entry_lock_path()`, are skipped.
+
+    :param cache_dir: The cache directory to prune.
+    :param max_size: Maximum total size of the cache in bytes.
+    """
+    entries = []
+    total_size = 0
+    for root, dirs, files in os.walk(cache_dir):
+        if LOCKS_DIR_NAME in dirs:
+            dirs.remove(LOCKS_DIR_NAME)
+        if LAST_USED_FILE in files and root != os.fspath(cache_dir):
+            dirs.clear()
+            try:
+                last_used = os.stat(os.path.join(root, LAST_USED_FILE)).st_mtime
+            except OSError:
+                continue
+            size = _entry_size(root)
+            entries.append((last_used, size, root))
+            total_size += size
+            continue
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat_result.st_mtime, stat_result.st_size, path))
+            total_size += stat_result.st_size
+
+    if total_size <= max_size:
+        return
+
+    logger.debug(
+        'Cache %s holds %d bytes, pruning down to %d', cache_dir, total_size, max_size
+    )
+    for _mtime, size, path in sorted(entries):
+        try:
+            if os.path.isdir(path):
+                with file_lock(entry_lock_path(path), blocking=False):
+                    rmtree(path)
+            else:
+                os.remove(path)
+        except BlockingIOError:
+            logger.debug('Not pruning %s, it is in use', path)
+            continue
+        except OSError:
+            continue
+        total_size -= size
+        if total_size <= max_size:
+            break
+
+
+def _environment_fingerprint(environment: Environment) -> str:
+    """Describe the environment settings that affect compiled template code."""
+    settings = (
+        environment.block_start_string,
+        environment.block_end_string,
+        environment.variable_start_string,
+        environment.variable_end_string,
+        environment.comment_start_string,
+        environment.comment_end_string,
+        environment.line_statement_prefix,
+        environment.line_comment_prefix,
+        environment.trim_blocks,
+        environment.lstrip_blocks,
+        environment.newline_sequence,
+        environment.keep_trailing_newline,
+        environment.optimized,
+        environment.autoescape,
+        sorted(environment.extensions),
+    )
+    return repr(settings)
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Jinja2 bytecode cache shared by every template Cookiecutter renders.
+
+    Entries are keyed on the template name and source, the Jinja2 version and
+    the environment settings, so the same file in two checkouts of a template
+    shares one entry while an edited file or an upgraded Jinja2 gets a new one.
+    """
+
+    def __init__(self, directory: Path | str) -> None:
+        """Create the cache in `directory`, creating the directory if needed."""
+        make_sure_path_exists(directory)
+        super().__init__(str(directory), '%s.cache')
+
+    def get_bucket(
+        self,
+        environment: Environment,
+        name: str,
+        filename: str | None,  # noqa: ARG002
+        source: str,
+    ) -> Bucket:
+        """Return a cache bucket keyed on the template content."""
+        key = hashlib.sha256(
+            '\0'.join(
+                [
+                    jinja2.__version__,
+                    _environment_fingerprint(environment),
+                    name,
+                    source,
+                ]
+            ).encode('utf-8')
+        ).hexdigest()
+        bucket = Bucket(environment, key, self.get_source_checksum(source))
+        self.load_bytecode(bucket)
+        return bucket
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """Load the bytecode and mark the entry as recently used."""
+        super().load_bytecode(bucket)
+        if bucket.code is not None:
+            with contextlib.suppress(OSError):
+                os.utime(self._get_cache_filename(bucket))
+
+
+class FileInfo(NamedTuple):
+    """What Cookiecutter needs to know about a template file before rendering.
+
+    :param binary: Whether the file is copied as is rather than rendered.
+    :param newline: The first line ending found in a text file, `None` if the
+        file is binary or has no line ending.
+    """
+
+    binary: bool
+    newline: str | None = None
+
+
+def detect_newline(path: Path | str) -> str | None:
+    """Return the line ending used by the first line of a text file.
+
+    Files with mixed line endings report the first one found.
+    """
+    with open(path, encoding='utf-8') as rd:
+        return _first_newline(rd)
+
+
+def _first_newline(rd: io.TextIOWrapper) -> str | None:
+    rd.readline()  # Read only the first line to load a 'newlines' value.
+    return rd.newlines[0] if isinstance(rd.newlines, tuple) else rd.newlines
+
+
+def sniff_file(path: Path | str, binary: bool | None = None) -> FileInfo:
+    """Classify a file as binary or text and detect its line ending.
+
+    :param path: The file to inspect.
+    :param binary: Known binary status of the file, sniffed from its content
+        if `None`.
+    """
+    if binary is None:
+        binary = is_binary(str(path))
+    return FileInfo(binary, None if binary else detect_newline(path))
+
+
+def sniff_data(name: str, data: bytes, binary: bool | None = None) -> FileInfo:
+    """Classify the content of a file read into memory, like `sniff_file()`.
+
+    :param name: The name of the file, whose extension may mark it as binary.
+    :param data: The content of the file.
+    :param binary: Known binary status of the file, sniffed from `data` if
+        `None`.
+    """
+    if binary is None:
+        binary = has_binary_extension(name) or is_binary_string(data[:CHUNK_SIZE])
+    if binary:
+        return FileInfo(True)
+    with io.TextIOWrapper(io.BytesIO(data), encoding='utf-8') as rd:
+        return FileInfo(False, _first_newline(rd))
+
+
+class FileIndex:
+    """Classification of the files of one template, persisted between runs.
+
+    Entries are keyed on the file path and invalidated when the size or the
+    modification time of the file changes, so unchanged files are neither
+    sniffed for binary content nor read for their line endings again. An index
+    without a `path` lives in memory only.
+    """
+
+    def __init__(self, path: Path | str | None = None) -> None:
+        """Load the index stored at `path`, starting empty if unreadable."""
+        self.path = path
+        self._entries: dict[str, list[Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path is None:
+            return
+        try:
+            with open(path, encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == FILE_INDEX_VERSION:
+            self._entries = data.get('files', {})
+            with contextlib.suppress(OSError):
+                os.utime(path)
+
+    @classmethod
+    def for_template(cls, cache_dir: Path | str, template_dir: Path | str) -> FileIndex:
+        """Return the index of `template_dir` kept in `cache_dir`."""
+        key = hashlib.sha256(os.path.abspath(template_dir).encode('utf-8')).hexdigest()
+        return cls(Path(cache_dir, 'files', f'{key}.json'))
+
+    def classify(self, path: str, binary: bool | None = None) -> FileInfo:
+        """Return the classification of `path`, sniffing the file if needed.
+
+        :param path: The file to classify, relative to the template directory.
+        :param binary: Known binary status of the file, for example declared
+            by the template. A cached entry that disagrees is refreshed.
+        """
+        stat_result = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+        if (
+            entry is not None
+            and entry[:2] == [stat_result.st_size, stat_result.st_mtime_ns]
+            and binary in (None, entry[2])
+        ):
+            return FileInfo(entry[2], entry[3])
+
+        info = sniff_file(path, binary)
+        with self._lock:
+            self._entries[path] = [
+                stat_result.st_size,
+                stat_result.st_mtime_ns,
+                info.binary,
+                info.newline,
+            ]
+            self._dirty = True
+        return info
+
+    def save(self) -> None:
+        """Write the index back to its path if anything changed."""
+        if self.path is None or not self._dirty:
+            return
+        try:
+            with self._lock:
+                data = {'version': FILE_INDEX_VERSION, 'files': self._entries}
+                _dump_json(self.path, data)
+                self._dirty = False
+        except OSError as error:
+            logger.debug('Unable to save file index %s: %s', self.path, error)
+
+
+def _dump_json(path: Path | str, data: dict[str, Any]) -> None:
+    """Write `data` to `path` as JSON, replacing the file atomically."""
+    make_sure_path_exists(os.path.dirname(path))
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh)
+        os.replace(tmp_path, path)
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+
+class CloneIndex:
+    """Index of the repositories checked out into a content-addressed store.
+
+    For each normalized repository URL it records the commit every requested
+    ref last resolved to, and when, and the directory holding the checkout of
+    each commit. The checkouts themselves are the source of truth: the index
+    lets a ref be resolved without contacting the remote, and lists what the
+    store holds.
+    """
+
+    def __init__(self, clones_dir: Path | str) -> None:
+        """Load the index of `clones_dir`, starting empty if unreadable."""
+        self.path = os.path.join(clones_dir, CLONE_INDEX_FILE)
+        self.repos = self._load()
+
+    def _load(self) -> dict[str, dict[str, dict[str, Any]]]:
+        try:
+            with open(self.path, encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if isinstance(data, dict) and data.get('version') == CLONE_INDEX_VERSION:
+            return dict(data.get('repos', {}))
+        return {}
+
+    def lookup(
+        self, repo_url: str, ref: str, max_age: float | None = None
+    ) -> str | None:
+        """Return the commit `ref` of `repo_url` last resolved to.
+
+        :param repo_url: The normalized repository URL.
+        :param ref: The branch, tag or commit that was checked out.
+        :param max_age: Ignore resolutions older than this many seconds.
+        """
+        entry = self.repos.get(repo_url, {}).get('refs', {}).get(ref)
+        if entry is None:
+            return None
+        if max_age is not None and time.time() - entry['resolved'] > max_age:
+            return None
+        return str(entry['commit'])
+
+    def record(self, repo_url: str, ref: str, commit: str, path: str) -> None:
+        """Record that `ref` of `repo_url` resolved to `commit`, checked out at `path`.
+
+        The index is saved right away, merged with what other processes saved
+        in the meantime; failing to save it is not an error.
+        """
+        try:
+            with file_lock(f'{self.path}.lock'):
+                self.repos = self._load()
+                repo = self.repos.setdefault(repo_url, {'refs': {}, 'commits': {}})
+                repo['refs'][ref] = {'commit': commit, 'resolved': time.time()}
+                repo['commits'][commit] = os.path.relpath(
+                    path, os.path.dirname(self.path)
+                )
+                data = {'version': CLONE_INDEX_VERSION, 'repos': self.repos}
+                _dump_json(self.path, data)
+        except OSError as error:
+            logger.debug('Unable to save clone index %s: %s', self.path, error)
@@ -18,12 +18,14 @@ if TYPE_CHECKING:
 import click
 
 from cookiecutter import __version__
+from cookiecutter.batch import generate_many
 from cookiecutter.config import get_user_config
 from cookiecutter.exceptions import (
     ContextDecodingException,
     EmptyDirNameException,
     FailedHookException,
     InvalidModeException,
+    InvalidTarRepository,
     InvalidZipRepository,
     OutputDirExistsException,
     RepositoryCloneFailed,
@@ -59,6 +61,25 @@ def validate_extra_context(
     return OrderedDict(s.split('=', 1) for s in value) or None
 
 
+def read_batch_file(batch_file: str) -> list[dict[str, Any]]:
+    """Read one extra context per line from a JSON Lines file."""
+    contexts = []
+    with open(batch_file, encoding='utf-8') as file_handle:
+        for line_number, line in enumerate(file_handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                context = json.loads(line, object_pairs_hook=OrderedDict)
+            except ValueError as error:
+                msg = f"Line {line_number} of '{batch_file}' is not valid JSON: {error}"
+                raise click.BadParameter(msg, param_hint="'--batch-file'") from error
+            if not isinstance(context, dict):
+                msg = f"Line {line_number} of '{batch_file}' is not a JSON object"
+                raise click.BadParameter(msg, param_hint="'--batch-file'")
+            contexts.append(context)
+    return contexts
+
+
 def list_installed_templates(
     default_config: bool | dict[str, Any], passed_config_file: str | None
 ) -> None:
@@ -168,6 +189,39 @@ def list_installed_templates(
     is_flag=True,
     help='Do not delete project folder on failure',
 )
+@click.option(
+    '-j',
+    '--jobs',
+    type=click.IntRange(min=1),
+    default=1,
+    help='Number of worker threads used to render and write files and to run '
+    'hooks declaring their dependencies (or of worker processes generating '
+    'projects with --batch-file)',
+)
+@click.option(
+    '--no-template-cache',
+    is_flag=True,
+    help='Do not use or update the cache of compiled templates and unpacked zips',
+)
+@click.option(
+    '--manifest',
+    is_flag=True,
+    help='Keep a manifest of the generated files in the project and only '
+    'regenerate files whose template or context changed',
+)
+@click.option(
+    '--shallow-clone',
+    is_flag=True,
+    help='Only download the history needed to check out the template when '
+    'cloning a git repository',
+)
+@click.option(
+    '--batch-file',
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help='Generate one project per line of this JSON Lines file, each line '
+    'holding the extra context of a project',
+)
 def main(
     template: str,
     extra_context: dict[str, Any],
@@ -186,6 +240,11 @@ def main(
     replay_file: str | None,
     list_installed: bool,
     keep_project_on_failure: bool,
+    jobs: int,
+    no_template_cache: bool,
+    manifest: bool,
+    shallow_clone: bool,
+    batch_file: str | None,
 ) -> None:
     """Create a project from a Cookiecutter project template (TEMPLATE).
 
@@ -215,7 +274,45 @@ def main(
     if replay_file:
         replay = replay_file
 
+    if batch_file and replay:
+        msg = 'You can not use both --batch-file and --replay at the same time.'
+        raise click.UsageError(msg)
+
     try:
+        if batch_file:
+            batch_contexts = [
+                OrderedDict(extra_context or {}, **context)
+                for context in read_batch_file(batch_file)
+            ]
+            results = generate_many(
+                template,
+                batch_contexts,
+                output_dir=output_dir,
+                jobs=jobs,
+                checkout=checkout,
+                config_file=config_file,
+                default_config=default_config,
+                password=os.environ.get('COOKIECUTTER_REPO_PASSWORD'),
+                directory=directory,
+                overwrite_if_exists=overwrite_if_exists,
+                skip_if_file_exists=skip_if_file_exists,
+                accept_hooks=_accept_hooks,
+                keep_project_on_failure=keep_project_on_failure,
+                template_cache=not no_template_cache,
+                manifest=manifest,
+                shallow_clone=shallow_clone,
+            )
+            failures = [result for result in results if not result.ok]
+            for result in results:
+                if result.ok:
+                    click.echo(f'Generated {result.project_dir}')
+                else:
+                    click.echo(f'Failed {dict(result.extra_context)}: {result.error}')
+            click.echo(
+                f'{len(results) - len(failures)} of {len(results)} projects generated'
+            )
+            sys.exit(1 if failures else 0)
+
         cookiecutter(
             template,
             checkout,
@@ -231,6 +328,10 @@ def main(
             skip_if_file_exists=skip_if_file_exists,
             accept_hooks=_accept_hooks,
             keep_project_on_failure=keep_project_on_failure,
+            jobs=jobs,
+            template_cache=not no_template_cache,
+            manifest=manifest,
+            shallow_clone=shallow_clone,
         )
     except (
         ContextDecodingException,
@@ -240,6 +341,7 @@ def main(
         FailedHookException,
         UnknownExtension,
         InvalidZipRepository,
+        InvalidTarRepository,
         RepositoryNotFound,
         RepositoryCloneFailed,
     ) as e:
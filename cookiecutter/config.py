@@ -11,6 +11,7 @@ from typing import TYPE_CHECKING, Any
 import yaml
 
 from cookiecutter.exceptions import ConfigDoesNotExistException, InvalidConfiguration
+from cookiecutter.hooks import HookLimits
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -30,8 +31,18 @@ DEFAULT_CONFIG = {
     'replay_dir': os.path.expanduser('~/.cookiecutter_replay/'),
     'default_context': collections.OrderedDict([]),
     'abbreviations': BUILTIN_ABBREVIATIONS,
+    'cache_dir': None,
+    'cache_max_size': 256 * 1024 * 1024,
+    'shallow_clone': False,
+    'refresh': None,
+    'refresh_ttl': 3600,
+    'content_addressed_clones': False,
+    'download_chunk_size': 64 * 1024,
+    'hook_limits': {},
 }
 
+REFRESH_STRATEGIES = ('always', 'if-stale', 'never')
+
 
 def _expand_path(path: str) -> str:
     """Expand both environment variables and user home in the given path."""
@@ -83,6 +94,24 @@ def get_config(config_path: Path | str) -> dict[str, Any]:
     raw_cookies_dir = config_dict['cookiecutters_dir']
     config_dict['cookiecutters_dir'] = _expand_path(raw_cookies_dir)
 
+    raw_cache_dir = config_dict['cache_dir']
+    if raw_cache_dir:
+        config_dict['cache_dir'] = _expand_path(raw_cache_dir)
+
+    refresh = config_dict['refresh']
+    if refresh is not None and refresh not in REFRESH_STRATEGIES:
+        msg = (
+            f'Invalid refresh strategy {refresh!r} in {config_path}, '
+            f'expected one of: {", ".join(REFRESH_STRATEGIES)}.'
+        )
+        raise InvalidConfiguration(msg)
+
+    try:
+        HookLimits.from_dict(config_dict['hook_limits'])
+    except (TypeError, ValueError) as e:
+        msg = f'Invalid hook_limits in {config_path}: {e}'
+        raise InvalidConfiguration(msg) from e
+
     return config_dict
 
 
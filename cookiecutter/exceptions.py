@@ -110,7 +110,8 @@ class InvalidModeException(CookiecutterException):
     Exception for incompatible modes.
 
     Raised when cookiecutter is called with both `no_input==True` and
-    `replay==True` at the same time.
+    `replay==True` at the same time, or asked to keep a manifest or to run
+    hooks for a project that is not written to a directory.
     """
 
 
@@ -118,9 +119,27 @@ class FailedHookException(CookiecutterException):
     """
     Exception for hook failures.
 
-    Raised when a hook script fails.
+    Raised when a hook script fails. The end of the output of the script and
+    the time it ran for are attached, when the script ran in a subprocess.
     """
 
+    def __init__(
+        self,
+        message: str = '',
+        stdout: bytes = b'',
+        stderr: bytes = b'',
+        duration: float | None = None,
+    ) -> None:
+        """Exception for hook failures."""
+        super().__init__(message)
+        self.stdout = stdout
+        self.stderr = stderr
+        self.duration = duration
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Keep the output when pickled, such as by batch generation workers."""
+        return (type(self), (str(self), self.stdout, self.stderr, self.duration))
+
 
 class UndefinedVariableInTemplate(CookiecutterException):
     """
@@ -178,3 +197,12 @@ class InvalidZipRepository(CookiecutterException):
     Raised when the specified cookiecutter repository isn't a valid
     Zip archive.
     """
+
+
+class InvalidTarRepository(CookiecutterException):
+    """
+    Exception for bad tar repo.
+
+    Raised when the specified cookiecutter repository isn't a valid
+    tar archive, or has members outside of its top-level directory.
+    """
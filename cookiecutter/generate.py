@@ -2,39 +2,95 @@
 
 from __future__ import annotations
 
+import contextlib
 import fnmatch
+import functools
 import json
 import logging
 import os
-import shutil
+import re
 import warnings
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from binaryornot.check import is_binary
-from jinja2 import Environment, FileSystemLoader
 from jinja2.exceptions import TemplateSyntaxError, UndefinedError
 from rich.prompt import InvalidResponse
 
+from cookiecutter.cache import FileIndex, TemplateBytecodeCache
 from cookiecutter.exceptions import (
     ContextDecodingException,
     EmptyDirNameException,
+    InvalidModeException,
     OutputDirExistsException,
     UndefinedVariableInTemplate,
 )
 from cookiecutter.find import find_template
-from cookiecutter.hooks import run_hook_from_repo_dir
+from cookiecutter.hooks import (
+    HookLimits,
+    find_hooks,
+    has_hook_dependencies,
+    run_hook_from_repo_dir,
+)
+from cookiecutter.manifest import Manifest, context_hash, output_hash
 from cookiecutter.prompt import YesNoPrompt
-from cookiecutter.utils import (
-    create_env_with_context,
-    make_sure_path_exists,
-    rmtree,
-    work_in,
+from cookiecutter.sink import DirectorySink, OutputSink, encode_text
+from cookiecutter.source import (
+    DirectorySource,
+    TemplateSource,
+    archive_source,
+    filesystem_loader,
 )
+from cookiecutter.utils import create_env_with_context, has_template_markup, work_in
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from jinja2 import BaseLoader, Environment, Template
 
 logger = logging.getLogger(__name__)
 
+COPY_ONLY_MATCHER_CACHE_SIZE = 64
+PATH_TEMPLATE_CACHE_SIZE = 4096
+TEMPLATE_ENVIRONMENT_CACHE_SIZE = 16
+
+
+@functools.lru_cache(maxsize=COPY_ONLY_MATCHER_CACHE_SIZE)
+def _compile_copy_only_patterns(
+    patterns: tuple[str, ...],
+) -> Callable[[str], bool]:
+    """Compile ``_copy_without_render`` globs into a single regex matcher.
+
+    Matches exactly like calling `fnmatch.fnmatch` with each pattern in turn.
+    """
+    if not patterns:
+        return lambda _path: False
+
+    regex = re.compile(
+        '|'.join(
+            f'(?:{fnmatch.translate(os.path.normcase(pattern))})'
+            for pattern in patterns
+        )
+    )
+
+    def match(path: str) -> bool:
+        return regex.match(os.path.normcase(path)) is not None
+
+    return match
+
+
+def copy_only_matcher(context: dict[str, Any]) -> Callable[[str], bool]:
+    """Return a function telling whether a path should only be copied.
+
+    The ``_copy_without_render`` patterns of `context` are compiled once, the
+    returned function can then be called for every path of the template.
+
+    :param context: cookiecutter context.
+    """
+    patterns = context.get('cookiecutter', {}).get('_copy_without_render', [])
+    return _compile_copy_only_patterns(tuple(patterns))
+
 
 def is_copy_only_path(path: str, context: dict[str, Any]) -> bool:
     """Check whether the given `path` should only be copied and not rendered.
@@ -46,14 +102,46 @@ def is_copy_only_path(path: str, context: dict[str, Any]) -> bool:
         should be rendered or just copied.
     :param context: cookiecutter context.
     """
-    try:
-        for dont_render in context['cookiecutter']['_copy_without_render']:
-            if fnmatch.fnmatch(path, dont_render):
-                return True
-    except KeyError:
-        return False
+    return copy_only_matcher(context)(path)
+
+
+@functools.lru_cache(maxsize=PATH_TEMPLATE_CACHE_SIZE)
+def _compile_path_template(env: Environment, path: str) -> Template:
+    """Compile a path template, sharing compiled paths across the walk."""
+    return env.from_string(path)
+
 
-    return False
+def render_path(path: str, context: dict[str, Any], env: Environment) -> str:
+    """Render a file or directory path with the given context.
+
+    Paths without any Jinja markup are returned as-is without compiling a
+    template, the others are compiled once and kept in an LRU cache.
+
+    :param path: The unrendered path.
+    :param context: Dict for populating the cookiecutter's variables.
+    :param env: Jinja2 template execution environment.
+    """
+    if not has_template_markup(path, env):
+        return path
+    return _compile_path_template(env, path).render(**context)
+
+
+def declared_binary(path: str, context: dict[str, Any]) -> bool | None:
+    """Return whether the template declares `path` as binary or text.
+
+    Templates list extensions in ``_binary_extensions`` and
+    ``_text_extensions`` to skip sniffing the content of those files.
+    Returns `None` when the extension of `path` is not declared.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if not extension:
+        return None
+    cookiecutter_dict = context.get('cookiecutter', {})
+    for key, binary in (('_binary_extensions', True), ('_text_extensions', False)):
+        declared = cookiecutter_dict.get(key) or []
+        if extension in {f".{ext.lower().lstrip('.')}" for ext in declared}:
+            return binary
+    return None
 
 
 def apply_overwrites_to_context(
@@ -178,7 +266,10 @@ def generate_file(
     context: dict[str, Any],
     env: Environment,
     skip_if_file_exists: bool = False,
-) -> None:
+    file_index: FileIndex | None = None,
+    source: TemplateSource | None = None,
+    sink: OutputSink | None = None,
+) -> bool:
     """Render filename of infile as name of outfile, handle infile correctly.
 
     Dealing with infile appropriately:
@@ -187,6 +278,9 @@ def generate_file(
         b. If infile is a text file, render its contents and write the
            rendered infile to outfile.
 
+    An existing outfile that already has the content to write is left
+    untouched, keeping its modification time.
+
     Precondition:
 
         When calling `generate_file()`, the root template dir must be the
@@ -198,31 +292,39 @@ def generate_file(
         template dir.
     :param context: Dict for populating the cookiecutter's variables.
     :param env: Jinja2 template execution environment.
+    :param skip_if_file_exists: Skip the file if it already exists.
+    :param file_index: Index holding the classification of template files
+        from earlier runs. Files are sniffed every time if not given.
+    :param source: Source to read the template files from, the template
+        directory in the current working directory if not given.
+    :param sink: Where to write outfile, to the filesystem if not given.
+    :return: True if outfile was written, False if it was left untouched.
     """
     logger.debug('Processing file %s', infile)
+    if sink is None:
+        sink = DirectorySink()
 
     # Render the path to the output file (not including the root project dir)
-    outfile_tmpl = env.from_string(infile)
-
-    outfile = os.path.join(project_dir, outfile_tmpl.render(**context))
-    file_name_is_empty = os.path.isdir(outfile)
+    outfile = os.path.join(project_dir, render_path(infile, context, env))
+    file_name_is_empty = sink.isdir(outfile)
     if file_name_is_empty:
         logger.debug('The resulting file name is empty: %s', outfile)
-        return
+        return False
 
-    if skip_if_file_exists and os.path.exists(outfile):
+    if skip_if_file_exists and sink.exists(outfile):
         logger.debug('The resulting file already exists: %s', outfile)
-        return
+        return False
 
     logger.debug('Created file at %s', outfile)
 
     # Just copy over binary files. Don't render.
     logger.debug("Check %s to see if it's a binary", infile)
-    if is_binary(infile):
+    if source is None:
+        source = DirectorySource(file_index)
+    file_info = source.classify(infile, declared_binary(infile, context))
+    if file_info.binary:
         logger.debug('Copying binary %s to %s without rendering', infile, outfile)
-        shutil.copyfile(infile, outfile)
-        shutil.copymode(infile, outfile)
-        return
+        return sink.copy_file(source, infile, outfile)
 
     # Force fwd slashes on Windows for get_template
     # This is a by-design Jinja issue
@@ -236,28 +338,33 @@ def generate_file(
         # information about syntax error location
         exception.translated = False
         raise
-    rendered_file = tmpl.render(**context)
 
     if context['cookiecutter'].get('_new_lines', False):
         # Use `_new_lines` from context, if configured.
         newline = context['cookiecutter']['_new_lines']
         logger.debug('Using configured newline character %s', repr(newline))
     else:
-        # Detect original file newline to output the rendered file.
-        # Note that newlines can be a tuple if file contains mixed line endings.
-        # In this case, we pick the first line ending we detected.
-        with open(infile, encoding='utf-8') as rd:
-            rd.readline()  # Read only the first line to load a 'newlines' value.
-        newline = rd.newlines[0] if isinstance(rd.newlines, tuple) else rd.newlines
+        # Use the newline detected in the original file. If the file contains
+        # mixed line endings, this is the first line ending detected.
+        newline = file_info.newline
         logger.debug('Using detected newline character %s', repr(newline))
 
-    logger.debug('Writing contents to file %s', outfile)
+    # The output file gets the permissions of the template file
+    mode = source.mode(infile)
+
+    if context['cookiecutter'].get('_stream_render', False):
+        logger.debug('Streaming contents to file %s', outfile)
+        written = sink.write_text(outfile, tmpl.generate(**context), newline, mode)
+    else:
+        rendered_file = tmpl.render(**context)
+
+        logger.debug('Writing contents to file %s', outfile)
 
-    with open(outfile, 'w', encoding='utf-8', newline=newline) as fh:
-        fh.write(rendered_file)
+        written = sink.write(outfile, encode_text(rendered_file, newline), mode)
 
-    # Apply file permissions to output file
-    shutil.copymode(infile, outfile)
+    if not written:
+        logger.debug('File %s is unchanged, not writing it', outfile)
+    return written
 
 
 def render_and_create_dir(
@@ -266,14 +373,17 @@ def render_and_create_dir(
     output_dir: Path | str,
     environment: Environment,
     overwrite_if_exists: bool = False,
+    sink: OutputSink | None = None,
 ) -> tuple[Path, bool]:
-    """Render name of a directory, create the directory, return its path."""
+    """Render name of a directory, create the directory, return its path.
+
+    The directory is created in `sink`, on the filesystem if not given.
+    """
     if not dirname or dirname == "":
         msg = 'Error: directory name is empty'
         raise EmptyDirNameException(msg)
 
-    name_tmpl = environment.from_string(dirname)
-    rendered_dirname = name_tmpl.render(**context)
+    rendered_dirname = render_path(dirname, context, environment)
 
     dir_to_create = Path(output_dir, rendered_dirname)
 
@@ -281,7 +391,9 @@ def render_and_create_dir(
         'Rendered dir %s must exist in output_dir %s', dir_to_create, output_dir
     )
 
-    output_dir_exists = dir_to_create.exists()
+    if sink is None:
+        sink = DirectorySink()
+    output_dir_exists = sink.exists(dir_to_create)
 
     if output_dir_exists:
         if overwrite_if_exists:
@@ -292,11 +404,110 @@ def render_and_create_dir(
             msg = f'Error: "{dir_to_create}" directory already exists'
             raise OutputDirExistsException(msg)
     else:
-        make_sure_path_exists(dir_to_create)
+        sink.make_dir(dir_to_create)
 
     return dir_to_create, not output_dir_exists
 
 
+@functools.lru_cache(maxsize=TEMPLATE_ENVIRONMENT_CACHE_SIZE)
+def _template_environment(
+    env: Environment, template_dir: str, cache_dir: str | None
+) -> Environment:
+    """Return an overlay of `env` that loads templates from `template_dir`.
+
+    The environment passed in is shared with prompting and hooks, so the loader
+    is only set on the overlay. Overlays are kept per template directory, which
+    lets repeated generations from one template reuse the compiled templates.
+    """
+    return _overlay_environment(env, filesystem_loader(template_dir), cache_dir)
+
+
+def _overlay_environment(
+    env: Environment, loader: BaseLoader, cache_dir: str | None
+) -> Environment:
+    return env.overlay(
+        loader=loader,
+        bytecode_cache=(
+            TemplateBytecodeCache(Path(cache_dir, 'jinja'))
+            if cache_dir is not None
+            else None
+        ),
+    )
+
+
+def _generate_planned_file(
+    infile: str,
+    project_dir: str,
+    context: dict[str, Any],
+    env: Environment,
+    skip_if_file_exists: bool,
+    is_copy_only: Callable[[str], bool],
+    file_index: FileIndex | None = None,
+    manifest: Manifest | None = None,
+    source: TemplateSource | None = None,
+    sink: OutputSink | None = None,
+) -> bool:
+    """Copy or render a single file collected while walking the template.
+
+    Must be called with the root template dir as the current working directory.
+    Returns whether the output file was written.
+    """
+    if source is None:
+        source = DirectorySource(file_index)
+    if sink is None:
+        sink = DirectorySink()
+    try:
+        outfile = os.path.join(project_dir, render_path(infile, context, env))
+        if manifest is not None:
+            path = os.path.relpath(outfile, project_dir).replace(os.path.sep, '/')
+            template_hash = source.file_hash(infile)
+            previous_output_hash = output_hash(outfile)
+            if manifest.is_up_to_date(path, template_hash, previous_output_hash):
+                logger.debug('File %s is up to date, leaving it alone', outfile)
+                return False
+
+        if is_copy_only(infile):
+            logger.debug('Copying file %s to %s without rendering', infile, outfile)
+            written = sink.copy_file(source, infile, outfile)
+        else:
+            written = generate_file(
+                project_dir,
+                infile,
+                context,
+                env,
+                skip_if_file_exists,
+                file_index,
+                source,
+                sink,
+            )
+    except UndefinedError as err:
+        msg = f"Unable to create file '{infile}'"
+        raise UndefinedVariableInTemplate(msg, err, context) from err
+
+    if manifest is not None:
+        manifest.record(path, outfile, template_hash, previous_output_hash)
+    return written
+
+
+def _group_by_output(
+    planned_files: list[str], context: dict[str, Any], env: Environment
+) -> list[list[str]]:
+    """Group the planned files rendering to the same output path, in plan order.
+
+    The files of a group are generated one after the other, so the last one
+    in walk order wins like in a serial run. Files whose path fails to render
+    are left on their own, to report the error when they are generated.
+    """
+    groups: dict[str, list[str]] = {}
+    for infile in planned_files:
+        try:
+            outfile = os.path.normpath(render_path(infile, context, env))
+        except UndefinedError:
+            outfile = infile
+        groups.setdefault(outfile, []).append(infile)
+    return list(groups.values())
+
+
 def _run_hook_from_repo_dir(
     repo_dir: str,
     hook_name: str,
@@ -324,6 +535,23 @@ def _run_hook_from_repo_dir(
     )
 
 
+def _check_off_disk_generation(
+    hook_scripts: dict[str, list[str]], accept_hooks: bool, manifest: bool
+) -> None:
+    """Check that a project can be generated without writing it to disk."""
+    if manifest:
+        msg = 'A manifest can only be kept for a project written to a directory'
+        raise InvalidModeException(msg)
+    if accept_hooks and (
+        hook_scripts['pre_gen_project'] or hook_scripts['post_gen_project']
+    ):
+        msg = (
+            'The hooks of the template need the project written to a '
+            'directory, generate it without hooks to write it elsewhere'
+        )
+        raise InvalidModeException(msg)
+
+
 def generate_files(
     repo_dir: Path | str,
     context: dict[str, Any] | None = None,
@@ -332,6 +560,12 @@ def generate_files(
     skip_if_file_exists: bool = False,
     accept_hooks: bool = True,
     keep_project_on_failure: bool = False,
+    jobs: int = 1,
+    cache_dir: Path | str | None = None,
+    manifest: bool = False,
+    sink: OutputSink | None = None,
+    hook_scripts: dict[str, list[str]] | None = None,
+    hook_limits: HookLimits | None = None,
 ) -> str:
     """Render the templates and saves them to files.
 
@@ -345,19 +579,48 @@ def generate_files(
     :param accept_hooks: Accept pre and post hooks if set to `True`.
     :param keep_project_on_failure: If `True` keep generated project directory even when
         generation fails
+    :param jobs: Number of worker threads used to render and write files, and
+        to run the hook scripts of templates declaring their dependencies.
+        The default of 1 generates the files one at a time.
+    :param cache_dir: Directory to keep compiled templates, hook scripts
+        without template markup and the classification of template files in
+        between runs.
+        Templates are compiled and files sniffed every time if not given.
+    :param manifest: Keep a manifest of the generated files in the project
+        directory and leave files alone whose template, context and content
+        did not change since the manifest was written.
+    :param sink: Where to write the project, to a directory in `output_dir`
+        if not given. Files written to other sinks are named after their path
+        relative to `output_dir`. Hooks and manifests need the project on
+        the filesystem.
+    :param hook_scripts: The hook scripts of the template, as found by
+        `cookiecutter.hooks.find_hooks()`. Looked up if not given.
+    :param hook_limits: Limits on the resources of each hook script, on top of
+        the ones set in the ``_hook_limits`` of the template.
+    :return: The path of the project directory, in `output_dir`.
     """
     context = context or OrderedDict([])
+    if sink is None:
+        sink = DirectorySink()
+    sink.begin(output_dir)
+    if cache_dir is not None:
+        cache_dir = os.path.abspath(cache_dir)
 
-    env = create_env_with_context(context)
+    env: Environment = create_env_with_context(context)
 
     template_dir = find_template(repo_dir, env)
     logger.debug('Generating project from %s...', template_dir)
 
+    if hook_scripts is None:
+        hook_scripts = find_hooks(repo_dir, has_hook_dependencies(context))
+    if not sink.writes_to_disk:
+        _check_off_disk_generation(hook_scripts, accept_hooks, manifest)
+
     unrendered_dir = os.path.split(template_dir)[1]
     try:
         project_dir: Path | str
         project_dir, output_directory_created = render_and_create_dir(
-            unrendered_dir, context, output_dir, env, overwrite_if_exists
+            unrendered_dir, context, output_dir, env, overwrite_if_exists, sink
         )
     except UndefinedError as err:
         msg = f"Unable to create project directory '{unrendered_dir}'"
@@ -379,13 +642,51 @@ def generate_files(
 
     if accept_hooks:
         run_hook_from_repo_dir(
-            repo_dir, 'pre_gen_project', project_dir, context, delete_project_on_failure
+            repo_dir,
+            'pre_gen_project',
+            project_dir,
+            context,
+            delete_project_on_failure,
+            hook_scripts['pre_gen_project'],
+            cache_dir,
+            hook_limits,
+            jobs,
         )
 
-    with work_in(template_dir):
-        env.loader = FileSystemLoader(['.', '../templates'])
+    # A template left in its zipfile is read from there, see `unzip()`.
+    zip_source = archive_source(repo_dir, template_dir)
+    with work_in(template_dir), contextlib.ExitStack() as stack:
+        file_index = (
+            FileIndex.for_template(cache_dir, '.')
+            if cache_dir is not None and zip_source is None
+            else FileIndex()
+        )
+        source: TemplateSource
+        if zip_source is None:
+            source = DirectorySource(file_index)
+            env = _template_environment(env, os.path.abspath('.'), cache_dir)
+        else:
+            logger.debug('Reading the template from %s', zip_source.zip_file.filename)
+            source = stack.enter_context(zip_source)
+            env = _overlay_environment(env, source.loader(), cache_dir)
+        project_manifest = (
+            Manifest(
+                project_dir,
+                context_hash(
+                    context,
+                    os.path.join(os.path.dirname(os.path.abspath('.')), 'templates'),
+                ),
+            )
+            if manifest
+            else None
+        )
 
-        for root, dirs, files in os.walk('.'):
+        # Plan the tree first: directories are created (and copy-only
+        # directories copied) during the walk, files are collected and
+        # generated afterwards, possibly on a worker pool.
+        planned_files: list[str] = []
+        is_copy_only = copy_only_matcher(context)
+        for root, dirs, files in source.walk():
             # We must separate the two types of dirs into different lists.
             # The reason is that we don't want ``os.walk`` to go through the
             # unrendered directories, since they will just be copied.
@@ -397,7 +698,7 @@ def generate_files(
                 # We check the full path, because that's how it can be
                 # specified in the ``_copy_without_render`` setting, but
                 # we store just the dir name
-                if is_copy_only_path(d_, context):
+                if is_copy_only(d_):
                     logger.debug('Found copy only path %s', d)
                     copy_dirs.append(d)
                 else:
@@ -406,15 +707,13 @@ def generate_files(
             for copy_dir in copy_dirs:
                 indir = os.path.normpath(os.path.join(root, copy_dir))
                 outdir = os.path.normpath(os.path.join(project_dir, indir))
-                outdir = env.from_string(outdir).render(**context)
+                outdir = render_path(outdir, context, env)
                 logger.debug('Copying dir %s to %s without rendering', indir, outdir)
 
                 # The outdir is not the root dir, it is the dir which marked as copy
-                # only in the config file. If the program hits this line, which means
-                # the overwrite_if_exists = True, and root dir exists
-                if os.path.isdir(outdir):
-                    shutil.rmtree(outdir)
-                shutil.copytree(indir, outdir)
+                # only in the config file. If it exists, the program runs with
+                # overwrite_if_exists = True and only changed files are copied.
+                sink.copy_tree(source, indir, outdir)
 
             # We mutate ``dirs``, because we only want to go through these dirs
             # recursively
@@ -423,36 +722,77 @@ def generate_files(
                 unrendered_dir = os.path.join(project_dir, root, d)
                 try:
                     render_and_create_dir(
-                        unrendered_dir, context, output_dir, env, overwrite_if_exists
+                        unrendered_dir,
+                        context,
+                        output_dir,
+                        env,
+                        overwrite_if_exists,
+                        sink,
                     )
                 except UndefinedError as err:
                     if delete_project_on_failure:
-                        rmtree(project_dir)
+                        sink.remove_tree(project_dir)
                     _dir = os.path.relpath(unrendered_dir, output_dir)
                     msg = f"Unable to create directory '{_dir}'"
                     raise UndefinedVariableInTemplate(msg, err, context) from err
 
-            for f in sorted(files):
-                infile = os.path.normpath(os.path.join(root, f))
-                if is_copy_only_path(infile, context):
-                    outfile_tmpl = env.from_string(infile)
-                    outfile_rendered = outfile_tmpl.render(**context)
-                    outfile = os.path.join(project_dir, outfile_rendered)
-                    logger.debug(
-                        'Copying file %s to %s without rendering', infile, outfile
-                    )
-                    shutil.copyfile(infile, outfile)
-                    shutil.copymode(infile, outfile)
-                    continue
-                try:
-                    generate_file(
-                        project_dir, infile, context, env, skip_if_file_exists
-                    )
-                except UndefinedError as err:
-                    if delete_project_on_failure:
-                        rmtree(project_dir)
-                    msg = f"Unable to create file '{infile}'"
-                    raise UndefinedVariableInTemplate(msg, err, context) from err
+            planned_files.extend(
+                os.path.normpath(os.path.join(root, f)) for f in sorted(files)
+            )
+
+        generate_planned = functools.partial(
+            _generate_planned_file,
+            project_dir=project_dir,
+            context=context,
+            env=env,
+            skip_if_file_exists=skip_if_file_exists,
+            is_copy_only=is_copy_only,
+            file_index=file_index,
+            manifest=project_manifest,
+            source=source,
+            sink=sink,
+        )
+        try:
+            if jobs > 1 and len(planned_files) > 1:
+                # Every directory exists at this point, so files can be written
+                # in any order, except for files rendering to the same path.
+                # ``map`` hands results back in plan order, which keeps error
+                # reporting identical to a serial run.
+                logger.debug(
+                    'Generating %d files with %d workers', len(planned_files), jobs
+                )
+
+                def generate_group(group: list[str]) -> list[bool]:
+                    return [generate_planned(infile) for infile in group]
+
+                groups = _group_by_output(planned_files, context, env)
+                with ThreadPoolExecutor(max_workers=jobs) as executor:
+                    try:
+                        written = [
+                            file_written
+                            for group_written in executor.map(generate_group, groups)
+                            for file_written in group_written
+                        ]
+                    except BaseException:
+                        executor.shutdown(cancel_futures=True)
+                        raise
+            else:
+                written = [generate_planned(infile) for infile in planned_files]
+        except UndefinedVariableInTemplate:
+            if delete_project_on_failure:
+                sink.remove_tree(project_dir)
+            raise
+        finally:
+            file_index.save()
+
+        logger.debug(
+            'Wrote %d files, left %d files untouched',
+            sum(written),
+            len(written) - sum(written),
+        )
+
+        if project_manifest is not None:
+            project_manifest.save()
 
     if accept_hooks:
         run_hook_from_repo_dir(
@@ -461,6 +801,10 @@ def generate_files(
             project_dir,
             context,
             delete_project_on_failure,
+            hook_scripts['post_gen_project'],
+            cache_dir,
+            hook_limits,
+            jobs,
         )
 
     return project_dir
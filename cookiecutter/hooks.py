@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import builtins
+import codecs
+import contextlib
 import errno
+import graphlib
+import hashlib
+import json
 import logging
 import os
+import signal
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any
+from typing import IO, TYPE_CHECKING, Any, NamedTuple, TextIO
 
 from jinja2.exceptions import UndefinedError
 
@@ -18,12 +28,27 @@ from cookiecutter.exceptions import FailedHookException
 from cookiecutter.utils import (
     create_env_with_context,
     create_tmp_repo_dir,
+    has_template_markup,
+    make_sure_path_exists,
     rmtree,
     work_in,
 )
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
 logger = logging.getLogger(__name__)
 
+#: Directory of the cache directory keeping hook scripts without template markup.
+HOOKS_CACHE_DIR = 'hooks'
+#: Number of bytes kept from the end of the stdout and stderr of a hook.
+HOOK_OUTPUT_LIMIT = 64 * 1024
+
 _HOOKS = [
     'pre_prompt',
     'pre_gen_project',
@@ -48,7 +73,9 @@ def valid_hook(hook_file: str, hook_name: str) -> bool:
     return matching_hook and supported_hook and not backup_file
 
 
-def find_hook(hook_name: str, hooks_dir: str = 'hooks') -> list[str] | None:
+def find_hook(
+    hook_name: str, hooks_dir: str = 'hooks', stages: bool = False
+) -> list[str] | None:
     """Return a dict of all hook scripts provided.
 
     Must be called with the project template as the current working directory.
@@ -56,8 +83,14 @@ def find_hook(hook_name: str, hooks_dir: str = 'hooks') -> list[str] | None:
     will be the absolute path to the script. Missing scripts will not be
     included in the returned dict.
 
+    With `stages`, scripts in a directory named after the hook, such as
+    ``hooks/post_gen_project/``, belong to the hook too and follow the
+    scripts named after it, sorted by name.
+
     :param hook_name: The hook to find
     :param hooks_dir: The hook directory in the template
+    :param stages: Also find the scripts in the directory named after the
+        hook, see `has_hook_dependencies()`.
     :return: The absolute path to the hook script or None
     """
     logger.debug('hooks_dir is %s', os.path.abspath(hooks_dir))
@@ -70,78 +103,649 @@ def find_hook(hook_name: str, hooks_dir: str = 'hooks') -> list[str] | None:
         os.path.abspath(os.path.join(hooks_dir, hook_file))
         for hook_file in os.listdir(hooks_dir)
         if valid_hook(hook_file, hook_name)
+        and os.path.isfile(os.path.join(hooks_dir, hook_file))
     ]
+    stage_dir = os.path.join(hooks_dir, hook_name)
+    if stages and hook_name in _HOOKS and os.path.isdir(stage_dir):
+        scripts.extend(
+            os.path.abspath(os.path.join(stage_dir, hook_file))
+            for hook_file in sorted(os.listdir(stage_dir))
+            if not hook_file.endswith('~')
+            and not hook_file.startswith('.')
+            and os.path.isfile(os.path.join(stage_dir, hook_file))
+        )
 
     if len(scripts) == 0:
         return None
     return scripts
 
 
-def run_script(script_path: str, cwd: Path | str = '.') -> None:
+def find_hooks(repo_dir: Path | str, stages: bool = False) -> dict[str, list[str]]:
+    """Return the scripts of every hook of a template, by hook name.
+
+    :param repo_dir: Project template input directory.
+    :param stages: Also find the scripts in the directories named after the
+        hooks, see `find_hook()`.
+    """
+    with work_in(repo_dir):
+        return {
+            hook_name: find_hook(hook_name, stages=stages) or []
+            for hook_name in _HOOKS
+        }
+
+
+def has_hook_dependencies(context: dict[str, Any]) -> bool:
+    """Return whether a template declares ``_hook_dependencies``.
+
+    Only such templates have scripts in directories named after the hooks,
+    which may otherwise hold modules the hooks import.
+    """
+    return context.get('cookiecutter', {}).get('_hook_dependencies') is not None
+
+
+class HookLimits(NamedTuple):
+    """Limits on the resources of a hook script, `None` for no limit.
+
+    Limits are set in the ``_hook_limits`` dictionary of a template and in
+    the ``hook_limits`` user config setting, where the stricter one applies.
+
+    :param timeout: Seconds the script may run for before it is killed.
+    :param cpu_time: Seconds of CPU time the script may use.
+    :param memory: Bytes of memory the script may allocate.
+    """
+
+    timeout: float | None = None
+    cpu_time: int | None = None
+    memory: int | None = None
+
+    @classmethod
+    def from_dict(cls, limits: dict[str, Any] | None) -> HookLimits:
+        """Return the limits set in a dictionary, such as the user config.
+
+        :raises ValueError: If the dictionary has keys that are not limits.
+        """
+        limits = limits or {}
+        unknown = sorted(set(limits).difference(cls._fields))
+        if unknown:
+            msg = (
+                f'Unknown hook limits {", ".join(unknown)}, '
+                f'expected some of: {", ".join(cls._fields)}.'
+            )
+            raise ValueError(msg)
+        return cls(**limits)
+
+    def stricter(self, other: HookLimits | None) -> HookLimits:
+        """Return the stricter of each of these limits and `other`."""
+        if other is None:
+            return self
+
+        def pick(mine: Any, theirs: Any) -> Any:
+            if mine is None or theirs is None:
+                return theirs if mine is None else mine
+            return min(mine, theirs)
+
+        return HookLimits(
+            timeout=pick(self.timeout, other.timeout),
+            cpu_time=pick(self.cpu_time, other.cpu_time),
+            memory=pick(self.memory, other.memory),
+        )
+
+
+#: Sets the resource limits given as JSON, then replaces itself with the
+#: hook. Unlike a ``preexec_fn``, it is safe while other threads run hooks.
+#: If the hook cannot be executed, its ``errno`` is written to the file
+#: descriptor given first, like `subprocess` does for its own child process.
+_RLIMIT_WRAPPER = """\
+import json, os, resource, sys
+error_fd = int(sys.argv[1])
+for name, limit in json.loads(sys.argv[2]).items():
+    rlimit = getattr(resource, name)
+    hard = resource.getrlimit(rlimit)[1]
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(rlimit, (limit, hard))
+os.set_inheritable(error_fd, False)
+try:
+    os.execv(sys.argv[3], sys.argv[3:])
+except OSError as err:
+    os.write(error_fd, str(err.errno).encode())
+    sys.exit(127)
+"""
+
+
+def _rlimits(limits: HookLimits) -> dict[str, int]:
+    """Return the resource limits of a hook supported on this platform."""
+    rlimits = {
+        name: limit
+        for name, limit in (
+            ('RLIMIT_CPU', limits.cpu_time),
+            ('RLIMIT_AS', limits.memory),
+        )
+        if limit is not None
+    }
+    if rlimits and resource is None:
+        logger.warning('Hook resource limits are not supported on this platform')
+        return {}
+    return rlimits
+
+
+def _limited_command(
+    command: list[str], rlimits: dict[str, int], error_fd: int
+) -> list[str]:
+    """Return `command` wrapped to run with the resource limits of a hook."""
+    return [
+        sys.executable,
+        '-c',
+        _RLIMIT_WRAPPER,
+        str(error_fd),
+        json.dumps(rlimits),
+        *command,
+    ]
+
+
+def _exec_failure(err: OSError) -> FailedHookException:
+    """Return the exception raised when a hook script cannot be executed."""
+    if err.errno == errno.ENOEXEC:
+        msg = 'Hook script failed, might be an empty file or missing a shebang'
+    else:
+        msg = f'Hook script failed (error: {err})'
+    return FailedHookException(msg)
+
+
+def _kill(proc: subprocess.Popen[bytes]) -> None:
+    """Kill a hook process along with the processes it started."""
+    if hasattr(os, 'killpg'):
+        # The hook leads a session of its own, see `run_script()`.
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+    else:
+        subprocess.run(  # nosec
+            ['taskkill', '/F', '/T', '/PID', str(proc.pid)],  # noqa: S607
+            capture_output=True,
+            check=False,
+        )
+        if proc.poll() is None:
+            proc.kill()
+    proc.wait()
+
+
+@contextlib.contextmanager
+def _report_time(script_path: Path | str) -> Iterator[None]:
+    """Log the wall time of a hook script at the info level, even if it fails.
+
+    The log record carries the ``hook_script``, ``hook_duration`` and
+    ``hook_failed`` attributes for handlers collecting them.
+    """
+    start = time.monotonic()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        duration = time.monotonic() - start
+        logger.info(
+            'Hook script %s %s %.3f seconds',
+            script_path,
+            'failed after' if failed else 'ran for',
+            duration,
+            extra={
+                'hook_script': os.fspath(script_path),
+                'hook_duration': duration,
+                'hook_failed': failed,
+            },
+        )
+
+
+def _tee(stream: IO[bytes], target: TextIO, buffer: bytearray, limit: int) -> None:
+    """Copy the output of a hook to `target`, keeping its end in `buffer`."""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with stream:
+        for chunk in iter(lambda: stream.read1(8192), b''):  # type: ignore[attr-defined]
+            buffer += chunk
+            del buffer[:-limit]
+            target.write(decoder.decode(chunk))
+            target.flush()
+
+
+def _supervise(
+    proc: subprocess.Popen[bytes], timeout: float
+) -> tuple[int | None, bytes, bytes]:
+    """Wait for a hook to end, passing its output through.
+
+    Return its exit status, or ``None`` if it was killed after `timeout`
+    seconds, along with the end of its output.
+    """
+    stdout, stderr = bytearray(), bytearray()
+    readers = [
+        threading.Thread(
+            target=_tee, args=(stream, target, output, HOOK_OUTPUT_LIMIT), daemon=True
+        )
+        for stream, target, output in (
+            (proc.stdout, sys.stdout, stdout),
+            (proc.stderr, sys.stderr, stderr),
+        )
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        exit_status: int | None = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        exit_status = None
+    finally:
+        # Also reached on KeyboardInterrupt, don't leave the script running.
+        if proc.poll() is None:
+            _kill(proc)
+        for reader in readers:
+            # Processes started by the script may still hold the output open.
+            reader.join(timeout=1)
+    return exit_status, bytes(stdout), bytes(stderr)
+
+
+def run_script(
+    script_path: str, cwd: Path | str = '.', limits: HookLimits | None = None
+) -> None:
     """Execute a script from a working directory.
 
+    A script with a timeout runs in a session of its own, which is killed as
+    a whole when the script times out. Its output is passed through to the
+    output of Cookiecutter, and its end is attached to the
+    `FailedHookException` raised if the script fails. Other scripts share
+    the terminal of Cookiecutter. The exception always carries the time the
+    script ran for.
+
     :param script_path: Absolute path to the script to run.
     :param cwd: The directory to run the script from.
+    :param limits: Limits on the resources of the script, none if not given.
     """
+    limits = limits or HookLimits()
     run_thru_shell = sys.platform.startswith('win')
     if script_path.endswith('.py'):
         script_command = [sys.executable, script_path]
     else:
         script_command = [script_path]
+        utils.make_executable(script_path)
+
+    command = script_command
+    pass_fds: tuple[int, ...] = ()
+    rlimits = _rlimits(limits)
+    if rlimits:
+        error_fd, error_write_fd = os.pipe()
+        command = _limited_command(script_command, rlimits, error_write_fd)
+        pass_fds = (error_write_fd,)
+    supervised = limits.timeout is not None
+    output = subprocess.PIPE if supervised else None
+
+    start = time.monotonic()
+    try:
+        proc = subprocess.Popen(  # nosec
+            command,
+            shell=run_thru_shell,
+            cwd=cwd,
+            stdout=output,
+            stderr=output,
+            start_new_session=supervised,
+            pass_fds=pass_fds,
+        )
+    except OSError as err:
+        if rlimits:
+            os.close(error_fd)
+        raise _exec_failure(err) from err
+    finally:
+        for fd in pass_fds:
+            os.close(fd)
+
+    if limits.timeout is not None:
+        exit_status, stdout, stderr = _supervise(proc, limits.timeout)
+    else:
+        exit_status, stdout, stderr = proc.wait(), b'', b''
+    duration = time.monotonic() - start
+
+    if rlimits:
+        with open(error_fd, 'rb') as error_pipe:
+            error = error_pipe.read()
+        if error:
+            exec_error = OSError(int(error), os.strerror(int(error)))
+            raise _exec_failure(exec_error) from exec_error
+
+    if exit_status is None:
+        msg = f'Hook script timed out after {limits.timeout} seconds'
+    elif exit_status != EXIT_SUCCESS:
+        msg = f'Hook script failed (exit status: {exit_status})'
+    else:
+        return
+    raise FailedHookException(msg, stdout, stderr, duration)
+
+
+def _exit_status(code: object) -> int:
+    """Return the exit status of the interpreter for a `SystemExit` code."""
+    if code is None:
+        return EXIT_SUCCESS
+    if isinstance(code, int):
+        return code
+    # Like the interpreter, print any other object and exit with status 1.
+    print(code, file=sys.stderr)
+    return 1
+
+
+# In-process hooks share the state of the interpreter, so they run one at a time.
+_IN_PROCESS_LOCK = threading.RLock()
+
 
-    utils.make_executable(script_path)
+@contextlib.contextmanager
+def _preserved_interpreter_state(script_path: str) -> Iterator[None]:
+    """Run a script with ``sys.argv`` set for it, undoing its global changes.
 
+    ``sys.path``, ``os.environ`` and the standard streams are put back as
+    they were, and modules the script imported are unloaded. Changes made to
+    modules imported before are kept.
+    """
+    argv = sys.argv
+    path = list(sys.path)
+    modules = set(sys.modules)
+    environ = dict(os.environ)
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.argv = [script_path]
     try:
-        proc = subprocess.Popen(script_command, shell=run_thru_shell, cwd=cwd)  # nosec
-        exit_status = proc.wait()
+        yield
+    finally:
+        sys.argv = argv
+        sys.path[:] = path
+        for name in set(sys.modules) - modules:
+            del sys.modules[name]
+        for name in set(os.environ) - set(environ):
+            del os.environ[name]
+        for name, value in environ.items():
+            if os.environ.get(name) != value:
+                os.environ[name] = value
+        sys.stdout, sys.stderr = stdout, stderr
+
+
+def run_python_in_process(
+    source: str, script_path: Path | str, cwd: Path | str = '.'
+) -> None:
+    """Execute a Python script in the running interpreter.
+
+    The script runs as ``__main__`` in a namespace of its own, from `cwd` and
+    with ``sys.argv`` holding only the script path. It fails like a script
+    run in a subprocess: by exiting with a nonzero status through
+    ``sys.exit()``, or with an uncaught exception, which counts as status 1.
+    What it changes of ``sys.path``, ``sys.modules``, ``os.environ`` and the
+    standard streams is undone once it is done.
+
+    :param source: The source code of the script.
+    :param script_path: The path of the script, reported in tracebacks.
+    :param cwd: The directory to run the script from.
+    """
+    script_path = os.fspath(script_path)
+    namespace = {
+        '__name__': '__main__',
+        '__file__': script_path,
+        '__builtins__': builtins,
+    }
+    try:
+        with (
+            _IN_PROCESS_LOCK,
+            _preserved_interpreter_state(script_path),
+            work_in(cwd),
+        ):
+            exec(compile(source, script_path, 'exec'), namespace)  # noqa: S102
+    except SystemExit as err:
+        exit_status = _exit_status(err.code)
         if exit_status != EXIT_SUCCESS:
             msg = f'Hook script failed (exit status: {exit_status})'
-            raise FailedHookException(msg)
-    except OSError as err:
-        if err.errno == errno.ENOEXEC:
-            msg = 'Hook script failed, might be an empty file or missing a shebang'
             raise FailedHookException(msg) from err
-        msg = f'Hook script failed (error: {err})'
+    except Exception as err:
+        msg = 'Hook script failed (exit status: 1)'
         raise FailedHookException(msg) from err
 
 
+@contextlib.contextmanager
+def _temporary_script(script_path: Path | str, output: str) -> Iterator[str]:
+    """Write a rendered script to a temporary directory, removed on exit."""
+    tmp_dir = tempfile.mkdtemp(prefix='cookiecutter-hook-')
+    try:
+        path = os.path.join(tmp_dir, os.path.basename(script_path))
+        Path(path).write_bytes(output.encode('utf-8'))
+        yield path
+    finally:
+        rmtree(tmp_dir)
+
+
+def _cached_script(
+    script_path: Path | str, contents: str, cache_dir: Path | str
+) -> str:
+    """Return the copy of a script without template markup kept in the cache.
+
+    Scripts are keyed by their source. Rendered scripts are never cached, as
+    their output may change from one run to the next with the same context,
+    such as with ``random_ascii_string()`` or ``{% now %}``.
+    """
+    digest = hashlib.sha256(contents.encode('utf-8'))
+    _, extension = os.path.splitext(script_path)
+    path = os.path.join(cache_dir, HOOKS_CACHE_DIR, f'{digest.hexdigest()}{extension}')
+    if os.path.isfile(path):
+        logger.debug('Using hook %s from the cache', path)
+        # Keep recently used scripts from being pruned first.
+        os.utime(path)
+        return path
+
+    make_sure_path_exists(os.path.dirname(path))
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=extension)
+    try:
+        with open(fd, 'wb') as fh:
+            fh.write(contents.encode('utf-8'))
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def template_hook_limits(
+    context: dict[str, Any], limits: HookLimits | None = None
+) -> HookLimits:
+    """Return the limits of the hooks of a template.
+
+    :param context: Cookiecutter project template context, which may set
+        limits in ``_hook_limits``.
+    :param limits: Limits set by the user, the stricter limit applies.
+    """
+    try:
+        template_limits = HookLimits.from_dict(
+            context.get('cookiecutter', {}).get('_hook_limits')
+        )
+    except (TypeError, ValueError) as err:
+        msg = f'Invalid _hook_limits in the template: {err}'
+        raise FailedHookException(msg) from err
+    return template_limits.stricter(limits)
+
+
 def run_script_with_context(
-    script_path: Path | str, cwd: Path | str, context: dict[str, Any]
+    script_path: Path | str,
+    cwd: Path | str,
+    context: dict[str, Any],
+    cache_dir: Path | str | None = None,
+    limits: HookLimits | None = None,
+    allow_in_process: bool = True,
 ) -> None:
     """Execute a script after rendering it with Jinja.
 
+    Scripts without any template markup are not rendered, and Python ones
+    are run in place. Python scripts of templates setting
+    ``_in_process_hooks`` are executed in the running interpreter, see
+    `run_python_in_process()`, unless the hooks are limited or
+    `allow_in_process` is `False`.
+
     :param script_path: Absolute path to the script to run.
     :param cwd: The directory to run the script from.
     :param context: Cookiecutter project template context.
+    :param cache_dir: Directory to keep copies of scripts without template
+        markup in between runs, which are written to a temporary directory
+        every time if not given. Rendered scripts are always written to a
+        temporary directory.
+    :param limits: Limits on the resources of the script set by the user,
+        combined with the ones of the template.
+    :param allow_in_process: Whether the script may run in the running
+        interpreter, which is not safe next to other scripts running at once.
     """
     _, extension = os.path.splitext(script_path)
+    limits = template_hook_limits(context, limits)
 
     contents = Path(script_path).read_text(encoding='utf-8')
 
-    with tempfile.NamedTemporaryFile(delete=False, mode='wb', suffix=extension) as temp:
-        env = create_env_with_context(context)
-        template = env.from_string(contents)
-        output = template.render(**context)
-        temp.write(output.encode('utf-8'))
+    env = create_env_with_context(context)
+    render = has_template_markup(contents, env)
+    if not render:
+        logger.debug('Hook %s has no template markup, not rendering it', script_path)
+
+    in_process = allow_in_process and context.get('cookiecutter', {}).get(
+        '_in_process_hooks', False
+    )
+    if in_process and limits != HookLimits():
+        # Limits can only be enforced on a process of its own.
+        logger.debug('Hooks are limited, running %s in a subprocess', script_path)
+        in_process = False
+
+    if render:
+        contents = env.from_string(contents).render(**context)
+    with _report_time(script_path):
+        if extension == '.py' and in_process:
+            logger.debug('Running %s in process', script_path)
+            run_python_in_process(contents, script_path, cwd)
+        elif extension == '.py' and not render:
+            run_script(os.fspath(script_path), cwd, limits)
+        elif not render and cache_dir is not None:
+            run_script(_cached_script(script_path, contents, cache_dir), cwd, limits)
+        else:
+            with _temporary_script(script_path, contents) as path:
+                run_script(path, cwd, limits)
+
+
+def _script_name(script: str, hook_name: str) -> str:
+    """Return the name of a hook script relative to the hooks directory."""
+    directory, filename = os.path.split(script)
+    if os.path.basename(directory) == hook_name:
+        return f'{hook_name}/{filename}'
+    return filename
+
+
+def hook_graph(
+    hook_name: str, scripts: list[str], dependencies: dict[str, list[str]]
+) -> dict[str, list[str]]:
+    """Return the scripts of a hook with the scripts each of them depends on.
+
+    :param hook_name: The hook the scripts belong to.
+    :param scripts: The scripts of the hook, as found by `find_hook()`.
+    :param dependencies: The ``_hook_dependencies`` of the template, the
+        names of the scripts each script depends on. Scripts are named by
+        their path in the hooks directory, such as
+        ``post_gen_project/format.py``.
+    :raises FailedHookException: If a script depends on a script that is not
+        part of the hook.
+    """
+    if not isinstance(dependencies, dict):
+        msg = '_hook_dependencies must map hook scripts to the scripts they need'
+        raise FailedHookException(msg)
+    by_name = {_script_name(script, hook_name): script for script in scripts}
+    graph = {}
+    for name, script in by_name.items():
+        needs = dependencies.get(name, [])
+        unknown = [need for need in needs if need not in by_name]
+        if unknown:
+            msg = (
+                f'Hook script {name} depends on unknown {hook_name} hook '
+                f'scripts: {", ".join(unknown)}'
+            )
+            raise FailedHookException(msg)
+        graph[script] = [by_name[need] for need in needs]
+    return graph
 
-    run_script(temp.name, cwd)
 
+def run_hook_graph(
+    graph: dict[str, list[str]], run: Callable[[str], None], jobs: int = 1
+) -> None:
+    """Run hook scripts after the scripts they depend on.
+
+    Scripts whose dependencies have run are started on a pool of `jobs`
+    worker threads. Once a script fails no more scripts are started, the
+    running ones are waited for and the first failure is raised.
 
-def run_hook(hook_name: str, project_dir: Path | str, context: dict[str, Any]) -> None:
+    :param graph: The scripts each script depends on, see `hook_graph()`.
+    :param run: Function running a single script.
+    :param jobs: Number of scripts running at once.
+    :raises FailedHookException: If the scripts depend on each other in a
+        cycle.
+    """
+    sorter = graphlib.TopologicalSorter(graph)
+    try:
+        sorter.prepare()
+    except graphlib.CycleError as err:
+        msg = f'Hook scripts depend on each other in a cycle: {err.args[1]}'
+        raise FailedHookException(msg) from err
+
+    order = list(graph)
+    failure: BaseException | None = None
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        running: dict[Future[None], str] = {}
+        while sorter.is_active() and failure is None:
+            for script in sorted(sorter.get_ready(), key=order.index):
+                running[executor.submit(run, script)] = script
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                script = running.pop(future)
+                if future.exception() is None:
+                    sorter.done(script)
+                elif failure is None:
+                    failure = future.exception()
+    if failure is not None:
+        raise failure
+
+
+def run_hook(
+    hook_name: str,
+    project_dir: Path | str,
+    context: dict[str, Any],
+    scripts: list[str] | None = None,
+    cache_dir: Path | str | None = None,
+    limits: HookLimits | None = None,
+    jobs: int = 1,
+) -> None:
     """
     Try to find and execute a hook from the specified project directory.
 
+    The scripts of the hook run one after the other, unless the template sets
+    ``_hook_dependencies``. They are then run on worker threads as soon as
+    the scripts they depend on have run, see `run_hook_graph()`.
+
     :param hook_name: The hook to execute.
     :param project_dir: The directory to execute the script from.
     :param context: Cookiecutter project context.
+    :param scripts: The scripts of the hook, as found by `find_hooks()`.
+        Looked up in the current working directory if not given.
+    :param cache_dir: Directory to keep unrendered scripts in between runs.
+    :param limits: Limits on the resources of each script.
+    :param jobs: Number of scripts running at once, for templates setting
+        ``_hook_dependencies``.
     """
-    scripts = find_hook(hook_name)
+    if scripts is None:
+        scripts = find_hook(hook_name, stages=has_hook_dependencies(context))
     if not scripts:
         logger.debug('No %s hook found', hook_name)
         return
     logger.debug('Running hook %s', hook_name)
-    for script in scripts:
-        run_script_with_context(script, project_dir, context)
+    if not has_hook_dependencies(context):
+        for script in scripts:
+            run_script_with_context(script, project_dir, context, cache_dir, limits)
+        return
+
+    def run(script: str) -> None:
+        run_script_with_context(
+            script, project_dir, context, cache_dir, limits, allow_in_process=False
+        )
+
+    dependencies = context['cookiecutter']['_hook_dependencies']
+    run_hook_graph(hook_graph(hook_name, scripts, dependencies), run, jobs)
 
 
 def run_hook_from_repo_dir(
@@ -150,6 +754,10 @@ def run_hook_from_repo_dir(
     project_dir: Path | str,
     context: dict[str, Any],
     delete_project_on_failure: bool,
+    scripts: list[str] | None = None,
+    cache_dir: Path | str | None = None,
+    limits: HookLimits | None = None,
+    jobs: int = 1,
 ) -> None:
     """Run hook from repo directory, clean project directory if hook fails.
 
@@ -159,10 +767,16 @@ def run_hook_from_repo_dir(
     :param context: Cookiecutter project context.
     :param delete_project_on_failure: Delete the project directory on hook
         failure?
+    :param scripts: The scripts of the hook, as found by `find_hooks()`.
+        Looked up in `repo_dir` if not given.
+    :param cache_dir: Directory to keep unrendered scripts in between runs.
+    :param limits: Limits on the resources of each script.
+    :param jobs: Number of scripts running at once, for templates setting
+        ``_hook_dependencies``.
     """
     with work_in(repo_dir):
         try:
-            run_hook(hook_name, project_dir, context)
+            run_hook(hook_name, project_dir, context, scripts, cache_dir, limits, jobs)
         except (
             FailedHookException,
             UndefinedError,
@@ -177,10 +791,13 @@ def run_hook_from_repo_dir(
             raise
 
 
-def run_pre_prompt_hook(repo_dir: Path | str) -> Path | str:
+def run_pre_prompt_hook(
+    repo_dir: Path | str, limits: HookLimits | None = None
+) -> Path | str:
     """Run pre_prompt hook from repo directory.
 
     :param repo_dir: Project template input directory.
+    :param limits: Limits on the resources of each script.
     """
     # Check if we have a valid pre_prompt script
     with work_in(repo_dir):
@@ -194,8 +811,9 @@ def run_pre_prompt_hook(repo_dir: Path | str) -> Path | str:
         scripts = find_hook('pre_prompt') or []
         for script in scripts:
             try:
-                run_script(script, str(repo_dir))
+                with _report_time(script):
+                    run_script(script, str(repo_dir), limits)
             except FailedHookException as e:  # noqa: PERF203
                 msg = 'Pre-Prompt Hook script failed'
-                raise FailedHookException(msg) from e
+                raise FailedHookException(msg, e.stdout, e.stderr, e.duration) from e
     return repo_dir
@@ -7,21 +7,23 @@ library rather than a script.
 
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
-import sys
-from copy import copy
-from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from cookiecutter.cache import get_cache_dir, prune_cache
 from cookiecutter.config import get_user_config
 from cookiecutter.exceptions import InvalidModeException
 from cookiecutter.generate import generate_context, generate_files
-from cookiecutter.hooks import run_pre_prompt_hook
+from cookiecutter.hooks import HookLimits, run_pre_prompt_hook
 from cookiecutter.prompt import choose_nested_template, prompt_for_config
 from cookiecutter.replay import dump, load
 from cookiecutter.repository import determine_repo_dir
-from cookiecutter.utils import rmtree
+from cookiecutter.utils import patch_import_path_for_repo, rmtree
+
+if TYPE_CHECKING:
+    from cookiecutter.sink import OutputSink
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +43,11 @@ def cookiecutter(
     skip_if_file_exists: bool = False,
     accept_hooks: bool = True,
     keep_project_on_failure: bool = False,
+    jobs: int = 1,
+    template_cache: bool = True,
+    manifest: bool = False,
+    shallow_clone: bool = False,
+    sink: OutputSink | None = None,
 ) -> str:
     """
     Run Cookiecutter just as if using it from the command line.
@@ -68,6 +75,17 @@ def cookiecutter(
     :param accept_hooks: Accept pre and post hooks if set to `True`.
     :param keep_project_on_failure: If `True` keep generated project directory even when
         generation fails
+    :param jobs: Number of worker threads used to render and write files,
+        and to run the hook scripts of templates declaring their dependencies.
+    :param template_cache: Keep compiled templates and unpacked zip files in
+        the cache directory between runs.
+    :param manifest: Keep a manifest of the generated files in the project
+        and only regenerate the files whose inputs changed.
+    :param shallow_clone: Only download what is needed to check out
+        `checkout` when cloning a git repository. Also enabled by the
+        ``shallow_clone`` user config setting.
+    :param sink: Where to write the project, to a directory in `output_dir`
+        if not given. See `cookiecutter.sink`.
     """
     if replay and ((no_input is not False) or (extra_context is not None)):
         err_msg = (
@@ -80,133 +98,158 @@ def cookiecutter(
         config_file=config_file,
         default_config=default_config,
     )
-    base_repo_dir, cleanup_base_repo_dir = determine_repo_dir(
-        template=template,
-        abbreviations=config_dict['abbreviations'],
-        clone_to_dir=config_dict['cookiecutters_dir'],
-        checkout=checkout,
-        no_input=no_input,
-        password=password,
-        directory=directory,
-    )
-    repo_dir, cleanup = base_repo_dir, cleanup_base_repo_dir
-    # Run pre_prompt hook
-    repo_dir = str(run_pre_prompt_hook(base_repo_dir)) if accept_hooks else repo_dir
-    # Always remove temporary dir if it was created
-    cleanup = repo_dir != base_repo_dir
-
-    import_patch = _patch_import_path_for_repo(repo_dir)
-    template_name = os.path.basename(os.path.abspath(repo_dir))
-    if replay:
-        with import_patch:
-            if isinstance(replay, bool):
-                context_from_replayfile = load(config_dict['replay_dir'], template_name)
-            else:
-                path, template_name = os.path.split(os.path.splitext(replay)[0])
-                context_from_replayfile = load(path, template_name)
-
-    context_file = os.path.join(repo_dir, 'cookiecutter.json')
-    logger.debug('context_file is %s', context_file)
-
-    if replay:
-        context = generate_context(
-            context_file=context_file,
-            default_context=config_dict['default_context'],
-            extra_context=None,
+    cache_dir = get_cache_dir(config_dict) if template_cache else None
+    hook_limits = HookLimits.from_dict(config_dict['hook_limits'])
+    # The template is locked until the project is generated, see
+    # `determine_repo_dir()`.
+    with contextlib.ExitStack() as template_locks:
+        base_repo_dir, cleanup_base_repo_dir = determine_repo_dir(
+            template=template,
+            abbreviations=config_dict['abbreviations'],
+            clone_to_dir=config_dict['cookiecutters_dir'],
+            checkout=checkout,
+            no_input=no_input,
+            password=password,
+            directory=directory,
+            shallow_clone=shallow_clone or config_dict['shallow_clone'],
+            refresh=config_dict['refresh'],
+            refresh_ttl=config_dict['refresh_ttl'],
+            content_addressed=config_dict['content_addressed_clones'],
+            download_chunk_size=config_dict['download_chunk_size'],
+            archive_cache_dir=cache_dir,
+            # A one-shot generation renders a zip file template without unpacking it.
+            render_from_archive=cache_dir is None,
+            lock_stack=template_locks,
         )
-        logger.debug('replayfile context: %s', context_from_replayfile)
-        items_for_prompting = {
-            k: v
-            for k, v in context['cookiecutter'].items()
-            if k not in context_from_replayfile['cookiecutter']
-        }
-        context_for_prompting = {}
-        context_for_prompting['cookiecutter'] = items_for_prompting
-        context = context_from_replayfile
-        logger.debug('prompting context: %s', context_for_prompting)
-    else:
-        context = generate_context(
-            context_file=context_file,
-            default_context=config_dict['default_context'],
-            extra_context=extra_context,
+        repo_dir, cleanup = base_repo_dir, cleanup_base_repo_dir
+        # Run pre_prompt hook
+        repo_dir = (
+            str(run_pre_prompt_hook(base_repo_dir, hook_limits))
+            if accept_hooks
+            else repo_dir
         )
-        context_for_prompting = context
-    # preserve the original cookiecutter options
-    # print(context['cookiecutter'])
-    context['_cookiecutter'] = {
-        k: v for k, v in context['cookiecutter'].items() if not k.startswith("_")
-    }
-
-    # prompt the user to manually configure at the command line.
-    # except when 'no-input' flag is set
-
-    with import_patch:
-        if {"template", "templates"} & set(context["cookiecutter"].keys()):
-            nested_template = choose_nested_template(context, repo_dir, no_input)
-            return cookiecutter(
-                template=nested_template,
-                checkout=checkout,
-                no_input=no_input,
+        # Always remove temporary dir if it was created
+        cleanup = repo_dir != base_repo_dir
+
+        import_patch = patch_import_path_for_repo(repo_dir)
+        template_name = os.path.basename(os.path.abspath(repo_dir))
+        if replay:
+            with import_patch:
+                if isinstance(replay, bool):
+                    context_from_replayfile = load(
+                        config_dict['replay_dir'], template_name
+                    )
+                else:
+                    path, template_name = os.path.split(os.path.splitext(replay)[0])
+                    context_from_replayfile = load(path, template_name)
+
+        context_file = os.path.join(repo_dir, 'cookiecutter.json')
+        logger.debug('context_file is %s', context_file)
+
+        if replay:
+            context = generate_context(
+                context_file=context_file,
+                default_context=config_dict['default_context'],
+                extra_context=None,
+            )
+            logger.debug('replayfile context: %s', context_from_replayfile)
+            items_for_prompting = {
+                k: v
+                for k, v in context['cookiecutter'].items()
+                if k not in context_from_replayfile['cookiecutter']
+            }
+            context_for_prompting = {}
+            context_for_prompting['cookiecutter'] = items_for_prompting
+            context = context_from_replayfile
+            logger.debug('prompting context: %s', context_for_prompting)
+        else:
+            context = generate_context(
+                context_file=context_file,
+                default_context=config_dict['default_context'],
                 extra_context=extra_context,
-                replay=replay,
+            )
+            context_for_prompting = context
+        # preserve the original cookiecutter options
+        # print(context['cookiecutter'])
+        context['_cookiecutter'] = {
+            k: v for k, v in context['cookiecutter'].items() if not k.startswith("_")
+        }
+
+        # prompt the user to manually configure at the command line.
+        # except when 'no-input' flag is set
+
+        with import_patch:
+            if {"template", "templates"} & set(context["cookiecutter"].keys()):
+                nested_template = choose_nested_template(context, repo_dir, no_input)
+                return cookiecutter(
+                    template=nested_template,
+                    checkout=checkout,
+                    no_input=no_input,
+                    extra_context=extra_context,
+                    replay=replay,
+                    overwrite_if_exists=overwrite_if_exists,
+                    output_dir=output_dir,
+                    config_file=config_file,
+                    default_config=default_config,
+                    password=password,
+                    directory=directory,
+                    skip_if_file_exists=skip_if_file_exists,
+                    accept_hooks=accept_hooks,
+                    keep_project_on_failure=keep_project_on_failure,
+                    jobs=jobs,
+                    template_cache=template_cache,
+                    manifest=manifest,
+                    shallow_clone=shallow_clone,
+                    sink=sink,
+                )
+            if context_for_prompting['cookiecutter']:
+                context['cookiecutter'].update(
+                    prompt_for_config(context_for_prompting, no_input)
+                )
+
+        logger.debug('context is %s', context)
+
+        # include template dir or url in the context dict
+        context['cookiecutter']['_template'] = template
+
+        # include output+dir in the context dict
+        context['cookiecutter']['_output_dir'] = os.path.abspath(output_dir)
+
+        # include repo dir or url in the context dict
+        context['cookiecutter']['_repo_dir'] = f"{repo_dir}"
+
+        # include checkout details in the context dict
+        context['cookiecutter']['_checkout'] = checkout
+
+        dump(config_dict['replay_dir'], template_name, context)
+
+        # Create project from local context and project template.
+        with import_patch:
+            result = generate_files(
+                repo_dir=repo_dir,
+                context=context,
                 overwrite_if_exists=overwrite_if_exists,
-                output_dir=output_dir,
-                config_file=config_file,
-                default_config=default_config,
-                password=password,
-                directory=directory,
                 skip_if_file_exists=skip_if_file_exists,
+                output_dir=output_dir,
                 accept_hooks=accept_hooks,
                 keep_project_on_failure=keep_project_on_failure,
+                jobs=jobs,
+                cache_dir=cache_dir,
+                manifest=manifest,
+                sink=sink,
+                hook_limits=hook_limits,
             )
-        if context_for_prompting['cookiecutter']:
-            context['cookiecutter'].update(
-                prompt_for_config(context_for_prompting, no_input)
-            )
-
-    logger.debug('context is %s', context)
-
-    # include template dir or url in the context dict
-    context['cookiecutter']['_template'] = template
-
-    # include output+dir in the context dict
-    context['cookiecutter']['_output_dir'] = os.path.abspath(output_dir)
-
-    # include repo dir or url in the context dict
-    context['cookiecutter']['_repo_dir'] = f"{repo_dir}"
 
-    # include checkout details in the context dict
-    context['cookiecutter']['_checkout'] = checkout
+        if cache_dir is not None:
+            prune_cache(cache_dir, config_dict['cache_max_size'])
 
-    dump(config_dict['replay_dir'], template_name, context)
-
-    # Create project from local context and project template.
-    with import_patch:
-        result = generate_files(
-            repo_dir=repo_dir,
-            context=context,
-            overwrite_if_exists=overwrite_if_exists,
-            skip_if_file_exists=skip_if_file_exists,
-            output_dir=output_dir,
-            accept_hooks=accept_hooks,
-            keep_project_on_failure=keep_project_on_failure,
-        )
-
-    # Cleanup (if required)
-    if cleanup:
-        rmtree(repo_dir)
-    if cleanup_base_repo_dir:
-        rmtree(base_repo_dir)
+        # Cleanup (if required)
+        if cleanup:
+            rmtree(repo_dir)
+        if cleanup_base_repo_dir:
+            rmtree(base_repo_dir)
     return result
 
 
-class _patch_import_path_for_repo:  # noqa: N801
-    def __init__(self, repo_dir: Path | str) -> None:
-        self._repo_dir = f"{repo_dir}" if isinstance(repo_dir, Path) else repo_dir
-
-    def __enter__(self) -> None:
-        self._path = copy(sys.path)
-        sys.path.append(self._repo_dir)
-
-    def __exit__(self, _type, _value, _traceback):  # type: ignore[no-untyped-def]
-        sys.path = self._path
+# Kept for code importing it from here before it moved to `cookiecutter.utils`.
+_patch_import_path_for_repo = patch_import_path_for_repo
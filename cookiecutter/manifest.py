@@ -0,0 +1,195 @@
+"""Track generated files to regenerate projects incrementally."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = '.cookiecutter-manifest.json'
+MANIFEST_VERSION = 1
+
+ADDED = 'added'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+# Private variables holding where this run reads and writes, which change
+# between runs of the same template, e.g. a template copied by its
+# ``pre_prompt`` hook is read from a new temporary directory every time.
+VOLATILE_KEYS = frozenset({'_template', '_repo_dir', '_output_dir'})
+
+
+def file_hash(path: Path | str) -> str:
+    """Return the SHA-256 hex digest of the content of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def output_hash(path: Path | str) -> str | None:
+    """Return the hash of an output file, `None` if it is not a file."""
+    if not os.path.isfile(path):
+        return None
+    return file_hash(path)
+
+
+def context_hash(
+    context: dict[str, Any], shared_templates_dir: Path | str | None = None
+) -> str:
+    """Return a hash of everything besides its own source a file renders from.
+
+    This covers the context and the shared ``templates`` directory next to
+    the template, which files can include or extend. The paths the template
+    is read from and written to are left out, see `VOLATILE_KEYS`.
+
+    :param context: The context the project is generated with.
+    :param shared_templates_dir: Directory of templates shared by the files.
+    """
+    stable_context = dict(context)
+    if isinstance(context.get('cookiecutter'), dict):
+        stable_context['cookiecutter'] = {
+            key: value
+            for key, value in context['cookiecutter'].items()
+            if key not in VOLATILE_KEYS
+        }
+    digest = hashlib.sha256(
+        json.dumps(stable_context, sort_keys=True, default=repr).encode('utf-8')
+    )
+    if shared_templates_dir is not None and os.path.isdir(shared_templates_dir):
+        for root, dirs, files in os.walk(shared_templates_dir):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                relpath = os.path.relpath(path, shared_templates_dir)
+                digest.update(f'\0{relpath}\0{file_hash(path)}'.encode())
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Record of the files generated into a project and what they came from.
+
+    Each output file is stored with the hash of its template file, of the
+    context and of the content written. A file whose template and context are
+    unchanged, and whose output was not edited since, is up to date and does
+    not need to be rendered again.
+    """
+
+    def __init__(self, project_dir: Path | str, context_hash: str) -> None:
+        """Load the manifest of `project_dir`, if the project has one.
+
+        :param project_dir: Directory of the generated project.
+        :param context_hash: Hash of the context of this run, as returned by
+            `context_hash()`.
+        """
+        self.path = os.path.join(project_dir, MANIFEST_FILE)
+        self.context_hash = context_hash
+        self.files: dict[str, dict[str, str]] = {}
+        self._previous: dict[str, dict[str, str]] = {}
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == MANIFEST_VERSION:
+            self._previous = data.get('files', {})
+
+    def is_up_to_date(
+        self, path: str, template_hash: str, output_hash: str | None
+    ) -> bool:
+        """Return whether an output file can be kept as is, recording it if so.
+
+        :param path: Path of the output file relative to the project dir.
+        :param template_hash: Hash of the template file it is generated from.
+        :param output_hash: Hash of the output file as found on disk, `None`
+            if it does not exist.
+        """
+        entry = self._previous.get(path)
+        if (
+            entry is None
+            or output_hash is None
+            or entry['template'] != template_hash
+            or entry['context'] != self.context_hash
+            or entry['output'] != output_hash
+        ):
+            return False
+        self._record(path, dict(entry, status=UNCHANGED))
+        return True
+
+    def record(
+        self,
+        path: str,
+        outfile: str,
+        template_hash: str,
+        previous_output_hash: str | None,
+    ) -> None:
+        """Record that `outfile` was generated during this run.
+
+        :param path: Path of the output file relative to the project dir.
+        :param outfile: Path of the output file.
+        :param template_hash: Hash of the template file it was generated from.
+        :param previous_output_hash: Hash of the output file before it was
+            generated, `None` if it did not exist.
+        """
+        if not os.path.isfile(outfile):
+            return
+        new_output_hash = file_hash(outfile)
+        if previous_output_hash is None:
+            status = ADDED
+        elif previous_output_hash == new_output_hash:
+            status = UNCHANGED
+        else:
+            status = CHANGED
+        self._record(
+            path,
+            {
+                'template': template_hash,
+                'context': self.context_hash,
+                'output': new_output_hash,
+                'status': status,
+            },
+        )
+
+    def _record(self, path: str, entry: dict[str, str]) -> None:
+        with self._lock:
+            self.files[path] = entry
+
+    def paths(self, status: str) -> list[str]:
+        """Return the sorted paths of the files with the given status."""
+        return sorted(
+            path for path, entry in self.files.items() if entry['status'] == status
+        )
+
+    def save(self) -> dict[str, list[str]]:
+        """Write the manifest into the project and report what changed.
+
+        :returns: The paths of the added, changed and unchanged files, keyed
+            by `ADDED`, `CHANGED` and `UNCHANGED`.
+        """
+        report = {status: self.paths(status) for status in (ADDED, CHANGED, UNCHANGED)}
+        for path in report[ADDED]:
+            logger.debug('Added %s', path)
+        for path in report[CHANGED]:
+            logger.debug('Changed %s', path)
+        logger.info(
+            'Generated %d new and %d changed files, left %d files alone',
+            len(report[ADDED]),
+            len(report[CHANGED]),
+            len(report[UNCHANGED]),
+        )
+
+        data = {'version': MANIFEST_VERSION, 'files': dict(sorted(self.files.items()))}
+        with open(self.path, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh, indent=2)
+            fh.write('\n')
+        return report
@@ -2,17 +2,22 @@
 
 from __future__ import annotations
 
+import contextlib
 import os
 import re
 from typing import TYPE_CHECKING
 
 from cookiecutter.exceptions import RepositoryNotFound
-from cookiecutter.vcs import clone
-from cookiecutter.zipfile import unzip
+from cookiecutter.tarfile import TAR_SUFFIXES, untar
+from cookiecutter.utils import file_lock
+from cookiecutter.vcs import clone, clone_by_commit
+from cookiecutter.zipfile import DOWNLOAD_CHUNK_SIZE, in_archive_cache, unzip
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+LOCKS_DIR_NAME = '.locks'
+
 REPO_REGEX = re.compile(
     r"""
 # something like git:// ssh:// file:// etc.
@@ -35,6 +40,11 @@ def is_zip_file(value: str) -> bool:
     return value.lower().endswith('.zip')
 
 
+def is_tar_file(value: str) -> bool:
+    """Return True if value is a tar file, compressed or not."""
+    return value.lower().endswith(TAR_SUFFIXES)
+
+
 def expand_abbreviations(template: str, abbreviations: dict[str, str]) -> str:
     """Expand abbreviations in a template name.
 
@@ -53,6 +63,33 @@ def expand_abbreviations(template: str, abbreviations: dict[str, str]) -> str:
     return template
 
 
+def cache_lock_path(clone_to_dir: Path | str, template: str) -> str:
+    """Return the lock file guarding the cache entry of a template URL.
+
+    The lock is named after the entry the template is cloned or downloaded
+    to in `clone_to_dir`, so all URLs populating one entry share a lock.
+
+    :param clone_to_dir: The directory templates are cloned into.
+    :param template: The URL of a repository or of a zip file.
+    """
+    name = template.rstrip('/').rsplit('/', 1)[-1].split(':')[-1]
+    if not is_zip_file(name):
+        name = name.removesuffix('.git')
+    return os.path.join(
+        os.path.expanduser(clone_to_dir), LOCKS_DIR_NAME, f'{name}.lock'
+    )
+
+
+def cache_use_lock_path(clone_to_dir: Path | str, template: str) -> str:
+    """Return the lock file runs using the cache entry of a template URL hold.
+
+    Runs using the entry hold a shared lock on it, updating the entry takes
+    an exclusive one. See `cache_lock_path()` for the arguments.
+    """
+    lock_path = cache_lock_path(clone_to_dir, template)
+    return f'{os.path.splitext(lock_path)[0]}.in-use.lock'
+
+
 def repository_has_cookiecutter_json(repo_directory: str) -> bool:
     """Determine if `repo_directory` contains a `cookiecutter.json` file.
 
@@ -75,12 +112,21 @@ def determine_repo_dir(
     no_input: bool,
     password: str | None = None,
     directory: str | None = None,
+    shallow_clone: bool = False,
+    refresh: str | None = None,
+    refresh_ttl: float = 3600,
+    content_addressed: bool = False,
+    download_chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    archive_cache_dir: Path | str | None = None,
+    render_from_archive: bool = False,
+    lock_stack: contextlib.ExitStack[bool | None] | None = None,
 ) -> tuple[str, bool]:
     """
     Locate the repository directory from a template reference.
 
     Applies repository abbreviations to the template reference.
     If the template refers to a repository URL, clone it.
+    If the template refers to a zip or tar file, unpack it.
     If the template is a path to a local repository, use it.
 
     :param template: A directory containing a project template directory,
@@ -93,6 +139,26 @@ def determine_repo_dir(
         cached resources.
     :param password: The password to use when extracting the repository.
     :param directory: Directory within repo where cookiecutter.json lives.
+    :param shallow_clone: Only download what is needed to check out
+        `checkout` when cloning a git repository.
+    :param refresh: How to reuse a repository already cloned into
+        `clone_to_dir`, see `cookiecutter.vcs.clone()`.
+    :param refresh_ttl: Seconds after which a cloned repository is stale.
+    :param content_addressed: Check repositories out by commit into the
+        content-addressed store of `clone_to_dir`, see
+        `cookiecutter.vcs.clone_by_commit()`.
+    :param download_chunk_size: Number of bytes read from the network at a
+        time when downloading a zip or tar file.
+    :param archive_cache_dir: Cache directory to keep unpacked zip files in,
+        reusing them instead of unpacking and cleaning them up every time.
+    :param render_from_archive: Leave the project template of a zip file
+        that is not kept in `archive_cache_dir` in the zip file, for
+        `generate_files()` to render it from there, see
+        `cookiecutter.zipfile.unzip()`.
+    :param lock_stack: Hold shared locks on the cloned repository or the
+        cached zip file template until this stack is closed. Other runs then
+        neither update the clone nor prune the cache entry while the template
+        is used.
     :return: A tuple containing the cookiecutter template directory, and
         a boolean describing whether that directory should be cleaned up
         after the template has been instantiated.
@@ -100,28 +166,76 @@ def determine_repo_dir(
     """
     template = expand_abbreviations(template, abbreviations)
 
-    if is_zip_file(template):
-        unzipped_dir = unzip(
-            zip_uri=template,
-            is_url=is_repo_url(template),
-            clone_to_dir=clone_to_dir,
-            no_input=no_input,
-            password=password,
-        )
-        repository_candidates = [unzipped_dir]
-        cleanup = True
-    elif is_repo_url(template):
-        cloned_repo = clone(
-            repo_url=template,
-            checkout=checkout,
-            clone_to_dir=clone_to_dir,
-            no_input=no_input,
-        )
-        repository_candidates = [cloned_repo]
-        cleanup = False
-    else:
-        repository_candidates = [template, os.path.join(clone_to_dir, template)]
-        cleanup = False
+    populate_lock = (
+        file_lock(cache_lock_path(clone_to_dir, template))
+        if is_repo_url(template) and not is_tar_file(template)
+        else contextlib.nullcontext(False)
+    )
+    # Only one process at a time populates a cache entry. Processes that had
+    # to wait for another one use the entry it just populated as it is.
+    with populate_lock as waited:
+        if is_zip_file(template):
+            unzipped_dir = unzip(
+                zip_uri=template,
+                is_url=is_repo_url(template),
+                clone_to_dir=clone_to_dir,
+                no_input=no_input,
+                password=password,
+                reuse_existing=waited,
+                chunk_size=download_chunk_size,
+                cache_dir=archive_cache_dir,
+                render_from_archive=render_from_archive,
+                lock_stack=lock_stack,
+            )
+            repository_candidates = [unzipped_dir]
+            cleanup = not in_archive_cache(unzipped_dir, archive_cache_dir)
+        elif is_tar_file(template):
+            # Tar files are unpacked as they are read, not kept anywhere.
+            untarred_dir = untar(
+                tar_uri=template,
+                is_url=is_repo_url(template),
+                chunk_size=download_chunk_size,
+            )
+            repository_candidates = [untarred_dir]
+            cleanup = True
+        elif is_repo_url(template) and content_addressed:
+            cloned_repo = clone_by_commit(
+                repo_url=template,
+                checkout=checkout,
+                clone_to_dir=clone_to_dir,
+                shallow=shallow_clone,
+                refresh=refresh,
+                refresh_ttl=refresh_ttl,
+            )
+            repository_candidates = [cloned_repo]
+            cleanup = False
+        elif is_repo_url(template):
+            # The clone is updated in place, once the runs still using it
+            # are done. Runs waiting to update it next wait for the populate
+            # lock, so the shared lock is taken before any of them updates it.
+            use_lock_path = cache_use_lock_path(clone_to_dir, template)
+            use_lock = (
+                file_lock(use_lock_path)
+                if lock_stack is not None
+                else contextlib.nullcontext(False)
+            )
+            with use_lock:
+                cloned_repo = clone(
+                    repo_url=template,
+                    checkout=checkout,
+                    clone_to_dir=clone_to_dir,
+                    no_input=no_input,
+                    shallow=shallow_clone,
+                    refresh='never' if waited else refresh,
+                    refresh_ttl=refresh_ttl,
+                )
+            if lock_stack is not None:
+                lock_stack.enter_context(file_lock(use_lock_path, shared=True))
+            repository_candidates = [cloned_repo]
+            cleanup = False
+        else:
+            repository_candidates = [template, os.path.join(clone_to_dir, template)]
+            cleanup = False
 
     if directory:
         repository_candidates = [
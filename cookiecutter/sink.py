@@ -0,0 +1,493 @@
+"""Destinations of the files of a generated project.
+
+`generate_files()` writes the project it generates to an `OutputSink`. The
+default sink writes the project to a directory. The other sinks keep it in
+memory, or stream it out as a zipfile or a tar file without writing the
+project to the filesystem.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import filecmp
+import io
+import os
+import posixpath
+import stat
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from typing import IO, TYPE_CHECKING, Literal
+
+from cookiecutter.utils import make_sure_path_exists, rmtree, write_if_changed
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from cookiecutter.source import TemplateSource
+
+#: Permission bits of files and directories written without any.
+DEFAULT_FILE_MODE = 0o644
+DEFAULT_DIR_MODE = 0o755
+
+
+def encode_text(text: str, newline: str | None) -> bytes:
+    """Encode text as writing it in text mode with `newline` would."""
+    buffer = io.BytesIO()
+    with io.TextIOWrapper(buffer, encoding='utf-8', newline=newline) as fh:
+        fh.write(text)
+        fh.flush()
+        return buffer.getvalue()
+
+
+class OutputSink:
+    """Where a generated project is written.
+
+    Paths given to a sink are the filesystem paths the project would have in
+    the output directory passed to `begin()`.
+    """
+
+    #: Whether the project ends up in a directory that hooks can run in.
+    writes_to_disk = False
+
+    def begin(self, output_dir: Path | str) -> None:
+        """Start receiving a project generated into `output_dir`."""
+        self.root = os.path.abspath(output_dir)
+
+    def exists(self, path: Path | str) -> bool:
+        """Return whether a file or a directory was written at `path`."""
+        raise NotImplementedError
+
+    def isdir(self, path: Path | str) -> bool:
+        """Return whether a directory was written at `path`."""
+        raise NotImplementedError
+
+    def make_dir(self, path: Path | str, mode: int | None = None) -> None:
+        """Create a directory and its missing parents.
+
+        :param path: The directory to create.
+        :param mode: Permission bits of the directory, defaults if `None`.
+        """
+        raise NotImplementedError
+
+    def write(self, path: Path | str, data: bytes, mode: int | None = None) -> bool:
+        """Write a file.
+
+        :param path: The file to write.
+        :param data: The content of the file.
+        :param mode: Permission bits of the file, defaults if `None`.
+        :return: True if the file was written, False if it was left untouched.
+        """
+        raise NotImplementedError
+
+    def write_text(
+        self,
+        path: Path | str,
+        chunks: Iterable[str],
+        newline: str | None,
+        mode: int | None = None,
+    ) -> bool:
+        """Write a file from chunks of text, such as those of a streamed render.
+
+        :param path: The file to write.
+        :param chunks: The text of the file.
+        :param newline: Line ending the text is written with, as in `open()`.
+        :param mode: Permission bits of the file, defaults if `None`.
+        :return: True if the file was written, False if it was left untouched.
+        """
+        return self.write(path, encode_text(''.join(chunks), newline), mode)
+
+    def copy_file(self, source: TemplateSource, infile: str, path: Path | str) -> bool:
+        """Copy a file of the template, with its permission bits.
+
+        :return: True if the file was written, False if it was left untouched.
+        """
+        with source.open(infile) as fh:
+            data = fh.read()
+        return self.write(path, data, source.mode(infile))
+
+    def copy_tree(self, source: TemplateSource, indir: str, path: Path | str) -> None:
+        """Copy a directory of the template, with its permission bits."""
+        self.make_dir(path, source.mode(indir))
+        dirs, files = source.listdir(indir)
+        for name in dirs:
+            self.copy_tree(source, os.path.join(indir, name), os.path.join(path, name))
+        for name in files:
+            self.copy_file(source, os.path.join(indir, name), os.path.join(path, name))
+
+    def remove_tree(self, path: Path | str) -> None:
+        """Remove a directory and everything written in it."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finish writing, releasing the resources held by the sink."""
+
+    def abort(self) -> None:
+        """Give up on a project that failed to generate, releasing the sink."""
+        self.close()
+
+    def __enter__(self) -> OutputSink:
+        """Return the sink itself, closing it on exit."""
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: object) -> None:
+        """Close the sink, or abort it if leaving on an exception."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class DirectorySink(OutputSink):
+    """Write the project to the filesystem, the default."""
+
+    writes_to_disk = True
+
+    def exists(self, path: Path | str) -> bool:
+        """Return whether `path` exists."""
+        return os.path.exists(path)
+
+    def isdir(self, path: Path | str) -> bool:
+        """Return whether `path` is a directory."""
+        return os.path.isdir(path)
+
+    def make_dir(self, path: Path | str, mode: int | None = None) -> None:
+        """Create a directory and its missing parents."""
+        make_sure_path_exists(path)
+        if mode is not None:
+            os.chmod(path, mode)
+
+    def write(self, path: Path | str, data: bytes, mode: int | None = None) -> bool:
+        """Write a file, leaving it untouched if it already holds `data`."""
+        written = write_if_changed(path, data)
+        if mode is not None:
+            os.chmod(path, mode)
+        return written
+
+    def write_text(
+        self,
+        path: Path | str,
+        chunks: Iterable[str],
+        newline: str | None,
+        mode: int | None = None,
+    ) -> bool:
+        """Write a file chunk by chunk, through a temporary file next to it.
+
+        A failing render neither leaves a truncated file behind nor clobbers
+        an existing one. The file is left untouched if the text is identical.
+        """
+        path = os.fspath(path)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f'.{os.path.basename(path)}.', dir=os.path.dirname(path)
+        )
+        try:
+            with open(fd, 'w', encoding='utf-8', newline=newline) as fh:
+                fh.writelines(chunks)
+            written = not (
+                os.path.isfile(path) and filecmp.cmp(tmp_path, path, shallow=False)
+            )
+            if written:
+                os.replace(tmp_path, path)
+            else:
+                os.remove(tmp_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        if mode is not None:
+            os.chmod(path, mode)
+        return written
+
+    def copy_file(self, source: TemplateSource, infile: str, path: Path | str) -> bool:
+        """Copy a file of the template, leaving an identical copy untouched."""
+        return source.copy_file(infile, path)
+
+    def copy_tree(self, source: TemplateSource, indir: str, path: Path | str) -> None:
+        """Make `path` a copy of a directory, leaving unchanged files alone."""
+        source.copy_tree(indir, path)
+
+    def remove_tree(self, path: Path | str) -> None:
+        """Remove a directory."""
+        rmtree(path)
+
+
+class EntrySink(OutputSink):
+    """Base class of the sinks keeping the project as a list of entries.
+
+    Entries are named with the POSIX path of the file or directory relative
+    to the output directory, such as ``project/README.md``. Parent directories
+    get an entry before the entries in them. Entries can be added from several
+    threads at once.
+    """
+
+    def __init__(self) -> None:
+        """Start without any entries."""
+        self.root = os.path.abspath('.')
+        self._dirs: set[str] = set()
+        self._files: set[str] = set()
+        self._lock = threading.Lock()
+
+    def entry_name(self, path: Path | str) -> str:
+        """Return the name of the entry for `path`."""
+        name = os.path.relpath(os.path.abspath(path), self.root)
+        name = name.replace(os.path.sep, '/')
+        if name == '.' or name.startswith('../') or name == '..':
+            msg = f'{path} is outside of the output directory {self.root}'
+            raise ValueError(msg)
+        return name
+
+    def exists(self, path: Path | str) -> bool:
+        """Return whether an entry was added for `path`."""
+        name = self.entry_name(path)
+        return name in self._dirs or name in self._files
+
+    def isdir(self, path: Path | str) -> bool:
+        """Return whether a directory entry was added for `path`."""
+        return os.path.abspath(path) == self.root or self.entry_name(path) in self._dirs
+
+    def make_dir(self, path: Path | str, mode: int | None = None) -> None:
+        """Add entries for a directory and its parents, unless they exist."""
+        name = self.entry_name(path)
+        with self._lock:
+            missing = []
+            while name and name not in self._dirs:
+                missing.append(name)
+                name = posixpath.dirname(name)
+            for missing_name in reversed(missing):
+                dir_mode = mode if missing_name == missing[0] else None
+                self._add_dir(
+                    missing_name, DEFAULT_DIR_MODE if dir_mode is None else dir_mode
+                )
+                self._dirs.add(missing_name)
+
+    def write(self, path: Path | str, data: bytes, mode: int | None = None) -> bool:
+        """Add an entry for a file."""
+        name = self.entry_name(path)
+        with self._lock:
+            self._add_file(name, data, DEFAULT_FILE_MODE if mode is None else mode)
+            self._files.add(name)
+        return True
+
+    def remove_tree(self, path: Path | str) -> None:
+        """Forget the entries of a directory and the entries in it."""
+        name = self.entry_name(path)
+        with self._lock:
+            for entries in (self._dirs, self._files):
+                removed = {e for e in entries if e == name or e.startswith(f'{name}/')}
+                entries.difference_update(removed)
+                for entry in removed:
+                    self._remove(entry)
+
+    def _add_dir(self, name: str, mode: int) -> None:
+        raise NotImplementedError
+
+    def _add_file(self, name: str, data: bytes, mode: int) -> None:
+        raise NotImplementedError
+
+    def _remove(self, name: str) -> None:
+        raise NotImplementedError
+
+
+class MemorySink(EntrySink):
+    """Keep the project in memory.
+
+    The content of the files is in `files` and the permission bits of the
+    files and directories in `modes`, by entry name.
+    """
+
+    def __init__(self) -> None:
+        """Start with an empty project."""
+        super().__init__()
+        self.files: dict[str, bytes] = {}
+        self.modes: dict[str, int] = {}
+
+    def write(self, path: Path | str, data: bytes, mode: int | None = None) -> bool:
+        """Add an entry for a file, unless it already holds `data`."""
+        name = self.entry_name(path)
+        if self.files.get(name) == data and (mode is None or self.modes[name] == mode):
+            return False
+        return super().write(path, data, mode)
+
+    def _add_dir(self, name: str, mode: int) -> None:
+        self.modes[name] = mode
+
+    def _add_file(self, name: str, data: bytes, mode: int) -> None:
+        self.files[name] = data
+        self.modes[name] = mode
+
+    def _remove(self, name: str) -> None:
+        self.files.pop(name, None)
+        self.modes.pop(name, None)
+
+
+class ArchiveOutput:
+    """The file an archive is streamed to, which can be given up on.
+
+    An archive written to a path goes to a temporary file next to it, which
+    only replaces the path once the archive is complete. Once aborted, the
+    output swallows everything written to it, so the archive is cut off where
+    it stood.
+
+    :param file: The path of the archive or a binary file object to write to.
+    """
+
+    def __init__(self, file: Path | str | IO[bytes]) -> None:
+        """Open the output for writing."""
+        self.path: str | None = None
+        self.aborted = False
+        if isinstance(file, (str, os.PathLike)):
+            self.path = os.path.abspath(file)
+            fd, self._tmp_path = tempfile.mkstemp(
+                prefix=f'.{os.path.basename(self.path)}.',
+                dir=os.path.dirname(self.path),
+            )
+            self._file: IO[bytes] = open(fd, 'wb')  # noqa: SIM115
+        else:
+            self._file = file
+
+    def write(self, data: bytes) -> int:
+        """Write data, unless the output was aborted."""
+        if self.aborted:
+            return len(data)
+        return self._file.write(data)
+
+    def flush(self) -> None:
+        """Flush the file, unless the output was aborted."""
+        if not self.aborted:
+            self._file.flush()
+
+    def finish(self) -> None:
+        """Put an archive written to a path in place."""
+        if self.path is not None and not self._file.closed:
+            self._file.close()
+            os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Stop writing, removing the temporary file of an archive."""
+        self.aborted = True
+        if self.path is not None and not self._file.closed:
+            self._file.close()
+            with contextlib.suppress(OSError):
+                os.remove(self._tmp_path)
+
+
+class ArchiveSink(EntrySink):
+    """Base class of the sinks streaming the project out as an archive.
+
+    Entries written to a stream cannot be taken back, so a project removed
+    after a failure, see `remove_tree()`, discards the whole archive when the
+    sink is closed, as `abort()` does. An archive written to a path is then
+    never put in place. An archive written to a file object is left unfinished,
+    without the records closing it.
+    """
+
+    def __init__(self, file: Path | str | IO[bytes]) -> None:
+        """Stream the archive to `file`."""
+        super().__init__()
+        self.output = ArchiveOutput(file)
+        self._discarded = False
+
+    def _remove(self, name: str) -> None:  # noqa: ARG002
+        self._discarded = True
+
+    def _finish_archive(self) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finish the archive, unless the project was removed from it."""
+        if self._discarded:
+            self.abort()
+            return
+        self._finish_archive()
+        self.output.finish()
+
+    def abort(self) -> None:
+        """Discard the archive, leaving it unfinished."""
+        self.output.abort()
+        self._finish_archive()
+
+
+class ZipSink(ArchiveSink):
+    """Stream the project out as a zipfile.
+
+    Each file is compressed and written out as soon as it is generated, so
+    `file` does not need to be seekable, it can be a socket or a pipe. The
+    zipfile is complete once the sink is closed. If generating the project
+    fails, it is left without its central directory, which zip readers need.
+
+    :param file: The path of the zipfile or a binary file object to write to.
+    :param compression: The compression method of the members.
+    """
+
+    def __init__(
+        self, file: Path | str | IO[bytes], compression: int = zipfile.ZIP_DEFLATED
+    ) -> None:
+        """Write a zipfile to `file`."""
+        super().__init__(file)
+        self.zip_file = zipfile.ZipFile(self.output, 'w', compression)  # type: ignore[call-overload]
+        self._date_time = time.localtime()[:6]
+
+    def _add_dir(self, name: str, mode: int) -> None:
+        info = zipfile.ZipInfo(f'{name}/', self._date_time)
+        # The MS-DOS directory attribute, as `ZipFile.mkdir` sets it.
+        info.external_attr = (stat.S_IFDIR | mode) << 16 | 0x10
+        self.zip_file.writestr(info, b'')
+
+    def _add_file(self, name: str, data: bytes, mode: int) -> None:
+        info = zipfile.ZipInfo(name, self._date_time)
+        info.external_attr = (stat.S_IFREG | mode) << 16
+        info.compress_type = self.zip_file.compression
+        self.zip_file.writestr(info, data)
+
+    def _finish_archive(self) -> None:
+        """Write the central directory, finishing the zipfile."""
+        self.zip_file.close()
+
+
+class TarSink(ArchiveSink):
+    """Stream the project out as a tar file.
+
+    Each file is written out as soon as it is generated, so `file` does not
+    need to be seekable. The tar file is complete once the sink is closed.
+    If generating the project fails, it is left without its end-of-archive
+    blocks, and a compressed tar file without the end of its compressed
+    stream. Readers only notice the latter, an uncompressed tar file cut off
+    between two members looks complete.
+
+    :param file: The path of the tar file or a binary file object to write to.
+    :param mode: The mode the tar file is opened with, which sets its
+        compression, as in `tarfile.open()`.
+    """
+
+    def __init__(
+        self,
+        file: Path | str | IO[bytes],
+        mode: Literal['w|', 'w|gz', 'w|bz2', 'w|xz'] = 'w|gz',
+    ) -> None:
+        """Write a tar file to `file`."""
+        super().__init__(file)
+        self.tar_file = tarfile.open(fileobj=self.output, mode=mode)  # type: ignore[call-overload]  # noqa: SIM115
+        self._mtime = int(time.time())
+
+    def _tar_info(self, name: str, mode: int) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(name)
+        info.mode = mode
+        info.mtime = self._mtime
+        return info
+
+    def _add_dir(self, name: str, mode: int) -> None:
+        info = self._tar_info(name, mode)
+        info.type = tarfile.DIRTYPE
+        self.tar_file.addfile(info)
+
+    def _add_file(self, name: str, data: bytes, mode: int) -> None:
+        info = self._tar_info(name, mode)
+        info.size = len(data)
+        self.tar_file.addfile(info, io.BytesIO(data))
+
+    def _finish_archive(self) -> None:
+        """Write the end of archive blocks, finishing the tar file."""
+        self.tar_file.close()
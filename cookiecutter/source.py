@@ -0,0 +1,407 @@
+"""Sources of the files of a project template.
+
+`generate_files()` reads the project template through a `TemplateSource`. The
+template is usually a directory, but it can also be left in the zipfile it
+was distributed in and read from there without being unpacked.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+from zipfile import ZipFile
+
+from jinja2 import BaseLoader, FileSystemLoader, TemplateNotFound
+
+from cookiecutter.cache import FileIndex, sniff_data
+from cookiecutter.manifest import file_hash
+from cookiecutter.utils import copy_file, make_sure_path_exists, rmtree, sync_tree
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from jinja2 import Environment
+
+    from cookiecutter.cache import FileInfo
+
+#: Name of the file recording which directories of a repository were left in
+#: its zipfile by `cookiecutter.zipfile.unzip()`.
+ARCHIVE_REFERENCE_FILE = '.cookiecutter-archive.json'
+
+
+def filesystem_loader(template_dir: str) -> FileSystemLoader:
+    """Return a loader for a template directory and the templates next to it."""
+    return FileSystemLoader(
+        [template_dir, os.path.join(os.path.dirname(template_dir), 'templates')]
+    )
+
+
+class TemplateSource:
+    """The files of a project template.
+
+    Paths are relative to the template directory, as `os.walk` run from the
+    template directory gives them.
+    """
+
+    def walk(self) -> Iterator[tuple[str, list[str], list[str]]]:
+        """Walk the template top-down, like ``os.walk('.')``.
+
+        Directories removed from the yielded list of directories are skipped.
+        """
+        raise NotImplementedError
+
+    def classify(self, path: str, binary: bool | None = None) -> FileInfo:
+        """Return whether a file is binary, and its line ending.
+
+        :param path: The file to classify.
+        :param binary: Known binary status of the file, sniffed if `None`.
+        """
+        raise NotImplementedError
+
+    def file_hash(self, path: str) -> str:
+        """Return the SHA-256 hex digest of the content of a file."""
+        raise NotImplementedError
+
+    def open(self, path: str) -> IO[bytes]:
+        """Open a file for reading in binary mode."""
+        raise NotImplementedError
+
+    def mode(self, path: str) -> int | None:
+        """Return the permission bits of a file, `None` if it has none."""
+        raise NotImplementedError
+
+    def loader(self) -> BaseLoader:
+        """Return a Jinja2 loader for the files of the template.
+
+        Templates are looked up in the template directory first, and in the
+        shared ``templates`` directory next to it then.
+        """
+        raise NotImplementedError
+
+    def listdir(self, path: str) -> tuple[list[str], list[str]]:
+        """Return the directories and the files in a directory of the template.
+
+        The template is walked once, on the first call, and later calls look
+        the directory up in what that walk found.
+        """
+        try:
+            dirs, files = self._listing[
+                posixpath.normpath(path.replace(os.path.sep, '/'))
+            ]
+        except KeyError:
+            raise FileNotFoundError(path) from None
+        return list(dirs), list(files)
+
+    @functools.cached_property
+    def _listing(self) -> dict[str, tuple[list[str], list[str]]]:
+        return {
+            posixpath.normpath(root.replace(os.path.sep, '/')): (dirs, files)
+            for root, dirs, files in self.walk()
+        }
+
+    def copy_mode(self, path: str, dst: Path | str) -> None:
+        """Copy the permission bits of a file to `dst`."""
+        mode = self.mode(path)
+        if mode is not None:
+            os.chmod(dst, mode)
+
+    def copy_file(self, path: str, dst: Path | str) -> bool:
+        """Copy the contents and permission bits of a file to `dst`.
+
+        :return: True if `dst` was written, False if it was already a copy.
+        """
+        with self.open(path) as src_fh:
+            data = src_fh.read()
+        try:
+            with open(dst, 'rb') as dst_fh:
+                written = dst_fh.read() != data
+        except OSError:
+            written = True
+        if written:
+            with open(dst, 'wb') as dst_fh:
+                dst_fh.write(data)
+        self.copy_mode(path, dst)
+        return written
+
+    def copy_tree(self, path: str, dst: Path | str) -> None:
+        """Make `dst` a copy of a directory of the template."""
+        dirs, files = self.listdir(path)
+        if os.path.lexists(dst) and (os.path.islink(dst) or not os.path.isdir(dst)):
+            os.remove(dst)
+        make_sure_path_exists(dst)
+        for name in set(os.listdir(dst)).difference(dirs, files):
+            stale = os.path.join(dst, name)
+            if os.path.isdir(stale) and not os.path.islink(stale):
+                rmtree(stale)
+            else:
+                os.remove(stale)
+        for name in dirs:
+            self.copy_tree(os.path.join(path, name), os.path.join(dst, name))
+        for name in files:
+            self.copy_file(os.path.join(path, name), os.path.join(dst, name))
+        self.copy_mode(path, dst)
+
+    def close(self) -> None:
+        """Release the resources held by the source."""
+
+    def __enter__(self) -> TemplateSource:
+        """Return the source itself, closing it on exit."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the source."""
+        self.close()
+
+
+class DirectorySource(TemplateSource):
+    """A project template in a directory.
+
+    Must be used with the template directory as the current working directory.
+
+    :param file_index: Index holding the classification of template files
+        from earlier runs. Files are sniffed every time if not given.
+    """
+
+    def __init__(self, file_index: FileIndex | None = None) -> None:
+        """Read the template in the current working directory."""
+        self.file_index = file_index if file_index is not None else FileIndex()
+
+    def walk(self) -> Iterator[tuple[str, list[str], list[str]]]:
+        """Walk the template top-down, like ``os.walk('.')``."""
+        return os.walk('.')
+
+    def classify(self, path: str, binary: bool | None = None) -> FileInfo:
+        """Return the classification of a file kept in the file index."""
+        return self.file_index.classify(path, binary)
+
+    def file_hash(self, path: str) -> str:
+        """Return the SHA-256 hex digest of the content of a file."""
+        return file_hash(path)
+
+    def open(self, path: str) -> IO[bytes]:
+        """Open a file for reading in binary mode."""
+        return open(path, 'rb')
+
+    def mode(self, path: str) -> int | None:
+        """Return the permission bits of a file."""
+        return os.stat(path).st_mode & 0o7777
+
+    def loader(self) -> BaseLoader:
+        """Return a loader reading templates from the filesystem."""
+        return filesystem_loader(os.path.abspath('.'))
+
+    def listdir(self, path: str) -> tuple[list[str], list[str]]:
+        """Return the directories and the files in a directory, sorted."""
+        for _root, dirs, files in os.walk(path):
+            return sorted(dirs), sorted(files)
+        raise FileNotFoundError(path)
+
+    def copy_mode(self, path: str, dst: Path | str) -> None:
+        """Copy the permission bits of a file to `dst`."""
+        shutil.copymode(path, dst)
+
+    def copy_file(self, path: str, dst: Path | str) -> bool:
+        """Copy a file to `dst`, with a reflink where the filesystem allows."""
+        return copy_file(path, dst)
+
+    def copy_tree(self, path: str, dst: Path | str) -> None:
+        """Make `dst` a copy of a directory, leaving unchanged files alone."""
+        sync_tree(path, dst)
+
+
+class ZipLoader(BaseLoader):
+    """Jinja2 loader reading templates from the members of a zipfile.
+
+    :param zip_file: The open zipfile.
+    :param search_path: Directories of the zipfile to look templates up in,
+        in order.
+    :param password: The password of a protected zipfile.
+    """
+
+    def __init__(
+        self, zip_file: ZipFile, search_path: list[str], password: bytes | None = None
+    ) -> None:
+        """Look templates up in `search_path` of `zip_file`."""
+        self.zip_file = zip_file
+        self.search_path = search_path
+        self.password = password
+
+    def get_source(
+        self,
+        environment: Environment,  # noqa: ARG002
+        template: str,
+    ) -> tuple[str, str | None, Callable[[], bool] | None]:
+        """Return the source of a template, which never changes on disk."""
+        for directory in self.search_path:
+            member = posixpath.join(directory, template)
+            try:
+                data = self.zip_file.read(member, pwd=self.password)
+            except KeyError:
+                continue
+            filename = posixpath.join(str(self.zip_file.filename), member)
+            return data.decode('utf-8'), filename, lambda: True
+        raise TemplateNotFound(template)
+
+
+class ZipSource(TemplateSource):
+    """A project template read from the members of a zipfile.
+
+    Files are read into memory when rendered, and streamed to their
+    destination when copied, so the template is never unpacked.
+
+    :param zip_file: The open zipfile. It is closed with the source.
+    :param template_dir: The member name of the template directory, such
+        as ``repo/{{cookiecutter.repo_name}}``.
+    :param password: The password of a protected zipfile.
+    """
+
+    def __init__(
+        self, zip_file: ZipFile, template_dir: str, password: bytes | None = None
+    ) -> None:
+        """Read the template in `template_dir` of `zip_file`."""
+        self.zip_file = zip_file
+        self.template_dir = template_dir.rstrip('/')
+        self.password = password
+        self._tree: dict[str, tuple[set[str], dict[str, str]]] = {'.': (set(), {})}
+        self._dir_members: dict[str, str] = {}
+        prefix = f'{self.template_dir}/'
+        for info in zip_file.infolist():
+            if not info.filename.startswith(prefix):
+                continue
+            path = info.filename[len(prefix) :].rstrip('/')
+            if not path:
+                continue
+            parent, name = posixpath.split(path)
+            self._add_dir(parent or '.')
+            if info.is_dir():
+                self._add_dir(path)
+                self._dir_members[path] = info.filename
+            else:
+                self._tree[parent or '.'][1][name] = info.filename
+
+    def _add_dir(self, path: str) -> None:
+        while path not in self._tree:
+            self._tree[path] = (set(), {})
+            parent, name = posixpath.split(path)
+            self._tree[parent or '.'][0].add(name)
+            path = parent or '.'
+
+    def _member(self, path: str) -> str:
+        parent, name = posixpath.split(
+            posixpath.normpath(path.replace(os.path.sep, '/'))
+        )
+        try:
+            return self._tree[parent or '.'][1][name]
+        except KeyError:
+            raise FileNotFoundError(path) from None
+
+    def walk(self) -> Iterator[tuple[str, list[str], list[str]]]:
+        """Walk the template top-down, like ``os.walk('.')``."""
+        pending = ['.']
+        while pending:
+            root = pending.pop()
+            subdirs, files = self._tree[posixpath.normpath(root)]
+            dirs = sorted(subdirs)
+            yield root.replace('/', os.path.sep), dirs, sorted(files)
+            pending.extend(posixpath.join(root, d) for d in reversed(dirs))
+
+    def listdir(self, path: str) -> tuple[list[str], list[str]]:
+        """Return the directories and the files in a directory of the template."""
+        try:
+            subdirs, files = self._tree[
+                posixpath.normpath(path.replace(os.path.sep, '/'))
+            ]
+        except KeyError:
+            raise FileNotFoundError(path) from None
+        return sorted(subdirs), sorted(files)
+
+    def classify(self, path: str, binary: bool | None = None) -> FileInfo:
+        """Return the classification of a file, sniffed from its content."""
+        with self.open(path) as fh:
+            return sniff_data(path, fh.read(), binary)
+
+    def file_hash(self, path: str) -> str:
+        """Return the SHA-256 hex digest of the content of a file."""
+        digest = hashlib.sha256()
+        with self.open(path) as fh:
+            for chunk in iter(lambda: fh.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def open(self, path: str) -> IO[bytes]:
+        """Open a member of the zipfile for reading."""
+        return self.zip_file.open(self._member(path), pwd=self.password)
+
+    def mode(self, path: str) -> int | None:
+        """Return the permission bits stored with a member, if any."""
+        member = self._dir_members.get(
+            posixpath.normpath(path.replace(os.path.sep, '/'))
+        )
+        info = self.zip_file.getinfo(member or self._member(path))
+        mode = (info.external_attr >> 16) & 0o7777
+        return mode or None
+
+    def loader(self) -> BaseLoader:
+        """Return a loader reading templates from the zipfile."""
+        shared_dir = posixpath.join(posixpath.dirname(self.template_dir), 'templates')
+        return ZipLoader(self.zip_file, [self.template_dir, shared_dir], self.password)
+
+    def copy_file(self, path: str, dst: Path | str) -> bool:
+        """Stream a member of the zipfile to `dst`, unless it is a copy already."""
+        member = self._member(path)
+        info = self.zip_file.getinfo(member)
+        if os.path.isfile(dst) and os.path.getsize(dst) == info.file_size:
+            return super().copy_file(path, dst)
+        with self.open(path) as src_fh, open(dst, 'wb') as dst_fh:
+            shutil.copyfileobj(src_fh, dst_fh)
+        self.copy_mode(path, dst)
+        return True
+
+    def close(self) -> None:
+        """Close the zipfile."""
+        self.zip_file.close()
+
+
+def archive_source(repo_dir: Path | str, template_dir: Path | str) -> ZipSource | None:
+    """Return the source of a template that was left in its zipfile.
+
+    `cookiecutter.zipfile.unzip()` leaves the project template directories of
+    a repository in the zipfile when asked to, and records them in the
+    repository directory.
+
+    :param repo_dir: The unpacked repository directory.
+    :param template_dir: The project template directory in `repo_dir`.
+    :return: The source reading `template_dir` from the zipfile, or `None` if
+        the template was unpacked.
+    """
+    reference_path = os.path.join(repo_dir, ARCHIVE_REFERENCE_FILE)
+    try:
+        with open(reference_path, encoding='utf-8') as fh:
+            reference: dict[str, Any] = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    members = reference.get('templates', {})
+    member = members.get(os.path.basename(os.fspath(template_dir)))
+    if member is None:
+        return None
+    return ZipSource(ZipFile(reference['archive']), member)
+
+
+def write_archive_reference(
+    repo_dir: Path | str, zip_path: str, templates: dict[str, str]
+) -> None:
+    """Record in `repo_dir` the template directories left in a zipfile.
+
+    :param repo_dir: The unpacked repository directory.
+    :param zip_path: The zipfile the templates were left in.
+    :param templates: Member names of the template directories, by name.
+    """
+    reference_path = os.path.join(repo_dir, ARCHIVE_REFERENCE_FILE)
+    with open(reference_path, 'w', encoding='utf-8') as fh:
+        json.dump({'archive': os.path.abspath(zip_path), 'templates': templates}, fh)
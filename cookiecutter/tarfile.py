@@ -0,0 +1,136 @@
+"""Utility functions for handling and fetching repo archives in tar format."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import posixpath
+import tarfile
+import tempfile
+from typing import IO, TYPE_CHECKING
+
+from cookiecutter.exceptions import InvalidTarRepository
+from cookiecutter.utils import rmtree
+from cookiecutter.zipfile import DOWNLOAD_CHUNK_SIZE, get_session
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+#: Suffixes of tar files. Their compression is detected from their content.
+TAR_SUFFIXES: tuple[str, ...] = ('.tar', '.tar.gz', '.tgz', '.tar.xz')
+if 'zst' in tarfile.TarFile.OPEN_METH:  # Python 3.14+
+    TAR_SUFFIXES += ('.tar.zst',)
+
+
+@contextlib.contextmanager
+def _open_source(tar_uri: str, is_url: bool) -> Iterator[IO[bytes]]:
+    """Open a tar file, or the body of the response to a request for it."""
+    if not is_url:
+        with open(tar_uri, 'rb') as fh:
+            yield fh
+        return
+
+    response = get_session().get(tar_uri, stream=True, timeout=100)
+    try:
+        response.raise_for_status()
+        # Undo any Content-Encoding of the transfer, as iter_content would.
+        response.raw.decode_content = True
+        yield response.raw
+    finally:
+        response.close()
+
+
+def _checked_members(
+    tar_file: tarfile.TarFile, tar_uri: str, top_level: list[str]
+) -> Iterator[tarfile.TarInfo]:
+    """Yield the members of a tar file read as a stream, validating each one.
+
+    The first member has to be the top-level directory of the archive, and
+    all other members have to be inside it, as do the targets of links. Only
+    files, directories and links are allowed. The name of the top-level
+    directory is appended to `top_level`.
+    """
+    for member in tar_file:
+        name = posixpath.normpath(member.name.removeprefix('./'))
+        if name.startswith(('/', '../')) or name == '..':
+            msg = f'Tar repository {tar_uri} has a member outside of it: {member.name}'
+            raise InvalidTarRepository(msg)
+        if not (member.isfile() or member.isdir() or member.issym() or member.islnk()):
+            msg = f'Tar repository {tar_uri} has a special file: {member.name}'
+            raise InvalidTarRepository(msg)
+        if not top_level:
+            if not member.isdir() or '/' in name or name == '.':
+                msg = f'Tar repository {tar_uri} does not include a top-level directory'
+                raise InvalidTarRepository(msg)
+            top_level.append(name)
+        elif not name.startswith(f'{top_level[0]}/'):
+            msg = (
+                f'Tar repository {tar_uri} has a member outside of its '
+                f'top-level directory: {member.name}'
+            )
+            raise InvalidTarRepository(msg)
+        elif member.issym() or member.islnk():
+            # Symbolic links are relative to their own directory, hard links
+            # to the root of the archive.
+            target = posixpath.normpath(
+                posixpath.join(posixpath.dirname(name), member.linkname)
+                if member.issym()
+                else member.linkname.removeprefix('./')
+            )
+            if member.linkname.startswith('/') or not target.startswith(
+                f'{top_level[0]}/'
+            ):
+                msg = (
+                    f'Tar repository {tar_uri} has a link leading outside of '
+                    f'its top-level directory: {member.name} -> {member.linkname}'
+                )
+                raise InvalidTarRepository(msg)
+        yield member
+
+
+def untar(
+    tar_uri: str,
+    is_url: bool,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+) -> str:
+    """Unpack a tar file at a given URI into a temporary directory.
+
+    The file is read as a stream and unpacked as it is read, straight from the
+    response when it is downloaded, without keeping a copy of it.
+
+    :param tar_uri: The URI for the tar file.
+    :param is_url: Is the tar URI a URL or a file?
+    :param chunk_size: Number of bytes read from the file or the network at a
+        time.
+    :return: The unpacked repository, inside a temporary directory which the
+        caller removes.
+    """
+    # Members are checked against the same rules as those of a zip file, and
+    # links and special files are checked as the `data` filter does, which is
+    # also used where it exists.
+    filter_args = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+    unpack_base = tempfile.mkdtemp()
+    top_level: list[str] = []
+    try:
+        with (
+            _open_source(tar_uri, is_url) as source,
+            tarfile.open(fileobj=source, mode='r|*', bufsize=chunk_size) as tar_file,
+        ):
+            tar_file.extractall(  # noqa: S202
+                unpack_base,
+                members=_checked_members(tar_file, tar_uri, top_level),
+                **filter_args,  # type: ignore[arg-type]
+            )
+    except tarfile.TarError as e:
+        rmtree(unpack_base)
+        msg = f'Tar repository {tar_uri} is not a valid tar archive: {e}'
+        raise InvalidTarRepository(msg) from e
+    except BaseException:
+        rmtree(unpack_base)
+        raise
+    if not top_level:
+        rmtree(unpack_base)
+        msg = f'Tar repository {tar_uri} is empty'
+        raise InvalidTarRepository(msg)
+
+    return os.path.join(unpack_base, top_level[0])
@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 import contextlib
+import copy
+import filecmp
+import json
 import logging
 import os
 import shutil
 import stat
+import sys
 import tempfile
+import threading
+from collections import OrderedDict
 from collections.abc import Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
@@ -16,11 +22,26 @@ from jinja2.ext import Extension
 
 from cookiecutter.environment import StrictEnvironment
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
 if TYPE_CHECKING:
     from jinja2 import Environment
 
 logger = logging.getLogger(__name__)
 
+# ioctl request cloning a file as a copy-on-write reflink, see ioctl_ficlone(2)
+FICLONE = 0x40049409
+
+#: Version control metadata directories, left out of temporary repo copies.
+VCS_METADATA_DIRS = frozenset({'.bzr', '.git', '.hg', '.svn'})
+
+ENVIRONMENT_CACHE_SIZE = 16
+_environment_cache: OrderedDict[str, StrictEnvironment] = OrderedDict()
+_environment_cache_lock = threading.Lock()
+
 
 def force_delete(func, path, _exc_info) -> None:  # type: ignore[no-untyped-def]
     """Error handler for `shutil.rmtree()` equivalent to `rm -rf`.
@@ -68,6 +89,158 @@ def work_in(dirname: Path | str | None = None) -> Iterator[None]:
         os.chdir(curdir)
 
 
+@contextlib.contextmanager
+def file_lock(
+    path: Path | str, shared: bool = False, blocking: bool = True
+) -> Iterator[bool]:
+    """Context manager holding a lock on the lock file `path`.
+
+    The lock is taken with ``flock()``, so it excludes other processes as well
+    as other threads, and is released by the OS if the process dies. Yields
+    whether the lock was held by someone else and had to be waited for. Where
+    ``fcntl`` is not available (Windows), no lock is taken.
+
+    :param path: The lock file, created if missing.
+    :param shared: Take a shared lock, which only excludes exclusive ones.
+    :param blocking: Wait for the lock if it is held, otherwise raise
+        `BlockingIOError` right away.
+    """
+    make_sure_path_exists(os.path.dirname(os.path.abspath(path)))
+    with open(path, 'a') as fh:
+        if fcntl is None:
+            yield False
+            return
+        operation = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+        try:
+            fcntl.flock(fh.fileno(), operation | fcntl.LOCK_NB)
+            waited = False
+        except BlockingIOError:
+            if not blocking:
+                raise
+            logger.debug('Waiting for the lock on %s', path)
+            fcntl.flock(fh.fileno(), operation)
+            waited = True
+        try:
+            yield waited
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _reflink(src: Path | str, dst: Path | str) -> bool:
+    """Try to clone `src` into `dst` with a copy-on-write reflink.
+
+    Only works on Linux filesystems supporting ``FICLONE`` (Btrfs, XFS, ...).
+    Returns False, leaving `dst` to be overwritten, if the clone failed.
+    """
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return False
+    try:
+        with open(src, 'rb') as src_fh, open(dst, 'wb') as dst_fh:
+            fcntl.ioctl(dst_fh.fileno(), FICLONE, src_fh.fileno())
+    except OSError:
+        return False
+    return True
+
+
+def copy_file(src: Path | str, dst: Path | str) -> bool:
+    """Copy the contents and permission bits of `src` to `dst`.
+
+    A copy-on-write reflink is tried first, falling back to `shutil.copyfile`,
+    which uses the platform's in-kernel copy where available. An existing
+    `dst` with the same content as `src` is not written to, so it keeps its
+    modification time.
+
+    :param src: The file to copy.
+    :param dst: The destination file path.
+    :return: True if `dst` was written, False if it was already a copy.
+    """
+    written = not (os.path.isfile(dst) and filecmp.cmp(src, dst, shallow=False))
+    if written and not _reflink(src, dst):
+        shutil.copyfile(src, dst)
+    shutil.copymode(src, dst)
+    return written
+
+
+def write_if_changed(path: Path | str, data: bytes) -> bool:
+    """Write `data` to `path` unless the file already holds exactly that.
+
+    Leaving identical files untouched keeps their modification time and spares
+    a write, which matters on network and copy-on-write filesystems.
+
+    :param path: The file to write.
+    :param data: The content the file should have.
+    :return: True if the file was written, False if it was left untouched.
+    """
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as fh:
+                if fh.read() == data:
+                    return False
+    except OSError:
+        pass
+    with open(path, 'wb') as fh:
+        fh.write(data)
+    return True
+
+
+def _is_up_to_date(src: str, dst: str) -> bool:
+    """Check whether `dst` is a copy of `src` with the same size and mtime."""
+    try:
+        src_stat = os.stat(src)
+        dst_stat = os.lstat(dst)
+    except OSError:
+        return False
+    return (
+        stat.S_ISREG(dst_stat.st_mode)
+        and src_stat.st_size == dst_stat.st_size
+        and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+    )
+
+
+def _remove_path(path: str) -> None:
+    """Remove a file, symlink or directory tree."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        rmtree(path)
+    else:
+        os.remove(path)
+
+
+def sync_tree(src: Path | str, dst: Path | str) -> None:
+    """Make `dst` a copy of the directory tree `src`.
+
+    Behaves like removing `dst` and calling `shutil.copytree`, but files that
+    already have the size and modification time of their source are left
+    untouched, so re-copying an unchanged tree costs a ``stat`` per file.
+
+    :param src: The directory tree to copy.
+    :param dst: The destination directory.
+    """
+    src = os.fspath(src)
+    dst = os.fspath(dst)
+    if os.path.lexists(dst) and (os.path.islink(dst) or not os.path.isdir(dst)):
+        os.remove(dst)
+    os.makedirs(dst, exist_ok=True)
+
+    src_names = sorted(os.listdir(src))
+    for name in set(os.listdir(dst)).difference(src_names):
+        _remove_path(os.path.join(dst, name))
+
+    for name in src_names:
+        src_path = os.path.join(src, name)
+        dst_path = os.path.join(dst, name)
+        if os.path.isdir(src_path):
+            sync_tree(src_path, dst_path)
+            continue
+        if _is_up_to_date(src_path, dst_path):
+            continue
+        if os.path.lexists(dst_path):
+            _remove_path(dst_path)
+        copy_file(src_path, dst_path)
+        shutil.copystat(src_path, dst_path)
+
+    shutil.copystat(src, dst)
+
+
 def make_executable(script_path: Path | str) -> None:
     """Make `script_path` executable.
 
@@ -89,18 +262,105 @@ def simple_filter(filter_function) -> type[Extension]:  # type: ignore[no-untype
     return SimpleFilterExtension
 
 
+def _copy_with_reflink(src: str, dst: str) -> str:
+    """Copy a file and its metadata like `shutil.copy2`, with a reflink if possible."""
+    if not _reflink(src, dst):
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
+
 def create_tmp_repo_dir(repo_dir: Path | str) -> Path:
-    """Create a temporary dir with a copy of the contents of repo_dir."""
+    """Create a temporary dir with a copy of the contents of repo_dir.
+
+    Files are cloned with copy-on-write reflinks where the filesystem supports
+    them, which costs no data copy until the copy is written to. The version
+    control metadata at the top of repo_dir, such as ``.git``, is left out.
+    """
     repo_dir = Path(repo_dir).resolve()
     base_dir = tempfile.mkdtemp(prefix='cookiecutter')
     new_dir = f"{base_dir}/{repo_dir.name}"
     logger.debug(f'Copying repo_dir from {repo_dir} to {new_dir}')
-    shutil.copytree(repo_dir, new_dir)
+
+    def ignore_vcs_metadata(src: str, names: list[str]) -> set[str]:
+        if Path(src) != repo_dir:
+            return set()
+        return {name for name in names if name in VCS_METADATA_DIRS}
+
+    shutil.copytree(
+        repo_dir,
+        new_dir,
+        ignore=ignore_vcs_metadata,
+        copy_function=_copy_with_reflink,
+    )
     return Path(new_dir)
 
 
+def has_template_markup(text: str, env: Environment) -> bool:
+    """Check whether `text` contains anything Jinja would not render verbatim."""
+    markers = [
+        env.variable_start_string,
+        env.block_start_string,
+        env.comment_start_string,
+        env.line_statement_prefix,
+        env.line_comment_prefix,
+    ]
+    return any(marker in text for marker in markers if marker)
+
+
+def _environment_cache_key(context: dict[str, Any]) -> str:
+    """Return the part of `context` that shapes a Jinja environment, as a key."""
+    cookiecutter_dict = context.get('cookiecutter', {})
+    extensions = [str(ext) for ext in cookiecutter_dict.get('_extensions', [])]
+    envvars = cookiecutter_dict.get('_jinja2_env_vars', {})
+    return json.dumps([extensions, envvars], sort_keys=True, default=repr)
+
+
 def create_env_with_context(context: dict[str, Any]) -> StrictEnvironment:
-    """Create a jinja environment using the provided context."""
+    """Create a jinja environment using the provided context.
+
+    Environments are shared between every caller whose context has the same
+    ``_extensions`` and ``_jinja2_env_vars``, so prompting, generation and the
+    hooks of a single run load the extensions only once. Callers that need a
+    different loader or bytecode cache should use ``env.overlay()`` rather
+    than changing the shared environment.
+    """
+    key = _environment_cache_key(context)
+    with _environment_cache_lock:
+        env = _environment_cache.get(key)
+        if env is not None:
+            _environment_cache.move_to_end(key)
+            return env
+
     envvars = context.get('cookiecutter', {}).get('_jinja2_env_vars', {})
+    env = StrictEnvironment(context=context, keep_trailing_newline=True, **envvars)
+
+    with _environment_cache_lock:
+        env = _environment_cache.setdefault(key, env)
+        while len(_environment_cache) > ENVIRONMENT_CACHE_SIZE:
+            _environment_cache.popitem(last=False)
+    return env
+
+
+def clear_env_cache() -> None:
+    """Forget every environment shared by `create_env_with_context()`."""
+    with _environment_cache_lock:
+        _environment_cache.clear()
+
+
+class patch_import_path_for_repo:  # noqa: N801
+    """Context manager making the modules of a template repo importable.
+
+    Used while the context of a template is loaded and its project generated,
+    for Jinja extensions shipped with the template.
+    """
+
+    def __init__(self, repo_dir: Path | str) -> None:
+        self._repo_dir = f"{repo_dir}" if isinstance(repo_dir, Path) else repo_dir
+
+    def __enter__(self) -> None:
+        self._path = copy.copy(sys.path)
+        sys.path.append(self._repo_dir)
 
-    return StrictEnvironment(context=context, keep_trailing_newline=True, **envvars)
+    def __exit__(self, _type, _value, _traceback):  # type: ignore[no-untyped-def]
+        sys.path = self._path
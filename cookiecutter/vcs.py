@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
 import logging
 import os
+import re
 import subprocess
+import tempfile
+import time
 from pathlib import Path
 from shutil import which
 from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
 
 if TYPE_CHECKING:
     from typing import Literal
 
+from cookiecutter.cache import CloneIndex
 from cookiecutter.exceptions import (
     RepositoryCloneFailed,
     RepositoryNotFound,
@@ -19,7 +26,7 @@ from cookiecutter.exceptions import (
     VCSNotInstalled,
 )
 from cookiecutter.prompt import prompt_and_delete
-from cookiecutter.utils import make_sure_path_exists
+from cookiecutter.utils import make_sure_path_exists, rmtree
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +34,17 @@ logger = logging.getLogger(__name__)
 BRANCH_ERRORS = [
     'error: pathspec',
     'unknown revision',
+    'Remote branch',
 ]
 
+COMMIT_SHA_PATTERN = re.compile(r'[0-9a-fA-F]{7,40}')
+FULL_COMMIT_SHA_PATTERN = re.compile(r'[0-9a-fA-F]{40}')
+SCP_LIKE_URL_PATTERN = re.compile(r'(?:[^@/:]+@)?([^@/:]{2,}):(.*)')
+
+CLONES_DIR_NAME = '.clones'
+
+REFRESH_STAMP = 'cookiecutter-refreshed'
+
 
 def identify_repo(repo_url: str) -> tuple[Literal["git", "hg"], str]:
     """Determine if `repo_url` should be treated as a URL to a git or hg repo.
@@ -51,6 +67,25 @@ def identify_repo(repo_url: str) -> tuple[Literal["git", "hg"], str]:
     raise UnknownRepoType
 
 
+def normalize_repo_url(repo_url: str) -> str:
+    """Return the canonical form of a repo URL, identifying the repository.
+
+    The scheme, credentials, port and ``.git`` suffix are dropped and the host
+    is lower-cased, so the HTTPS and SSH URLs of a repository are the same.
+    Local paths and ``file://`` URLs are returned as they are.
+
+    :param repo_url: Repo URL, without the ``git+`` or ``hg+`` prefix.
+    """
+    url = repo_url.strip().rstrip('/').removesuffix('.git')
+    parts = urlsplit(url)
+    if parts.scheme and parts.hostname:
+        return f'{parts.hostname}/{parts.path.strip("/")}'
+    match = SCP_LIKE_URL_PATTERN.fullmatch(url)
+    if not parts.scheme and match:
+        return f'{match.group(1).lower()}/{match.group(2).strip("/")}'
+    return url
+
+
 def is_vcs_installed(repo_type: str) -> bool:
     """
     Check if the version control system for a repo type is installed.
@@ -60,11 +95,278 @@ def is_vcs_installed(repo_type: str) -> bool:
     return bool(which(repo_type))
 
 
+def _git(args: list[str], cwd: Path | str) -> None:
+    """Run a git command, raising `CalledProcessError` with its output."""
+    subprocess.check_output(
+        ['git', *args],  # noqa: S607
+        cwd=cwd,
+        stderr=subprocess.STDOUT,
+    )
+
+
+def _is_commit_sha(checkout: str, remote: str, cwd: Path | str) -> bool:
+    """Check whether `checkout` is a commit SHA of a git repo.
+
+    Branches and tags can be named like abbreviated SHAs, e.g. ``cafe123``,
+    so a name that looks like one is only taken for a SHA when `remote` has
+    no branch or tag of that name.
+    """
+    if not COMMIT_SHA_PATTERN.fullmatch(checkout):
+        return False
+    try:
+        refs = subprocess.check_output(
+            ['git', 'ls-remote', '--heads', '--tags', remote, checkout],  # noqa: S607
+            cwd=cwd,
+            stderr=subprocess.PIPE,
+        )
+    except subprocess.CalledProcessError as ls_remote_error:
+        logger.debug('Listing the refs of %s failed: %s', remote, ls_remote_error)
+        return True
+    return not refs.strip()
+
+
+def _shallow_git_clone(
+    repo_url: str, checkout: str | None, clone_to_dir: Path, repo_dir: str
+) -> None:
+    """Download only what is needed to check out `checkout` of a git repo.
+
+    Branches and tags are cloned without history. A full commit SHA is fetched
+    on its own into an empty repository. Abbreviated SHAs, and full ones the
+    server refuses to serve directly, fall back to a partial clone, which
+    downloads the history without file contents and then only the files of
+    the commit checked out.
+    """
+    if checkout is None or not _is_commit_sha(checkout, repo_url, clone_to_dir):
+        branch = [] if checkout is None else ['--branch', checkout]
+        _git(
+            ['clone', '--depth', '1', '--single-branch', *branch, repo_url],
+            clone_to_dir,
+        )
+        return
+
+    if len(checkout) == 40:
+        make_sure_path_exists(repo_dir)
+        try:
+            _git(['init', '--quiet'], repo_dir)
+            _git(['remote', 'add', 'origin', repo_url], repo_dir)
+            _git(['fetch', '--depth', '1', 'origin', checkout], repo_dir)
+            _git(['checkout', '--quiet', 'FETCH_HEAD'], repo_dir)
+        except subprocess.CalledProcessError as fetch_error:
+            logger.debug(
+                'Fetching commit %s failed, falling back to a partial clone: %s',
+                checkout,
+                fetch_error.output.decode('utf-8'),
+            )
+            rmtree(repo_dir)
+        else:
+            return
+
+    _git(['clone', '--filter=blob:none', '--no-checkout', repo_url], clone_to_dir)
+    _git(['checkout', '--quiet', checkout], repo_dir)
+
+
+def _refresh_stamp(repo_type: str, repo_dir: str) -> str:
+    """Return the file marking when a cached clone was last updated."""
+    return os.path.join(repo_dir, f'.{repo_type}', REFRESH_STAMP)
+
+
+def _is_stale(stamp: str, refresh_ttl: float) -> bool:
+    """Check whether the clone marked by `stamp` is older than `refresh_ttl`."""
+    try:
+        return time.time() - os.path.getmtime(stamp) > refresh_ttl
+    except OSError:
+        return True
+
+
+def _update_git_repo(
+    repo_dir: str, checkout: str | None, fetch: bool, shallow: bool
+) -> None:
+    """Fetch `checkout` into a cached git clone and check it out.
+
+    The clone is left on a detached HEAD, so updating it to another branch
+    or tag never moves the branch that was checked out before.
+    """
+    if not fetch:
+        if checkout is not None:
+            _git(
+                [
+                    'checkout',
+                    '--quiet',
+                    '--force',
+                    '--detach',
+                    _local_revision(repo_dir, checkout),
+                ],
+                repo_dir,
+            )
+        return
+
+    if checkout is not None and _is_commit_sha(checkout, 'origin', repo_dir):
+        fetched = False
+        if len(checkout) == 40:
+            try:
+                _git(['fetch', '--quiet', '--depth', '1', 'origin', checkout], repo_dir)
+                fetched = True
+            except subprocess.CalledProcessError as fetch_error:
+                logger.debug(
+                    'Fetching commit %s failed: %s',
+                    checkout,
+                    fetch_error.output.decode('utf-8'),
+                )
+        if not fetched:
+            # Abbreviated SHAs, and commits the server refuses to serve on
+            # their own, can only be found by fetching the whole history.
+            unshallow = (
+                ['--unshallow']
+                if os.path.exists(os.path.join(repo_dir, '.git', 'shallow'))
+                else []
+            )
+            _git(['fetch', '--quiet', '--tags', *unshallow, 'origin'], repo_dir)
+        _git(['checkout', '--quiet', '--force', '--detach', checkout], repo_dir)
+        return
+
+    depth = ['--depth', '1'] if shallow else []
+    _git(['fetch', '--quiet', *depth, 'origin', checkout or 'HEAD'], repo_dir)
+    _git(['checkout', '--quiet', '--force', '--detach', 'FETCH_HEAD'], repo_dir)
+
+
+def _local_revision(repo_dir: str, checkout: str) -> str:
+    """Return the revision of a cached git clone to check `checkout` out at.
+
+    A branch is taken from what was last fetched of it, which is its
+    remote-tracking branch, rather than from the local branch.
+    """
+    remote_branch = f'refs/remotes/origin/{checkout}'
+    try:
+        _git(
+            ['rev-parse', '--verify', '--quiet', f'{remote_branch}^{{commit}}'],
+            repo_dir,
+        )
+    except subprocess.CalledProcessError:
+        return checkout
+    return remote_branch
+
+
+def _update_hg_repo(repo_dir: str, checkout: str | None, fetch: bool) -> None:
+    """Pull into a cached hg clone and update the clone to `checkout`."""
+    if fetch:
+        subprocess.check_output(
+            ['hg', 'pull'],  # noqa: S607
+            cwd=repo_dir,
+            stderr=subprocess.STDOUT,
+        )
+    if fetch or checkout is not None:
+        # Avoid Mercurial "--config" and "--debugger" injection vulnerability
+        revision = [] if checkout is None else ['--', checkout]
+        subprocess.check_output(
+            ['hg', 'update', '--clean', *revision],  # noqa: S607
+            cwd=repo_dir,
+            stderr=subprocess.STDOUT,
+        )
+
+
+def _update_repo(
+    repo_type: str,
+    repo_dir: str,
+    checkout: str | None,
+    refresh: str,
+    refresh_ttl: float,
+    shallow: bool,
+) -> bool:
+    """Bring an existing clone up to date instead of cloning it again.
+
+    Returns False if the clone could not be updated and should be replaced.
+    """
+    if not os.path.isdir(os.path.join(repo_dir, f'.{repo_type}')):
+        # Not a clone of its own, git or hg would act on an enclosing repo.
+        return False
+
+    stamp = _refresh_stamp(repo_type, repo_dir)
+    fetch = refresh == 'always' or (
+        refresh == 'if-stale' and _is_stale(stamp, refresh_ttl)
+    )
+    logger.debug(
+        'Updating %s in place (%s)', repo_dir, 'fetching' if fetch else 'offline'
+    )
+    try:
+        if repo_type == 'git':
+            _update_git_repo(repo_dir, checkout, fetch, shallow)
+        else:
+            _update_hg_repo(repo_dir, checkout, fetch)
+    except subprocess.CalledProcessError as update_error:
+        logger.debug(
+            'Updating %s failed, cloning it again: %s',
+            repo_dir,
+            update_error.output.decode('utf-8'),
+        )
+        return False
+    if fetch:
+        Path(stamp).touch()
+    return True
+
+
+def _repo_dir_name(repo_type: str, repo_url: str) -> str:
+    """Return the name of the directory `repo_url` is cloned into."""
+    repo_name = os.path.split(repo_url)[1]
+    if repo_type == 'git':
+        repo_name = repo_name.split(':')[-1].rsplit('.git')[0]
+    return repo_name
+
+
+def _clone_into(
+    repo_type: str,
+    repo_url: str,
+    checkout: str | None,
+    clone_to_dir: Path,
+    repo_dir: str,
+    shallow: bool,
+) -> None:
+    """Clone `repo_url` into `clone_to_dir`, as `repo_dir`, at `checkout`."""
+    if shallow and repo_type == 'hg':
+        logger.debug('Shallow clones are not supported for hg, cloning %s', repo_url)
+
+    try:
+        if shallow and repo_type == 'git':
+            _shallow_git_clone(repo_url, checkout, clone_to_dir, repo_dir)
+        else:
+            subprocess.check_output(
+                [repo_type, 'clone', repo_url],
+                cwd=clone_to_dir,
+                stderr=subprocess.STDOUT,
+            )
+            if checkout is not None:
+                checkout_params = [checkout]
+                # Avoid Mercurial "--config" and "--debugger" injection
+                # vulnerability
+                if repo_type == "hg":
+                    checkout_params.insert(0, "--")
+                subprocess.check_output(
+                    [repo_type, 'checkout', *checkout_params],
+                    cwd=repo_dir,
+                    stderr=subprocess.STDOUT,
+                )
+    except subprocess.CalledProcessError as clone_error:
+        output = clone_error.output.decode('utf-8')
+        if any(error in output for error in BRANCH_ERRORS):
+            msg = (
+                f'The {checkout} branch of repository '
+                f'{repo_url} could not found, have you made a typo?'
+            )
+            raise RepositoryCloneFailed(msg) from clone_error
+        if 'not found' in output.lower():
+            msg = f'The repository {repo_url} could not be found, have you made a typo?'
+            raise RepositoryNotFound(msg) from clone_error
+        logger.exception('git clone failed with error: %s', output)
+        raise
+
+
 def clone(
     repo_url: str,
     checkout: str | None = None,
     clone_to_dir: Path | str = ".",
     no_input: bool = False,
+    shallow: bool = False,
+    refresh: str | None = None,
+    refresh_ttl: float = 3600,
 ) -> str:
     """Clone a repo to the current directory.
 
@@ -74,6 +376,14 @@ def clone(
                          Defaults to the current directory.
     :param no_input: Do not prompt for user input and eventually force a refresh of
         cached resources.
+    :param shallow: Only download what is needed to check out `checkout`
+        instead of the whole history. Only supported for git repos.
+    :param refresh: How to reuse a clone already in `clone_to_dir`. With
+        ``'always'`` it is fetched and reset to `checkout`, with ``'if-stale'``
+        it is only fetched if older than `refresh_ttl`, and with ``'never'``
+        it is used as it is. By default the user is asked whether to delete
+        it and clone the repo again.
+    :param refresh_ttl: Seconds after which a clone is stale.
     :returns: str with path to the new directory of the repository.
     """
     # Ensure that clone_to_dir exists
@@ -89,51 +399,171 @@ def clone(
         raise VCSNotInstalled(msg)
 
     repo_url = repo_url.rstrip('/')
-    repo_name = os.path.split(repo_url)[1]
-    if repo_type == 'git':
-        repo_name = repo_name.split(':')[-1].rsplit('.git')[0]
-        repo_dir = os.path.normpath(os.path.join(clone_to_dir, repo_name))
-    if repo_type == 'hg':
-        repo_dir = os.path.normpath(os.path.join(clone_to_dir, repo_name))
+    repo_dir = os.path.normpath(
+        os.path.join(clone_to_dir, _repo_dir_name(repo_type, repo_url))
+    )
     logger.debug(f'repo_dir is {repo_dir}')
 
     if os.path.isdir(repo_dir):
+        if refresh is not None and _update_repo(
+            repo_type, repo_dir, checkout, refresh, refresh_ttl, shallow
+        ):
+            return repo_dir
         clone = prompt_and_delete(repo_dir, no_input=no_input)
     else:
         clone = True
 
     if clone:
+        _clone_into(repo_type, repo_url, checkout, clone_to_dir, repo_dir, shallow)
+        with contextlib.suppress(OSError):
+            Path(_refresh_stamp(repo_type, repo_dir)).touch()
+
+    return repo_dir
+
+
+def _resolve_commit(repo_type: str, repo_url: str, checkout: str | None) -> str | None:
+    """Ask the remote which commit `checkout` points to, without cloning.
+
+    Returns `None` if the remote cannot tell, for example for an abbreviated
+    commit SHA, in which case the commit is only known once checked out.
+    """
+    try:
+        if repo_type == 'git':
+            ref = checkout or 'HEAD'
+            output = subprocess.check_output(
+                ['git', 'ls-remote', repo_url, ref],  # noqa: S607
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            refs = {}
+            for line in output.splitlines():
+                sha, _, name = line.partition('\t')
+                refs[name] = sha
+            # In the order git itself resolves a name, peeled tags first.
+            for name in (ref, f'refs/tags/{ref}^{{}}', f'refs/tags/{ref}'):
+                if name in refs:
+                    return refs[name]
+            return refs.get(f'refs/heads/{ref}')
+        # Avoid Mercurial "--config" and "--debugger" injection vulnerability
+        revision = f'--rev={checkout or "default"}'
+        output = subprocess.check_output(
+            ['hg', 'identify', '--debug', '--id', revision, '--', repo_url],  # noqa: S607
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+    except subprocess.CalledProcessError as resolve_error:
+        logger.debug('Resolving %s of %s failed: %s', checkout, repo_url, resolve_error)
+        return None
+    commit = output.strip()
+    return commit if FULL_COMMIT_SHA_PATTERN.fullmatch(commit) else None
+
+
+def _head_commit(repo_type: str, repo_dir: str) -> str:
+    """Return the full SHA of the commit checked out in `repo_dir`."""
+    if repo_type == 'git':
+        command = ['git', 'rev-parse', 'HEAD']
+    else:
+        command = ['hg', 'log', '--rev', '.', '--template', '{node}']
+    return subprocess.check_output(command, cwd=repo_dir, text=True).strip()
+
+
+def clone_by_commit(
+    repo_url: str,
+    checkout: str | None = None,
+    clone_to_dir: Path | str = ".",
+    shallow: bool = False,
+    refresh: str | None = None,
+    refresh_ttl: float = 3600,
+) -> str:
+    """Check out a repo into the content-addressed store of `clone_to_dir`.
+
+    Checkouts live in ``.clones/<repo key>/<commit SHA>/<repo name>``, where
+    the repo key is derived from the normalized repo URL, so repos with the
+    same name on different hosts do not collide, and checkouts of different
+    refs of a repo coexist. The checkout keeps the name of the repo, which
+    names its replay files. A checkout is never modified once in place: when `checkout`
+    resolves to a commit already in the store, it is reused without cloning.
+    New checkouts are made in a staging directory and renamed into place, so
+    concurrent runs never see a partial checkout and the first to finish
+    wins. An ``index.json`` in the store records what each ref resolved to.
+
+    :param repo_url: Repo URL of unknown type.
+    :param checkout: The branch, tag or commit ID to checkout.
+    :param clone_to_dir: The directory holding the ``.clones`` store.
+    :param shallow: Only download what is needed to check out `checkout`
+        instead of the whole history. Only supported for git repos.
+    :param refresh: With ``'never'``, and with ``'if-stale'`` for
+        `refresh_ttl` seconds, refs are resolved from the index without
+        contacting the remote. By default, and with ``'always'``, they are
+        resolved by the remote. Commit SHAs never need to be resolved.
+    :param refresh_ttl: Seconds after which a resolved ref is stale.
+    :returns: str with path to the checkout of the repository.
+    """
+    clone_to_dir = Path(clone_to_dir).expanduser()
+    repo_type, repo_url = identify_repo(repo_url)
+    if not is_vcs_installed(repo_type):
+        msg = f"'{repo_type}' is not installed."
+        raise VCSNotInstalled(msg)
+
+    repo_url = repo_url.rstrip('/')
+    normalized_url = normalize_repo_url(repo_url)
+    clones_dir = clone_to_dir / CLONES_DIR_NAME
+    repo_key = hashlib.sha256(f'{repo_type}+{normalized_url}'.encode()).hexdigest()
+    repo_store = clones_dir / repo_key[:16]
+    repo_name = _repo_dir_name(repo_type, repo_url)
+    make_sure_path_exists(repo_store)
+    index = CloneIndex(clones_dir)
+    ref = checkout or 'HEAD'
+
+    if checkout is not None and FULL_COMMIT_SHA_PATTERN.fullmatch(checkout):
+        commit: str | None = checkout.lower()
+    elif refresh == 'never':
+        commit = index.lookup(normalized_url, ref)
+    elif refresh == 'if-stale':
+        commit = index.lookup(normalized_url, ref, max_age=refresh_ttl)
+    else:
+        commit = None
+    if (
+        commit is None
+        and checkout is not None
+        and COMMIT_SHA_PATTERN.fullmatch(checkout)
+    ):
+        stored = [
+            path.name
+            for path in repo_store.glob(f'{checkout.lower()}*')
+            if FULL_COMMIT_SHA_PATTERN.fullmatch(path.name)
+        ]
+        commit = stored[0] if len(stored) == 1 else None
+    if commit is None:
+        commit = _resolve_commit(repo_type, repo_url, checkout)
+
+    if commit is not None and repo_store.joinpath(commit, repo_name).is_dir():
+        logger.debug('Reusing the checkout of %s at %s', repo_url, commit)
+        repo_dir = repo_store / commit / repo_name
+    else:
+        staging_dir = Path(tempfile.mkdtemp(prefix='.staging-', dir=repo_store))
         try:
-            subprocess.check_output(
-                [repo_type, 'clone', repo_url],
-                cwd=clone_to_dir,
-                stderr=subprocess.STDOUT,
+            staged_repo_dir = staging_dir / repo_name
+            _clone_into(
+                repo_type,
+                repo_url,
+                checkout,
+                staging_dir,
+                str(staged_repo_dir),
+                shallow,
             )
-            if checkout is not None:
-                checkout_params = [checkout]
-                # Avoid Mercurial "--config" and "--debugger" injection vulnerability
-                if repo_type == "hg":
-                    checkout_params.insert(0, "--")
-                subprocess.check_output(
-                    [repo_type, 'checkout', *checkout_params],
-                    cwd=repo_dir,
-                    stderr=subprocess.STDOUT,
-                )
-        except subprocess.CalledProcessError as clone_error:
-            output = clone_error.output.decode('utf-8')
-            if 'not found' in output.lower():
-                msg = (
-                    f'The repository {repo_url} could not be found, '
-                    'have you made a typo?'
-                )
-                raise RepositoryNotFound(msg) from clone_error
-            if any(error in output for error in BRANCH_ERRORS):
-                msg = (
-                    f'The {checkout} branch of repository '
-                    f'{repo_url} could not found, have you made a typo?'
-                )
-                raise RepositoryCloneFailed(msg) from clone_error
-            logger.exception('git clone failed with error: %s', output)
-            raise
+            # The ref may have moved since it was resolved, trust the checkout.
+            commit = _head_commit(repo_type, str(staged_repo_dir))
+            repo_dir = repo_store / commit / repo_name
+            try:
+                staging_dir.rename(repo_store / commit)
+            except OSError:
+                if not repo_dir.is_dir():
+                    raise
+                logger.debug('%s at %s was checked out concurrently', repo_url, commit)
+        finally:
+            if staging_dir.exists():
+                rmtree(staging_dir)
 
-    return repo_dir
+    index.record(normalized_url, ref, commit, str(repo_dir))
+    return str(repo_dir)
@@ -2,16 +2,242 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import json
+import logging
 import os
 import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 from zipfile import BadZipFile, ZipFile
 
 import requests
 
+from cookiecutter.cache import entry_lock_path, touch_entry
 from cookiecutter.exceptions import InvalidZipRepository
+from cookiecutter.hooks import valid_hook
+from cookiecutter.manifest import file_hash
 from cookiecutter.prompt import prompt_and_delete, read_repo_password
-from cookiecutter.utils import make_sure_path_exists
+from cookiecutter.source import write_archive_reference
+from cookiecutter.utils import file_lock, make_sure_path_exists, rmtree
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+ARCHIVES_DIR_NAME = 'archives'
+
+
+@functools.cache
+def get_session() -> requests.Session:
+    """Return the HTTP session shared by all downloads, pooling connections."""
+    return requests.Session()
+
+
+def _validators_path(zip_path: str) -> str:
+    return f'{zip_path}.http.json'
+
+
+def _load_validators(url: str, zip_path: str) -> dict[str, str]:
+    """Return the ETag and Last-Modified date the server sent for a download."""
+    try:
+        with open(_validators_path(zip_path), encoding='utf-8') as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('url') != url:
+        return {}
+    return {key: data[key] for key in ('etag', 'last_modified') if data.get(key)}
+
+
+def _save_validators(url: str, zip_path: str, response: requests.Response) -> None:
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag is None and last_modified is None:
+        with contextlib.suppress(OSError):
+            os.remove(_validators_path(zip_path))
+        return
+    data = {'url': url, 'etag': etag, 'last_modified': last_modified}
+    with open(_validators_path(zip_path), 'w', encoding='utf-8') as fh:
+        json.dump(data, fh)
+
+
+def _get(url: str, headers: dict[str, str]) -> requests.Response:
+    response = get_session().get(url, headers=headers, stream=True, timeout=100)
+    if response.status_code not in (304, 416):
+        response.raise_for_status()
+    return response
+
+
+def _write_download(
+    url: str, zip_path: str, response: requests.Response, chunk_size: int
+) -> None:
+    """Write the body of `response` to `zip_path`, through a partial file.
+
+    The validators of the download are saved first, so that the partial file
+    left behind by an interrupted download can be resumed.
+    """
+    part_path = f'{zip_path}.part'
+    try:
+        _save_validators(url, zip_path, response)
+        with open(part_path, 'ab' if response.status_code == 206 else 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:  # filter out keep-alive new chunks
+                    f.write(chunk)
+    finally:
+        response.close()
+    os.replace(part_path, zip_path)
+
+
+def download(
+    url: str,
+    zip_path: str,
+    no_input: bool = False,
+    reuse_existing: bool = False,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+) -> None:
+    """Download the zip file at `url` to `zip_path`, unless it is there already.
+
+    A file downloaded before is revalidated with the ETag or Last-Modified
+    date the server sent for it, and kept if the server reports it unchanged.
+    Otherwise, or if the server sent neither, the user is asked whether to
+    download it again. An interrupted download is resumed where it stopped
+    when the server supports ranges and the file did not change since.
+
+    :param url: The URL of the zip file.
+    :param zip_path: Where to store the zip file.
+    :param no_input: Download the file again without asking if it changed.
+    :param reuse_existing: Use a file downloaded before without revalidating.
+    :param chunk_size: Number of bytes read from the network at a time.
+    """
+    validators = _load_validators(url, zip_path)
+    if os.path.exists(zip_path):
+        if reuse_existing:
+            return
+        if not validators:
+            if prompt_and_delete(zip_path, no_input=no_input):
+                _write_download(url, zip_path, _get(url, {}), chunk_size)
+            return
+
+        headers = {}
+        if 'etag' in validators:
+            headers['If-None-Match'] = validators['etag']
+        if 'last_modified' in validators:
+            headers['If-Modified-Since'] = validators['last_modified']
+        response = _get(url, headers)
+        if response.status_code == 304:
+            logger.debug('%s is up to date, not downloading it again', zip_path)
+            response.close()
+            return
+        if not prompt_and_delete(zip_path, no_input=no_input):
+            response.close()
+            return
+        _write_download(url, zip_path, response, chunk_size)
+        return
+
+    part_path = f'{zip_path}.part'
+    headers = {}
+    if validators and os.path.exists(part_path):
+        logger.debug('Resuming the download of %s', url)
+        headers['Range'] = f'bytes={os.path.getsize(part_path)}-'
+        headers['If-Range'] = validators.get('etag') or validators['last_modified']
+    response = _get(url, headers)
+    if response.status_code == 416:
+        # The partial file does not match the file on the server any more.
+        response.close()
+        response = _get(url, {})
+    _write_download(url, zip_path, response, chunk_size)
+
+
+def _unlock(
+    action: Callable[[bytes | None], object], password: str | None, no_input: bool
+) -> None:
+    """Run `action` on a zip file, with its password if it is protected.
+
+    `action` is called with no password first. If the file turns out to be
+    password protected, the password given, or else asked for, is used.
+    """
+    try:
+        action(None)
+    except RuntimeError as runtime_err:
+        # File is password protected; try to get a password from the
+        # environment; if that doesn't work, ask the user.
+        if password is not None:
+            try:
+                action(password.encode('utf-8'))
+            except RuntimeError as e:
+                msg = 'Invalid password provided for protected repository'
+                raise InvalidZipRepository(msg) from e
+        elif no_input:
+            msg = 'Unable to unlock password protected repository'
+            raise InvalidZipRepository(msg) from runtime_err
+        else:
+            retry: int | None = 0
+            while retry is not None:
+                try:
+                    password = read_repo_password('Repo password')
+                    action(password.encode('utf-8'))
+                    retry = None
+                except RuntimeError as e:  # noqa: PERF203
+                    retry += 1  # type: ignore[operator]
+                    if retry == 3:
+                        msg = 'Invalid password provided for protected repository'
+                        raise InvalidZipRepository(msg) from e
+
+
+def _extract(
+    zip_file: ZipFile,
+    path: str,
+    password: str | None,
+    no_input: bool,
+    members: list[str] | None = None,
+) -> None:
+    """Extract all members of a zip file, or only `members`, into `path`."""
+    _unlock(
+        lambda pwd: zip_file.extractall(path=path, members=members, pwd=pwd),
+        password,
+        no_input,
+    )
+
+
+def _template_members(zip_file: ZipFile, project_name: str) -> dict[str, str]:
+    """Return the project template directories of a repository in a zip file.
+
+    Directories are found by name like `find_template()` does with the
+    default Jinja2 delimiters, and returned as member names by name.
+    """
+    templates = {}
+    for name in zip_file.namelist():
+        parts = name.split('/')
+        if (
+            len(parts) > 2
+            and parts[0] == project_name
+            and 'cookiecutter' in parts[1]
+            and '{{' in parts[1]
+            and '}}' in parts[1]
+        ):
+            templates[parts[1]] = f'{project_name}/{parts[1]}'
+    return templates
+
+
+def _has_pre_prompt_hook(zip_file: ZipFile, project_name: str) -> bool:
+    hooks_prefix = f'{project_name}/hooks/'
+    return any(
+        name.startswith(hooks_prefix)
+        and valid_hook(name[len(hooks_prefix) :], 'pre_prompt')
+        for name in zip_file.namelist()
+    )
+
+
+def in_archive_cache(path: Path | str, cache_dir: Path | str | None) -> bool:
+    """Return whether `unzip()` unpacked `path` into the cache of `cache_dir`."""
+    if cache_dir is None:
+        return False
+    archives_dir = Path(cache_dir, ARCHIVES_DIR_NAME).resolve()
+    return Path(path).resolve().is_relative_to(archives_dir)
 
 
 def unzip(
@@ -20,6 +246,11 @@ def unzip(
     clone_to_dir: Path | str = ".",
     no_input: bool = False,
     password: str | None = None,
+    reuse_existing: bool = False,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    cache_dir: Path | str | None = None,
+    render_from_archive: bool = False,
+    lock_stack: contextlib.ExitStack[bool | None] | None = None,
 ) -> str:
     """Download and unpack a zipfile at a given URI.
 
@@ -33,35 +264,48 @@ def unzip(
     :param no_input: Do not prompt for user input and eventually force a refresh of
         cached resources.
     :param password: The password to use when unpacking the repository.
+    :param reuse_existing: Use an archive already downloaded into
+        `clone_to_dir` as it is, without asking whether to download it again.
+    :param chunk_size: Number of bytes read from the network at a time when
+        downloading the zipfile.
+    :param cache_dir: Keep the unpacked repository in this cache directory,
+        keyed by the hash of the zipfile, and reuse it instead of unpacking
+        the same zipfile again. Without it, and for password protected
+        zipfiles, the zipfile is unpacked into a new temporary directory,
+        which the caller removes, see `in_archive_cache()`.
+    :param render_from_archive: When unpacking into a temporary directory,
+        leave the project template directory in the zipfile and only unpack
+        the other files of the repository, such as ``cookiecutter.json`` and
+        hooks. `generate_files()` then renders the project straight from the
+        zipfile. Password protected zipfiles, and repositories with a
+        ``pre_prompt`` hook, which may change the template, are unpacked in
+        full.
+    :param lock_stack: Hold a shared lock on the entry of `cache_dir` the
+        repository is unpacked into until this stack is closed, so
+        `prune_cache()` does not evict it while it is used.
     """
     # Ensure that clone_to_dir exists
     clone_to_dir = Path(clone_to_dir).expanduser()
     make_sure_path_exists(clone_to_dir)
 
     if is_url:
-        # Build the name of the cached zipfile,
-        # and prompt to delete if it already exists.
+        # Build the name of the cached zipfile, and download it
+        # unless an up to date copy is cached already.
         identifier = zip_uri.rsplit('/', 1)[1]
         zip_path = os.path.join(clone_to_dir, identifier)
-
-        if os.path.exists(zip_path):
-            download = prompt_and_delete(zip_path, no_input=no_input)
-        else:
-            download = True
-
-        if download:
-            # (Re) download the zipfile
-            r = requests.get(zip_uri, stream=True, timeout=100)
-            with open(zip_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=1024):
-                    if chunk:  # filter out keep-alive new chunks
-                        f.write(chunk)
+        download(
+            zip_uri,
+            zip_path,
+            no_input=no_input,
+            reuse_existing=reuse_existing,
+            chunk_size=chunk_size,
+        )
     else:
         # Just use the local zipfile as-is.
         zip_path = os.path.abspath(zip_uri)
 
-    # Now unpack the repository. The zipfile will be unpacked
-    # into a temporary directory
+    # Now unpack the repository. The zipfile will be unpacked into a
+    # temporary directory, or into the cache of unpacked zipfiles
     try:
         # Use context manager so the file descriptor is always released, even if
         # an exception occurs while processing the archive. This prevents file
@@ -81,42 +325,69 @@ def unzip(
 
             # Construct the final target directory
             project_name = first_filename[:-1]
-            unzip_base = tempfile.mkdtemp()
-            unzip_path = os.path.join(unzip_base, project_name)
+            protected = any(info.flag_bits & 0x1 for info in zip_file.infolist())
+            # Decrypted files are never kept in the cache, where they could be
+            # read without the password.
+            if cache_dir is None or protected:
+                unzip_base = tempfile.mkdtemp()
+                unzip_path = os.path.join(unzip_base, project_name)
+                templates = (
+                    _template_members(zip_file, project_name)
+                    if render_from_archive
+                    and not protected
+                    and not _has_pre_prompt_hook(zip_file, project_name)
+                    else {}
+                )
+                if not templates:
+                    _extract(zip_file, unzip_base, password, no_input)
+                    return unzip_path
+
+                prefixes = tuple(f'{member}/' for member in templates.values())
+                _extract(
+                    zip_file,
+                    unzip_base,
+                    password,
+                    no_input,
+                    members=[
+                        name
+                        for name in zip_file.namelist()
+                        if not name.startswith(prefixes)
+                    ],
+                )
+                # Empty template directories are left for `find_template()`.
+                for name in templates:
+                    make_sure_path_exists(os.path.join(unzip_path, name))
+                write_archive_reference(unzip_path, zip_path, templates)
+                logger.debug('Leaving %s in %s', ', '.join(templates), zip_path)
+                return unzip_path
 
-            # Extract the zip file into the temporary directory
+            # Reuse the tree extracted from the same archive before.
+            archives_dir = os.path.join(cache_dir, ARCHIVES_DIR_NAME)
+            entry_dir = os.path.join(archives_dir, file_hash(zip_path))
+            unzip_path = os.path.join(entry_dir, project_name)
+            if lock_stack is not None:
+                lock_stack.enter_context(
+                    file_lock(entry_lock_path(entry_dir), shared=True)
+                )
+            if os.path.isdir(unzip_path):
+                logger.debug('Reusing %s extracted from %s', unzip_path, zip_uri)
+                touch_entry(entry_dir)
+                return unzip_path
+
+            make_sure_path_exists(archives_dir)
+            unzip_base = tempfile.mkdtemp(prefix='.staging-', dir=archives_dir)
             try:
-                zip_file.extractall(path=unzip_base)
-            except RuntimeError as runtime_err:
-                # File is password protected; try to get a password from the
-                # environment; if that doesn't work, ask the user.
-                if password is not None:
-                    try:
-                        zip_file.extractall(
-                            path=unzip_base, pwd=password.encode('utf-8')
-                        )
-                    except RuntimeError as e:
-                        msg = 'Invalid password provided for protected repository'
-                        raise InvalidZipRepository(msg) from e
-                elif no_input:
-                    msg = 'Unable to unlock password protected repository'
-                    raise InvalidZipRepository(msg) from runtime_err
-                else:
-                    retry: int | None = 0
-                    while retry is not None:
-                        try:
-                            password = read_repo_password('Repo password')
-                            zip_file.extractall(
-                                path=unzip_base, pwd=password.encode('utf-8')
-                            )
-                            retry = None
-                        except RuntimeError as e:  # noqa: PERF203
-                            retry += 1  # type: ignore[operator]
-                            if retry == 3:
-                                msg = (
-                                    'Invalid password provided for protected repository'
-                                )
-                                raise InvalidZipRepository(msg) from e
+                _extract(zip_file, unzip_base, password, no_input)
+                touch_entry(unzip_base)
+                try:
+                    os.rename(unzip_base, entry_dir)
+                except OSError:
+                    # Another process extracted the same archive first.
+                    if not os.path.isdir(unzip_path):
+                        raise
+            finally:
+                if os.path.exists(unzip_base):
+                    rmtree(unzip_base)
 
     except BadZipFile as e:
         msg = f'Zip repository {zip_uri} is not a valid zip archive:'
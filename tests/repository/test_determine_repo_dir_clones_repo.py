@@ -1,10 +1,12 @@
 """Collection of tests around cloning cookiecutter template repositories."""
 
+import contextlib
 import os
 
 import pytest
 
 from cookiecutter import exceptions, repository
+from cookiecutter.utils import file_lock
 
 
 @pytest.mark.parametrize(
@@ -42,6 +44,11 @@ def test_zipfile_unzip(mocker, template, is_url, user_config_data) -> None:
         clone_to_dir=user_config_data['cookiecutters_dir'],
         no_input=True,
         password=None,
+        reuse_existing=False,
+        chunk_size=64 * 1024,
+        cache_dir=None,
+        render_from_archive=False,
+        lock_stack=None,
     )
 
     assert os.path.isdir(project_dir)
@@ -49,6 +56,63 @@ def test_zipfile_unzip(mocker, template, is_url, user_config_data) -> None:
     assert project_dir == 'tests/fake-repo-tmpl'
 
 
+def test_zipfile_unzip_into_cache(mocker, user_config_data, tmp_path) -> None:
+    """Verify zip files unpacked into the cache are not cleaned up."""
+    unzipped_dir = tmp_path.joinpath('archives', '0123abcd', 'fake-repo-tmpl')
+    unzipped_dir.mkdir(parents=True)
+    unzipped_dir.joinpath('cookiecutter.json').write_text('{}')
+    mock_unzip = mocker.patch(
+        'cookiecutter.repository.unzip',
+        return_value=str(unzipped_dir),
+        autospec=True,
+    )
+
+    project_dir, cleanup = repository.determine_repo_dir(
+        '/path/to/zipfile.zip',
+        abbreviations={},
+        clone_to_dir=user_config_data['cookiecutters_dir'],
+        checkout=None,
+        no_input=True,
+        archive_cache_dir=tmp_path,
+    )
+
+    assert mock_unzip.call_args.kwargs['cache_dir'] == tmp_path
+    assert project_dir == str(unzipped_dir)
+    assert not cleanup
+
+
+@pytest.mark.parametrize(
+    'template, is_url',
+    [
+        ('/path/to/template.tar.gz', False),
+        ('https://example.com/path/to/template.tgz', True),
+    ],
+)
+def test_tarfile_untar(mocker, template, is_url, user_config_data) -> None:
+    """Verify tar files are unpacked by `untar()` and cleaned up afterwards."""
+    file_lock = mocker.patch('cookiecutter.repository.file_lock', autospec=True)
+    mock_untar = mocker.patch(
+        'cookiecutter.repository.untar',
+        return_value='tests/fake-repo-tmpl',
+        autospec=True,
+    )
+
+    project_dir, cleanup = repository.determine_repo_dir(
+        template,
+        abbreviations={},
+        clone_to_dir=user_config_data['cookiecutters_dir'],
+        checkout=None,
+        no_input=True,
+    )
+
+    mock_untar.assert_called_once_with(
+        tar_uri=template, is_url=is_url, chunk_size=64 * 1024
+    )
+    assert project_dir == 'tests/fake-repo-tmpl'
+    assert cleanup
+    assert not file_lock.called
+
+
 @pytest.fixture
 def template_url() -> str:
     """URL to example Cookiecutter template on GitHub.
@@ -83,6 +147,9 @@ def test_repository_url_should_clone(mocker, template_url, user_config_data) ->
         checkout=None,
         clone_to_dir=user_config_data['cookiecutters_dir'],
         no_input=True,
+        shallow=False,
+        refresh=None,
+        refresh_ttl=3600,
     )
 
     assert os.path.isdir(project_dir)
@@ -90,7 +157,71 @@ def test_repository_url_should_clone(mocker, template_url, user_config_data) ->
     assert project_dir == 'tests/fake-repo-tmpl'
 
 
-def test_repository_url_with_no_context_file(mocker, template_url) -> None:
+def test_repository_url_locked_while_used(
+    mocker, template_url, user_config_data
+) -> None:
+    """Verify a cloned template stays locked against updates while used."""
+    pytest.importorskip('fcntl')
+    mocker.patch(
+        'cookiecutter.repository.clone',
+        return_value='tests/fake-repo-tmpl',
+        autospec=True,
+    )
+    clone_to_dir = user_config_data['cookiecutters_dir']
+    use_lock_path = repository.cache_use_lock_path(clone_to_dir, template_url)
+
+    with contextlib.ExitStack() as template_locks:
+        repository.determine_repo_dir(
+            template_url,
+            abbreviations={},
+            clone_to_dir=clone_to_dir,
+            checkout=None,
+            no_input=True,
+            lock_stack=template_locks,
+        )
+        with pytest.raises(BlockingIOError), file_lock(use_lock_path, blocking=False):
+            pass
+
+    with file_lock(use_lock_path, blocking=False) as waited:
+        assert not waited
+
+
+def test_repository_url_should_clone_by_commit(
+    mocker, template_url, user_config_data
+) -> None:
+    """Verify `clone_by_commit()` is used for the content-addressed store."""
+    mock_clone = mocker.patch('cookiecutter.repository.clone', autospec=True)
+    mock_clone_by_commit = mocker.patch(
+        'cookiecutter.repository.clone_by_commit',
+        return_value='tests/fake-repo-tmpl',
+        autospec=True,
+    )
+
+    project_dir, cleanup = repository.determine_repo_dir(
+        template_url,
+        abbreviations={},
+        clone_to_dir=user_config_data['cookiecutters_dir'],
+        checkout='v1',
+        no_input=True,
+        content_addressed=True,
+    )
+
+    mock_clone_by_commit.assert_called_once_with(
+        repo_url=template_url,
+        checkout='v1',
+        clone_to_dir=user_config_data['cookiecutters_dir'],
+        shallow=False,
+        refresh=None,
+        refresh_ttl=3600,
+    )
+    assert not mock_clone.called
+    assert not cleanup
+    assert project_dir == 'tests/fake-repo-tmpl'
+
+
+def test_repository_url_with_no_context_file(
+    mocker, template_url, user_config_data
+) -> None:
     """Verify cloned repository without `cookiecutter.json` file raises error."""
     mocker.patch(
         'cookiecutter.repository.clone',
@@ -102,7 +233,7 @@ def test_repository_url_with_no_context_file(mocker, template_url) -> None:
         repository.determine_repo_dir(
             template_url,
             abbreviations={},
-            clone_to_dir=".",
+            clone_to_dir=user_config_data['cookiecutters_dir'],
             checkout=None,
             no_input=True,
         )
@@ -111,3 +242,32 @@ def test_repository_url_with_no_context_file(mocker, template_url) -> None:
         'A valid repository for "{}" could not be found in the following '
         'locations:\n{}'.format(template_url, 'tests/fake-repo-bad')
     )
+
+
+@pytest.mark.parametrize(
+    'template, lock_name',
+    [
+        (
+            'https://github.com/audreyfeldroy/cookiecutter-pypackage.git',
+            'cookiecutter-pypackage',
+        ),
+        (
+            'git+ssh://git@github.com/audreyfeldroy/cookiecutter-pypackage/',
+            'cookiecutter-pypackage',
+        ),
+        (
+            'git@github.com:audreyfeldroy/cookiecutter-pypackage.git',
+            'cookiecutter-pypackage',
+        ),
+        (
+            'hg+https://bitbucket.org/foo/cookiecutter-bitbucket',
+            'cookiecutter-bitbucket',
+        ),
+        ('https://example.com/path/to/fake-repo-tmpl.zip', 'fake-repo-tmpl.zip'),
+    ],
+)
+def test_cache_lock_path(template, lock_name, tmp_path) -> None:
+    """Verify templates populating the same cache entry share a lock."""
+    assert repository.cache_lock_path(tmp_path, template) == os.path.join(
+        tmp_path, repository.LOCKS_DIR_NAME, f'{lock_name}.lock'
+    )
@@ -3,7 +3,12 @@
 import pytest
 
 from cookiecutter.config import BUILTIN_ABBREVIATIONS
-from cookiecutter.repository import expand_abbreviations, is_repo_url, is_zip_file
+from cookiecutter.repository import (
+    expand_abbreviations,
+    is_repo_url,
+    is_tar_file,
+    is_zip_file,
+)
 
 
 @pytest.fixture(
@@ -23,6 +28,28 @@ def test_is_zip_file(zipfile) -> None:
     assert is_zip_file(zipfile) is True
 
 
+@pytest.mark.parametrize(
+    'tarfile',
+    [
+        '/path/to/template.tar',
+        '/path/to/template.tar.gz',
+        'https://example.com/path/to/template.TGZ',
+        'https://example.com/path/to/template.tar.xz',
+    ],
+)
+def test_is_tar_file(tarfile) -> None:
+    """Verify is_tar_file recognizes tar files by their suffix."""
+    assert is_tar_file(tarfile) is True
+
+
+@pytest.mark.parametrize(
+    'value', ['/path/to/template.zip', '/path/to/template.gz', 'template.tar.bz3']
+)
+def test_is_not_tar_file(value) -> None:
+    """Verify is_tar_file rejects other files."""
+    assert is_tar_file(value) is False
+
+
 @pytest.fixture(
     params=[
         'gitolite@server:team/repo',
@@ -0,0 +1,183 @@
+"""Tests for function untar() from tarfile module."""
+
+from __future__ import annotations
+
+import io
+import os
+import tarfile
+import tempfile
+from pathlib import Path
+from typing import Literal
+
+import pytest
+
+from cookiecutter import tarfile as cookiecutter_tarfile
+from cookiecutter.exceptions import InvalidTarRepository
+
+
+def make_tar(path: Path, mode: Literal['w', 'w:gz', 'w:xz'] = 'w:gz') -> Path:
+    """Pack the `tests/fake-repo-tmpl` template into a tar file at `path`."""
+    with tarfile.open(path, mode) as tar_file:
+        tar_file.add('tests/fake-repo-tmpl', arcname='fake-repo-tmpl')
+    return path
+
+
+def add_member(tar_file: tarfile.TarFile, name: str, data: bytes = b'') -> None:
+    """Add a regular file called `name` to `tar_file`."""
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar_file.addfile(info, io.BytesIO(data))
+
+
+@pytest.mark.parametrize(
+    'name, mode',
+    [
+        ('fake-repo-tmpl.tar', 'w'),
+        ('fake-repo-tmpl.tar.gz', 'w:gz'),
+        ('fake-repo-tmpl.tgz', 'w:gz'),
+        ('fake-repo-tmpl.tar.xz', 'w:xz'),
+    ],
+)
+def test_untar_local_file(tmp_path, name, mode) -> None:
+    """Local tar files can be unpacked, whatever their compression."""
+    tar_path = make_tar(tmp_path.joinpath(name), mode)
+
+    output_dir = cookiecutter_tarfile.untar(str(tar_path), is_url=False)
+
+    assert output_dir.startswith(tempfile.gettempdir())
+    assert os.path.basename(output_dir) == 'fake-repo-tmpl'
+    assert Path(output_dir, 'cookiecutter.json').is_file()
+
+
+def test_untar_url_streams_response(mocker, tmp_path) -> None:
+    """A tar file at a URL is unpacked from the response as it is read."""
+    tar_path = make_tar(tmp_path.joinpath('fake-repo-tmpl.tar.gz'))
+    get_session = mocker.patch('cookiecutter.tarfile.get_session', autospec=True)
+    response = get_session.return_value.get.return_value
+    response.raw = io.BytesIO(tar_path.read_bytes())
+
+    output_dir = cookiecutter_tarfile.untar(
+        'https://example.com/path/to/fake-repo-tmpl.tar.gz', is_url=True
+    )
+
+    get_session.return_value.get.assert_called_once_with(
+        'https://example.com/path/to/fake-repo-tmpl.tar.gz', stream=True, timeout=100
+    )
+    assert response.raw.decode_content is True
+    response.close.assert_called_once_with()
+    assert Path(output_dir, 'cookiecutter.json').is_file()
+
+
+def test_untar_without_top_level_directory(mocker, tmp_path) -> None:
+    """A tar file without a top-level directory is rejected."""
+    mkdtemp = mocker.spy(tempfile, 'mkdtemp')
+    tar_path = tmp_path.joinpath('flat.tar')
+    with tarfile.open(tar_path, 'w') as tar_file:
+        add_member(tar_file, 'cookiecutter.json', b'{}')
+
+    with pytest.raises(InvalidTarRepository, match='top-level directory'):
+        cookiecutter_tarfile.untar(str(tar_path), is_url=False)
+
+    assert not os.path.exists(mkdtemp.spy_return)
+
+
+@pytest.mark.parametrize(
+    'member', ['other/cookiecutter.json', '../escape.txt', '/etc/escape.txt']
+)
+def test_untar_member_outside_top_level_directory(tmp_path, member) -> None:
+    """A tar file with members outside of its top-level directory is rejected."""
+    tar_path = tmp_path.joinpath('escape.tar')
+    with tarfile.open(tar_path, 'w') as tar_file:
+        tar_file.add('tests/fake-repo-tmpl', arcname='fake-repo-tmpl')
+        add_member(tar_file, member)
+
+    with pytest.raises(InvalidTarRepository, match='outside'):
+        cookiecutter_tarfile.untar(str(tar_path), is_url=False)
+
+
+def add_link(
+    tar_file: tarfile.TarFile, name: str, linkname: str, link_type: bytes
+) -> None:
+    """Add a link called `name` to `linkname` to `tar_file`."""
+    info = tarfile.TarInfo(name)
+    info.type = link_type
+    info.linkname = linkname
+    tar_file.addfile(info)
+
+
+@pytest.mark.parametrize('data_filter', [True, False])
+@pytest.mark.parametrize(
+    'link_type, linkname',
+    [
+        (tarfile.SYMTYPE, '/etc/passwd'),
+        (tarfile.SYMTYPE, '../../etc/passwd'),
+        (tarfile.SYMTYPE, '..'),
+        (tarfile.LNKTYPE, '/etc/passwd'),
+        (tarfile.LNKTYPE, 'other/passwd'),
+    ],
+)
+def test_untar_link_outside_archive(
+    monkeypatch, tmp_path, link_type, linkname, data_filter
+) -> None:
+    """A tar file with a link leading outside of it is rejected.
+
+    Without the ``data`` filter of newer Pythons, the links are only caught by
+    the checks of `untar()` itself.
+    """
+    if not data_filter:
+        monkeypatch.delattr(tarfile, 'data_filter', raising=False)
+    tar_path = tmp_path.joinpath('link.tar')
+    with tarfile.open(tar_path, 'w') as tar_file:
+        tar_file.add('tests/fake-repo-tmpl', arcname='fake-repo-tmpl')
+        add_link(tar_file, 'fake-repo-tmpl/passwd', linkname, link_type)
+
+    with pytest.raises(InvalidTarRepository, match='link leading outside'):
+        cookiecutter_tarfile.untar(str(tar_path), is_url=False)
+
+
+def test_untar_link_inside_archive(tmp_path) -> None:
+    """Links to other members of the tar file are unpacked."""
+    tar_path = tmp_path.joinpath('link.tar')
+    with tarfile.open(tar_path, 'w') as tar_file:
+        tar_file.add('tests/fake-repo-tmpl', arcname='fake-repo-tmpl')
+        add_link(
+            tar_file,
+            'fake-repo-tmpl/hooks/context.json',
+            '../cookiecutter.json',
+            tarfile.SYMTYPE,
+        )
+
+    output_dir = cookiecutter_tarfile.untar(str(tar_path), is_url=False)
+
+    assert Path(output_dir, 'hooks', 'context.json').is_file()
+
+
+def test_untar_special_file(tmp_path) -> None:
+    """A tar file with a device or a fifo is rejected."""
+    tar_path = tmp_path.joinpath('fifo.tar')
+    with tarfile.open(tar_path, 'w') as tar_file:
+        tar_file.add('tests/fake-repo-tmpl', arcname='fake-repo-tmpl')
+        info = tarfile.TarInfo('fake-repo-tmpl/fifo')
+        info.type = tarfile.FIFOTYPE
+        tar_file.addfile(info)
+
+    with pytest.raises(InvalidTarRepository, match='special file'):
+        cookiecutter_tarfile.untar(str(tar_path), is_url=False)
+
+
+def test_untar_empty_file(tmp_path) -> None:
+    """An empty tar file is rejected."""
+    tar_path = tmp_path.joinpath('empty.tar')
+    tarfile.open(tar_path, 'w').close()
+
+    with pytest.raises(InvalidTarRepository, match='is empty'):
+        cookiecutter_tarfile.untar(str(tar_path), is_url=False)
+
+
+def test_untar_invalid_file(tmp_path) -> None:
+    """A file that is not a tar file is rejected."""
+    tar_path = tmp_path.joinpath('bad.tar.gz')
+    tar_path.write_bytes(b'this is not a tar file')
+
+    with pytest.raises(InvalidTarRepository, match='not a valid tar archive'):
+        cookiecutter_tarfile.untar(str(tar_path), is_url=False)
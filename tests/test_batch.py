@@ -0,0 +1,105 @@
+"""Tests for generating many projects with `cookiecutter.batch`."""
+
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+from cookiecutter import batch
+from cookiecutter.exceptions import InvalidModeException
+
+
+def test_generate_many(tmp_path) -> None:
+    """Verify one project is generated per context."""
+    results = batch.generate_many(
+        'tests/fake-repo-pre',
+        [
+            {'repo_name': 'first-project', 'project_name': 'First'},
+            {'repo_name': 'second-project', 'project_name': 'Second'},
+        ],
+        output_dir=str(tmp_path),
+    )
+
+    assert [result.ok for result in results] == [True, True]
+    assert [Path(str(result.project_dir)).name for result in results] == [
+        'first-project',
+        'second-project',
+    ]
+    readme = tmp_path.joinpath('second-project', 'README.rst').read_text()
+    assert 'Project name: **Second**' in readme
+
+
+def test_generate_many_reads_template_once(mocker, tmp_path) -> None:
+    """Verify the template is located and its context read only once."""
+    determine_repo_dir = mocker.spy(batch, 'determine_repo_dir')
+    generate_context = mocker.spy(batch, 'generate_context')
+
+    batch.generate_many(
+        'tests/fake-repo-pre',
+        [{'repo_name': f'project-{i}'} for i in range(3)],
+        output_dir=str(tmp_path),
+    )
+
+    assert determine_repo_dir.call_count == 1
+    assert generate_context.call_count == 1
+
+
+def test_generate_many_collects_errors(tmp_path) -> None:
+    """Verify a failing project does not stop the rest of the batch."""
+    tmp_path.joinpath('taken').mkdir()
+
+    results = batch.generate_many(
+        'tests/fake-repo-pre',
+        [{'repo_name': 'taken'}, {'repo_name': 'free'}],
+        output_dir=str(tmp_path),
+    )
+
+    assert not results[0].ok
+    assert results[0].project_dir is None
+    assert 'already exists' in str(results[0].error)
+    assert results[1].ok
+    assert tmp_path.joinpath('free', 'README.rst').exists()
+
+
+def test_generate_many_in_parallel(tmp_path) -> None:
+    """Verify projects generated by worker processes come back in order."""
+    contexts = [{'repo_name': f'project-{i}'} for i in range(4)]
+
+    results = batch.generate_many(
+        'tests/fake-repo-pre', contexts, output_dir=str(tmp_path), jobs=2
+    )
+
+    assert [result.extra_context for result in results] == contexts
+    assert all(result.ok for result in results)
+    for i in range(4):
+        assert tmp_path.joinpath(f'project-{i}', 'README.rst').exists()
+
+
+def test_generate_many_worker_crash(mocker, tmp_path) -> None:
+    """Verify a crashed worker turns into errors instead of aborting the batch."""
+
+    def submit(*_args: object, **_kwargs: object) -> Future[None]:
+        future: Future[None] = Future()
+        future.set_exception(BrokenProcessPool('A process in the pool died'))
+        return future
+
+    executor = mocker.patch.object(batch, 'ProcessPoolExecutor').return_value
+    executor.__enter__.return_value.submit.side_effect = submit
+    contexts = [{'repo_name': f'project-{i}'} for i in range(2)]
+
+    results = batch.generate_many(
+        'tests/fake-repo-pre', contexts, output_dir=str(tmp_path), jobs=2
+    )
+
+    assert [result.extra_context for result in results] == contexts
+    assert not any(result.ok for result in results)
+    assert all(isinstance(result.error, BrokenProcessPool) for result in results)
+
+
+def test_generate_many_rejects_nested_templates(tmp_path) -> None:
+    """Verify templates choosing between nested templates are refused."""
+    with pytest.raises(InvalidModeException):
+        batch.generate_many(
+            'tests/fake-nested-templates', [{}], output_dir=str(tmp_path)
+        )
@@ -0,0 +1,220 @@
+"""Tests for the on-disk cache helpers."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from cookiecutter import cache, generate
+from cookiecutter.environment import StrictEnvironment
+from cookiecutter.utils import file_lock
+
+
+def test_get_cache_dir_defaults_to_cookiecutters_dir() -> None:
+    """Verify the cache lives in `cookiecutters_dir` unless configured."""
+    config_dict = {
+        'cookiecutters_dir': '/home/example/cookiecutters',
+        'cache_dir': None,
+    }
+
+    assert cache.get_cache_dir(config_dict) == os.path.join(
+        '/home/example/cookiecutters', '.cache'
+    )
+
+
+def test_get_cache_dir_from_config() -> None:
+    """Verify a configured `cache_dir` takes precedence."""
+    config_dict = {
+        'cookiecutters_dir': '/home/example/cookiecutters',
+        'cache_dir': '/var/cache/cookiecutter',
+    }
+
+    assert cache.get_cache_dir(config_dict) == '/var/cache/cookiecutter'
+
+
+def test_prune_cache_evicts_least_recently_used(tmp_path) -> None:
+    """Verify the oldest entries are removed first until the cache fits."""
+    cache_dir = tmp_path.joinpath('cache')
+    cache_dir.mkdir()
+    for age, name in enumerate(['newest', 'middle', 'oldest']):
+        entry = cache_dir.joinpath(name)
+        entry.write_bytes(b'x' * 10)
+        os.utime(entry, (1000 - age, 1000 - age))
+
+    cache.prune_cache(cache_dir, max_size=15)
+
+    assert [p.name for p in cache_dir.iterdir()] == ['newest']
+
+
+def test_prune_cache_keeps_cache_within_limit(tmp_path) -> None:
+    """Verify nothing is removed when the cache is small enough."""
+    tmp_path.joinpath('entry').write_bytes(b'x' * 10)
+
+    cache.prune_cache(tmp_path, max_size=10)
+
+    assert tmp_path.joinpath('entry').exists()
+
+
+def test_prune_cache_evicts_entry_directories_whole(tmp_path) -> None:
+    """Verify marked directories are evicted as a whole, by their last use."""
+    old_tree = tmp_path.joinpath('archives', 'old')
+    new_tree = tmp_path.joinpath('archives', 'new')
+    for age, tree in enumerate([new_tree, old_tree]):
+        tree.joinpath('template').mkdir(parents=True)
+        tree.joinpath('template', 'file.txt').write_bytes(b'x' * 10)
+        cache.touch_entry(tree)
+        os.utime(tree.joinpath(cache.LAST_USED_FILE), (1000 - age, 1000 - age))
+    # Old files inside an entry do not make it look unused.
+    os.utime(new_tree.joinpath('template', 'file.txt'), (0, 0))
+
+    cache.prune_cache(tmp_path, max_size=15)
+
+    assert not old_tree.exists()
+    assert new_tree.joinpath('template', 'file.txt').is_file()
+
+
+def test_prune_cache_skips_entries_in_use(tmp_path) -> None:
+    """Verify entries locked by a run using them are not evicted."""
+    pytest.importorskip('fcntl')
+    used_tree = tmp_path.joinpath('archives', 'used')
+    used_tree.joinpath('template').mkdir(parents=True)
+    used_tree.joinpath('template', 'file.txt').write_bytes(b'x' * 10)
+    cache.touch_entry(used_tree)
+
+    with file_lock(cache.entry_lock_path(used_tree), shared=True):
+        cache.prune_cache(tmp_path, max_size=0)
+        assert used_tree.joinpath('template', 'file.txt').is_file()
+
+    cache.prune_cache(tmp_path, max_size=0)
+    assert not used_tree.exists()
+
+
+def test_generate_files_reuses_compiled_templates(mocker, tmp_path) -> None:
+    """Verify a second generation loads templates from the bytecode cache."""
+    cache_dir = tmp_path.joinpath('cache')
+    dump_bytecode = mocker.spy(cache.TemplateBytecodeCache, 'dump_bytecode')
+
+    generate.generate_files(
+        context={'cookiecutter': {'food': 'pizzä'}},
+        repo_dir='tests/test-generate-files',
+        output_dir=tmp_path.joinpath('first'),
+        cache_dir=cache_dir,
+    )
+    dumped = dump_bytecode.call_count
+    assert dumped > 0
+    assert len(list(Path(cache_dir, 'jinja').iterdir())) == dumped
+
+    generate.generate_files(
+        context={'cookiecutter': {'food': 'pizzä'}},
+        repo_dir='tests/test-generate-files',
+        output_dir=tmp_path.joinpath('second'),
+        cache_dir=cache_dir,
+    )
+    assert dump_bytecode.call_count == dumped
+
+    simple_file = tmp_path.joinpath('second', 'inputpizzä', 'simple.txt')
+    assert simple_file.read_text(encoding='utf-8') == 'I eat pizzä\n'
+
+
+def test_bytecode_cache_key_depends_on_environment(tmp_path) -> None:
+    """Verify templates compiled with different delimiters do not share entries."""
+    bytecode_cache = cache.TemplateBytecodeCache(tmp_path)
+    default_env = StrictEnvironment()
+    custom_env = StrictEnvironment(variable_start_string='[[')
+
+    default_bucket = bytecode_cache.get_bucket(default_env, 'a.txt', None, 'source')
+    custom_bucket = bytecode_cache.get_bucket(custom_env, 'a.txt', None, 'source')
+
+    assert default_bucket.key != custom_bucket.key
+
+
+def test_file_index_skips_sniffing_unchanged_files(
+    mocker, tmp_path, monkeypatch
+) -> None:
+    """Verify a saved index classifies unchanged files without reading them."""
+    tmp_path.joinpath('readme.txt').write_bytes(b'line one\r\nline two\r\n')
+    index_path = tmp_path.joinpath('cache', 'index.json')
+    sniff_file = mocker.spy(cache, 'sniff_file')
+
+    monkeypatch.chdir(tmp_path)
+    first = cache.FileIndex(index_path)
+    assert first.classify('readme.txt') == cache.FileInfo(False, '\r\n')
+    first.save()
+
+    second = cache.FileIndex(index_path)
+    assert second.classify('readme.txt') == cache.FileInfo(False, '\r\n')
+    assert sniff_file.call_count == 1
+
+
+def test_file_index_refreshes_changed_files(tmp_path, monkeypatch) -> None:
+    """Verify an entry is invalidated when the file size changes."""
+    logo = Path(
+        'tests/test-generate-binaries/input{{cookiecutter.binary_test}}/logo.png'
+    ).read_bytes()
+    readme = tmp_path.joinpath('readme.txt')
+    readme.write_bytes(b'text\n')
+    monkeypatch.chdir(tmp_path)
+    index = cache.FileIndex()
+    assert index.classify('readme.txt') == cache.FileInfo(False, '\n')
+
+    readme.write_bytes(logo)
+    assert index.classify('readme.txt') == cache.FileInfo(True, None)
+
+
+def test_file_index_honours_declared_status(mocker, tmp_path, monkeypatch) -> None:
+    """Verify a declared binary status is used instead of sniffing."""
+    tmp_path.joinpath('data.txt').write_text('not really text\n')
+    is_binary = mocker.patch('cookiecutter.cache.is_binary')
+    monkeypatch.chdir(tmp_path)
+
+    info = cache.FileIndex().classify('data.txt', binary=True)
+
+    assert info == cache.FileInfo(True, None)
+    is_binary.assert_not_called()
+
+
+def test_file_index_ignores_corrupt_index(tmp_path, monkeypatch) -> None:
+    """Verify an unreadable index file starts an empty index."""
+    index_path = tmp_path.joinpath('index.json')
+    index_path.write_text('{not json')
+    tmp_path.joinpath('readme.txt').write_text('text\n')
+    monkeypatch.chdir(tmp_path)
+
+    index = cache.FileIndex(index_path)
+
+    assert index.classify('readme.txt').binary is False
+    index.save()
+    assert 'readme.txt' in index_path.read_text()
+
+
+def test_generate_files_persists_file_index(mocker, tmp_path) -> None:
+    """Verify a second generation does not sniff the template files again."""
+    cache_dir = tmp_path.joinpath('cache')
+    sniff_file = mocker.spy(cache, 'sniff_file')
+    context = {'cookiecutter': {'binary_test': 'binary_files'}}
+
+    generate.generate_files(
+        context=context,
+        repo_dir='tests/test-generate-binaries',
+        output_dir=tmp_path.joinpath('first'),
+        cache_dir=cache_dir,
+    )
+    assert sniff_file.call_count > 0
+    assert len(list(cache_dir.joinpath('files').iterdir())) == 1
+    sniff_file.reset_mock()
+
+    generate.generate_files(
+        context=context,
+        repo_dir='tests/test-generate-binaries',
+        output_dir=tmp_path.joinpath('second'),
+        cache_dir=cache_dir,
+    )
+    sniff_file.assert_not_called()
+
+    logo = tmp_path.joinpath('second', 'inputbinary_files', 'logo.png')
+    assert (
+        logo.read_bytes()
+        == Path(
+            'tests/test-generate-binaries/input{{cookiecutter.binary_test}}/logo.png'
+        ).read_bytes()
+    )
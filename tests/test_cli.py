@@ -131,6 +131,10 @@ def test_cli_replay(mocker, cli_runner) -> None:
         directory=None,
         accept_hooks=True,
         keep_project_on_failure=False,
+        jobs=1,
+        template_cache=True,
+        manifest=False,
+        shallow_clone=False,
     )
 
 
@@ -158,6 +162,10 @@ def test_cli_replay_file(mocker, cli_runner) -> None:
         directory=None,
         accept_hooks=True,
         keep_project_on_failure=False,
+        jobs=1,
+        template_cache=True,
+        manifest=False,
+        shallow_clone=False,
     )
 
 
@@ -210,6 +218,10 @@ def test_cli_exit_on_noinput_and_replay(mocker, cli_runner) -> None:
         directory=None,
         accept_hooks=True,
         keep_project_on_failure=False,
+        jobs=1,
+        template_cache=True,
+        manifest=False,
+        shallow_clone=False,
     )
 
 
@@ -246,6 +258,10 @@ def test_run_cookiecutter_on_overwrite_if_exists_and_replay(
         directory=None,
         accept_hooks=True,
         keep_project_on_failure=False,
+        jobs=1,
+        template_cache=True,
+        manifest=False,
+        shallow_clone=False,
     )
 
 
@@ -305,6 +321,10 @@ def test_cli_output_dir(mocker, cli_runner, output_dir_flag, output_dir) -> None
         directory=None,
         accept_hooks=True,
         keep_project_on_failure=False,
+        jobs=1,
+        template_cache=True,
+        manifest=False,
+        shallow_clone=False,
     )
 
 
@@ -350,6 +370,10 @@ def test_user_config(mocker, cli_runner, user_config_path) -> None:
         directory=None,
         accept_hooks=True,
         keep_project_on_failure=False,
+        jobs=1,
+        template_cache=True,
+        manifest=False,
+        shallow_clone=False,
     )
 
 
@@ -381,6 +405,10 @@ def test_default_user_config_overwrite(mocker, cli_runner, user_config_path) ->
         directory=None,
         accept_hooks=True,
         keep_project_on_failure=False,
+        jobs=1,
+        template_cache=True,
+        manifest=False,
+        shallow_clone=False,
     )
 
 
@@ -407,6 +435,10 @@ def test_default_user_config(mocker, cli_runner) -> None:
         directory=None,
         accept_hooks=True,
         keep_project_on_failure=False,
+        jobs=1,
+        template_cache=True,
+        manifest=False,
+        shallow_clone=False,
     )
 
 
@@ -679,6 +711,10 @@ def test_cli_accept_hooks(
         skip_if_file_exists=False,
         accept_hooks=expected,
         keep_project_on_failure=False,
+        jobs=1,
+        template_cache=True,
+        manifest=False,
+        shallow_clone=False,
     )
 
 
@@ -722,3 +758,105 @@ def test_cli_with_pre_prompt_hook_fail(cli_runner, monkeypatch) -> None:
     assert result.exit_code == 1
     dir_name = 'inputfake-project'
     assert not Path(dir_name).exists()
+
+
+def test_cli_jobs(mocker, cli_runner) -> None:
+    """Test cli invocation passes the `--jobs` option."""
+    mock_cookiecutter = mocker.patch('cookiecutter.cli.cookiecutter')
+
+    template_path = 'tests/fake-repo-pre/'
+    result = cli_runner(template_path, '--no-input', '--jobs', '4')
+
+    assert result.exit_code == 0
+    assert mock_cookiecutter.call_args.kwargs['jobs'] == 4
+
+
+def test_cli_jobs_must_be_positive(cli_runner) -> None:
+    """Test cli invocation rejects a `--jobs` value below one."""
+    result = cli_runner('tests/fake-repo-pre/', '--no-input', '--jobs', '0')
+
+    assert result.exit_code == 2
+    assert 'Invalid value for' in result.output
+
+
+def test_cli_no_template_cache(mocker, cli_runner) -> None:
+    """Test cli invocation passes the `--no-template-cache` flag."""
+    mock_cookiecutter = mocker.patch('cookiecutter.cli.cookiecutter')
+
+    template_path = 'tests/fake-repo-pre/'
+    result = cli_runner(template_path, '--no-input', '--no-template-cache')
+
+    assert result.exit_code == 0
+    assert mock_cookiecutter.call_args.kwargs['template_cache'] is False
+
+
+def test_cli_manifest(mocker, cli_runner) -> None:
+    """Test cli invocation passes the `--manifest` flag."""
+    mock_cookiecutter = mocker.patch('cookiecutter.cli.cookiecutter')
+
+    template_path = 'tests/fake-repo-pre/'
+    result = cli_runner(template_path, '--no-input', '--manifest')
+
+    assert result.exit_code == 0
+    assert mock_cookiecutter.call_args.kwargs['manifest'] is True
+
+
+def test_cli_shallow_clone(mocker, cli_runner) -> None:
+    """Test cli invocation passes the `--shallow-clone` flag."""
+    mock_cookiecutter = mocker.patch('cookiecutter.cli.cookiecutter')
+
+    template_path = 'tests/fake-repo-pre/'
+    result = cli_runner(template_path, '--no-input', '--shallow-clone')
+
+    assert result.exit_code == 0
+    assert mock_cookiecutter.call_args.kwargs['shallow_clone'] is True
+
+
+def test_cli_batch_file(cli_runner, tmp_path) -> None:
+    """Verify the CLI generates one project per line of the batch file."""
+    batch_file = tmp_path.joinpath('contexts.jsonl')
+    batch_file.write_text('{"repo_name": "cli-one"}\n\n{"repo_name": "cli-two"}\n')
+    output_dir = tmp_path.joinpath('output')
+
+    result = cli_runner(
+        'tests/fake-repo-pre',
+        '--batch-file',
+        str(batch_file),
+        '-o',
+        str(output_dir),
+    )
+
+    assert result.exit_code == 0, result.output
+    assert '2 of 2 projects generated' in result.output
+    assert output_dir.joinpath('cli-one', 'README.rst').exists()
+    assert output_dir.joinpath('cli-two', 'README.rst').exists()
+
+
+def test_cli_batch_file_reports_failures(cli_runner, tmp_path) -> None:
+    """Verify the CLI exits with an error if any project failed."""
+    batch_file = tmp_path.joinpath('contexts.jsonl')
+    batch_file.write_text('{"repo_name": "taken"}\n{"repo_name": "free"}\n')
+    output_dir = tmp_path.joinpath('output')
+    output_dir.joinpath('taken').mkdir(parents=True)
+
+    result = cli_runner(
+        'tests/fake-repo-pre',
+        '--batch-file',
+        str(batch_file),
+        '-o',
+        str(output_dir),
+    )
+
+    assert result.exit_code == 1
+    assert '1 of 2 projects generated' in result.output
+
+
+def test_cli_batch_file_invalid_json(cli_runner, tmp_path) -> None:
+    """Verify a malformed batch file is reported as a usage error."""
+    batch_file = tmp_path.joinpath('contexts.jsonl')
+    batch_file.write_text('{"repo_name": "ok"}\n{not json}\n')
+
+    result = cli_runner('tests/fake-repo-pre', '--batch-file', str(batch_file))
+
+    assert result.exit_code == 2
+    assert 'Line 2' in result.output
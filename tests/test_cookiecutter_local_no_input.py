@@ -130,7 +130,10 @@ def test_cookiecutter_template_cleanup(mocker) -> None:
         'cookiecutter.prompt.prompt_and_delete', return_value=True, autospec=True
     )
 
-    main.cookiecutter('tests/files/fake-repo-tmpl.zip', no_input=True)
+    # Zip files unpacked into the template cache are kept on purpose.
+    main.cookiecutter(
+        'tests/files/fake-repo-tmpl.zip', no_input=True, template_cache=False
+    )
     assert os.path.isdir('fake-project-templated')
 
     # The tmp directory will still exist, but the
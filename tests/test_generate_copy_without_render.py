@@ -1,5 +1,6 @@
 """Verify correct work of `_copy_without_render` context option."""
 
+import fnmatch
 import os
 from pathlib import Path
 
@@ -74,3 +75,57 @@ def test_generate_copy_without_render_extensions() -> None:
         'test_copy_without_render/' 'test_copy_without_render-rendered/' 'README.md'
     ).read_text()
     assert '{{cookiecutter.render_test}}' in file_7
+
+
+COPY_ONLY_PATTERNS = [
+    '*not-rendered',
+    'rendered/not_rendered.yml',
+    '*.txt',
+    '{{cookiecutter.repo_name}}-rendered/README.md',
+    'assets/[a-c]?/*.bin',
+    'vendor/[!x]*',
+]
+
+
+@pytest.mark.parametrize(
+    'path',
+    [
+        'dir-not-rendered',
+        'not-rendered/inner',
+        'rendered/not_rendered.yml',
+        'rendered/not_rendered.yaml',
+        'docs/notes.txt',
+        'notes.txt.bak',
+        '{{cookiecutter.repo_name}}-rendered/README.md',
+        'assets/b1/model.bin',
+        'assets/d1/model.bin',
+        'vendor/lib.js',
+        'vendor/xlib.js',
+        'README.rst',
+        '',
+    ],
+)
+def test_is_copy_only_path_matches_fnmatch(path) -> None:
+    """Verify the compiled matcher agrees with `fnmatch` on every path."""
+    context = {'cookiecutter': {'_copy_without_render': COPY_ONLY_PATTERNS}}
+
+    expected = any(fnmatch.fnmatch(path, pattern) for pattern in COPY_ONLY_PATTERNS)
+    assert generate.is_copy_only_path(path, context) is expected
+
+
+def test_is_copy_only_path_without_patterns() -> None:
+    """Verify nothing is copy only when no patterns are configured."""
+    assert not generate.is_copy_only_path('README.rst', {'cookiecutter': {}})
+    assert not generate.is_copy_only_path('README.rst', {})
+
+
+def test_copy_only_matcher_is_compiled_once() -> None:
+    """Verify the same patterns share one compiled matcher."""
+    first = generate.copy_only_matcher(
+        {'cookiecutter': {'_copy_without_render': ['*.txt', '*.md']}}
+    )
+    second = generate.copy_only_matcher(
+        {'cookiecutter': {'_copy_without_render': ['*.txt', '*.md']}}
+    )
+
+    assert first is second
@@ -7,7 +7,7 @@ from pathlib import Path
 
 import pytest
 from jinja2 import FileSystemLoader
-from jinja2.exceptions import TemplateSyntaxError
+from jinja2.exceptions import TemplateSyntaxError, UndefinedError
 
 from cookiecutter import generate
 from cookiecutter.environment import StrictEnvironment
@@ -193,3 +193,121 @@ def test_generate_file_handles_mixed_line_endings(env) -> None:
         simple_text = f.readline()
     assert simple_text in ('newline is CRLF\r\n', 'newline is CRLF\n')
     assert f.newlines in ('\r\n', '\n')
+
+
+def test_generate_file_with_declared_binary_extension(mocker, env, tmp_path) -> None:
+    """Verify files with a declared binary extension are copied unsniffed."""
+    is_binary = mocker.patch('cookiecutter.cache.is_binary')
+    infile = 'tests/files/{{cookiecutter.generate_file}}.txt'
+    tmp_path.joinpath('tests/files').mkdir(parents=True)
+
+    generate.generate_file(
+        project_dir=str(tmp_path),
+        infile=infile,
+        context={
+            'cookiecutter': {
+                'generate_file': 'cheese',
+                '_binary_extensions': ['TXT', '.png'],
+            }
+        },
+        env=env,
+    )
+
+    is_binary.assert_not_called()
+    generated_text = tmp_path.joinpath('tests/files/cheese.txt').read_text()
+    assert generated_text == Path(infile).read_text()
+
+
+@pytest.mark.parametrize(
+    'path, expected',
+    [
+        ('logo.png', True),
+        ('assets/LOGO.PNG', True),
+        ('setup.cfg', False),
+        ('README.md', None),
+        ('Makefile', None),
+    ],
+)
+def test_declared_binary(path, expected) -> None:
+    """Verify declared extensions are matched case-insensitively."""
+    context = {
+        'cookiecutter': {
+            '_binary_extensions': ['png'],
+            '_text_extensions': ['.cfg'],
+        }
+    }
+
+    assert generate.declared_binary(path, context) is expected
+
+
+@pytest.fixture
+def stream_template(tmp_path, monkeypatch):
+    """Fixture. Prepare a template dir in a temporary cwd for streaming tests."""
+    template_dir = tmp_path.joinpath('template')
+    template_dir.mkdir()
+    project_dir = tmp_path.joinpath('project')
+    project_dir.mkdir()
+    monkeypatch.chdir(template_dir)
+    environment = StrictEnvironment()
+    environment.loader = FileSystemLoader('.')
+    return environment, project_dir
+
+
+def test_generate_file_stream_render(stream_template) -> None:
+    """Verify streamed files match rendered ones, including newlines and mode."""
+    env, project_dir = stream_template
+    Path('rows.sql').write_text(
+        '{% for i in range(3) %}INSERT {{ i }};\n{% endfor %}', encoding='utf-8'
+    )
+    Path('rows.sql').chmod(0o750)
+
+    generate.generate_file(
+        project_dir=str(project_dir),
+        infile='rows.sql',
+        context={'cookiecutter': {'_stream_render': True, '_new_lines': '\r\n'}},
+        env=env,
+    )
+
+    outfile = project_dir.joinpath('rows.sql')
+    assert outfile.read_bytes() == b'INSERT 0;\r\nINSERT 1;\r\nINSERT 2;\r\n'
+    assert outfile.stat().st_mode == Path('rows.sql').stat().st_mode
+    assert os.listdir(project_dir) == ['rows.sql']
+
+
+def test_generate_file_stream_render_failure(stream_template) -> None:
+    """Verify a failing streamed render keeps the existing output file intact."""
+    env, project_dir = stream_template
+    Path('broken.txt').write_text('start\n{{ cookiecutter.missing }}\n')
+    project_dir.joinpath('broken.txt').write_text('previous run\n')
+
+    with pytest.raises(UndefinedError):
+        generate.generate_file(
+            project_dir=str(project_dir),
+            infile='broken.txt',
+            context={'cookiecutter': {'_stream_render': True}},
+            env=env,
+        )
+
+    assert project_dir.joinpath('broken.txt').read_text() == 'previous run\n'
+    assert os.listdir(project_dir) == ['broken.txt']
+
+
+@pytest.mark.parametrize('stream_render', [False, True])
+def test_generate_file_leaves_identical_output_untouched(
+    stream_template, stream_render
+) -> None:
+    """Verify an output file with the rendered content is not written again."""
+    env, project_dir = stream_template
+    Path('notes.txt').write_text('note: {{ cookiecutter.note }}')
+    outfile = project_dir.joinpath('notes.txt')
+    outfile.write_text('note: hello')
+    os.utime(outfile, ns=(1_000_000_000, 1_000_000_000))
+    context = {'cookiecutter': {'note': 'hello', '_stream_render': stream_render}}
+
+    assert not generate.generate_file(str(project_dir), 'notes.txt', context, env)
+    assert outfile.stat().st_mtime_ns == 1_000_000_000
+    assert os.listdir(project_dir) == ['notes.txt']
+
+    context['cookiecutter']['note'] = 'bye'
+    assert generate.generate_file(str(project_dir), 'notes.txt', context, env)
+    assert outfile.read_text() == 'note: bye'
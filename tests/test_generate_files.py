@@ -4,6 +4,7 @@ Use the global clean_system fixture and run additional teardown code to remove
 some special folders.
 """
 
+import os
 from pathlib import Path
 
 import pytest
@@ -309,6 +310,31 @@ def test_generate_files_with_overwrite_if_exists(tmp_path) -> None:
     assert simple_text == 'I eat pizzä\n'
 
 
+def test_generate_files_leaves_identical_files_untouched(caplog, tmp_path) -> None:
+    """Verify regenerating a project does not rewrite files with the same content."""
+    generate.generate_files(
+        context={'cookiecutter': {'food': 'pizzä'}},
+        repo_dir='tests/test-generate-files',
+        output_dir=tmp_path,
+    )
+    simple_file = Path(tmp_path, 'inputpizzä/simple.txt')
+    other_file = Path(tmp_path, 'inputpizzä/simple-with-newline.txt')
+    os.utime(simple_file, ns=(1_000_000_000, 1_000_000_000))
+    other_file.write_text('local edit')
+    caplog.set_level('DEBUG', logger='cookiecutter.generate')
+
+    generate.generate_files(
+        context={'cookiecutter': {'food': 'pizzä'}},
+        repo_dir='tests/test-generate-files',
+        overwrite_if_exists=True,
+        output_dir=tmp_path,
+    )
+
+    assert simple_file.stat().st_mtime_ns == 1_000_000_000
+    assert other_file.read_text(encoding='utf-8') != 'local edit'
+    assert 'Wrote 1 files, left 3 files untouched' in caplog.text
+
+
 @pytest.fixture
 def undefined_context():
     """Fixture. Populate context variable for future tests."""
@@ -450,3 +476,83 @@ def test_raise_empty_dir_name(output_dir, undefined_context):
             environment=Environment(autoescape=True),
         )
     assert not Path(output_dir).joinpath('testproject').exists()
+
+
+def _read_tree(root: Path) -> dict[str, bytes]:
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob('*'))
+        if path.is_file()
+    }
+
+
+def test_generate_files_with_jobs_matches_serial_run(tmp_path) -> None:
+    """Verify generating files on a worker pool gives the same tree."""
+    context = {
+        'cookiecutter': {
+            'repo_name': 'test_copy_without_render',
+            'render_test': 'I have been rendered!',
+            '_copy_without_render': [
+                '*not-rendered',
+                'rendered/not_rendered.yml',
+                '*.txt',
+            ],
+        }
+    }
+    serial_dir = Path(
+        generate.generate_files(
+            context=context,
+            repo_dir='tests/test-generate-copy-without-render',
+            output_dir=tmp_path / 'serial',
+        )
+    )
+    parallel_dir = Path(
+        generate.generate_files(
+            context=context,
+            repo_dir='tests/test-generate-copy-without-render',
+            output_dir=tmp_path / 'parallel',
+            jobs=4,
+        )
+    )
+
+    assert _read_tree(parallel_dir) == _read_tree(serial_dir)
+
+
+def test_raise_undefined_variable_file_content_with_jobs(
+    output_dir, undefined_context
+) -> None:
+    """Verify errors raised by a worker keep the serial error semantics."""
+    with pytest.raises(exceptions.UndefinedVariableInTemplate) as err:
+        generate.generate_files(
+            repo_dir='tests/undefined-variable/file-content/',
+            output_dir=output_dir,
+            context=undefined_context,
+            jobs=4,
+        )
+    error = err.value
+    assert error.message == "Unable to create file 'README.rst'"
+    assert error.context == undefined_context
+
+    assert not Path(output_dir).joinpath('testproject').exists()
+
+
+def test_generate_files_with_jobs_same_output_path(tmp_path) -> None:
+    """Verify files rendering to the same path are written in walk order."""
+    template_dir = tmp_path.joinpath('repo', '{{cookiecutter.project}}')
+    template_dir.mkdir(parents=True)
+    template_dir.joinpath('{{cookiecutter.first}}.txt').write_text('first')
+    template_dir.joinpath('{{cookiecutter.second}}.txt').write_text('second')
+    for index in range(20):
+        template_dir.joinpath(f'{index}.txt').write_text(str(index))
+    context = {
+        'cookiecutter': {'project': 'project', 'first': 'same', 'second': 'same'}
+    }
+
+    for run in range(5):
+        project_dir = generate.generate_files(
+            context=context,
+            repo_dir=tmp_path.joinpath('repo'),
+            output_dir=tmp_path.joinpath(f'output-{run}'),
+            jobs=8,
+        )
+        assert Path(project_dir, 'same.txt').read_text() == 'second'
@@ -7,7 +7,7 @@ from pathlib import Path
 
 import pytest
 
-from cookiecutter import generate, utils
+from cookiecutter import generate, hooks, utils
 from cookiecutter.exceptions import FailedHookException
 
 WINDOWS = sys.platform.startswith('win')
@@ -245,3 +245,92 @@ def test_deprecate_run_hook_from_repo_dir(tmp_path) -> None:
             context={},
             delete_project_on_failure=False,
         )
+
+
+@pytest.mark.usefixtures('clean_system', 'remove_additional_folders')
+def test_run_python_hooks_found_beforehand(mocker) -> None:
+    """Verify hooks found once for a template are not looked up again."""
+    hook_scripts = hooks.find_hooks('tests/test-pyhooks/')
+    find_hook = mocker.spy(hooks, 'find_hook')
+
+    generate.generate_files(
+        context={'cookiecutter': {'pyhooks': 'pyhooks'}},
+        repo_dir='tests/test-pyhooks/',
+        output_dir='tests/test-pyhooks/',
+        hook_scripts=hook_scripts,
+    )
+
+    find_hook.assert_not_called()
+    assert os.path.exists('tests/test-pyhooks/inputpyhooks/python_pre.txt')
+    assert os.path.exists('tests/test-pyhooks/inputpyhooks/python_post.txt')
+
+
+def make_staged_template(tmp_path: Path, failing: str | None = None) -> Path:
+    """Create a template with post_gen_project scripts in a stage directory."""
+    repo_dir = tmp_path.joinpath('repo')
+    repo_dir.joinpath('{{cookiecutter.project}}').mkdir(parents=True)
+    stage_dir = repo_dir.joinpath('hooks', 'post_gen_project')
+    stage_dir.mkdir(parents=True)
+    for name in ('git_init.py', 'lock.py', 'format.py', 'docs.py'):
+        exit_status = 1 if name == failing else 0
+        stage_dir.joinpath(name).write_text(
+            f"import sys\nopen('{name}.txt', 'w').close()\nsys.exit({exit_status})\n"
+        )
+    return repo_dir
+
+
+HOOK_DEPENDENCIES = {
+    'post_gen_project/lock.py': ['post_gen_project/git_init.py'],
+    'post_gen_project/format.py': ['post_gen_project/lock.py'],
+}
+
+
+def test_run_hook_dependencies(tmp_path) -> None:
+    """Scripts of templates declaring their dependencies all run."""
+    project_dir = generate.generate_files(
+        context={
+            'cookiecutter': {
+                'project': 'project',
+                '_hook_dependencies': HOOK_DEPENDENCIES,
+            }
+        },
+        repo_dir=make_staged_template(tmp_path),
+        output_dir=tmp_path.joinpath('output'),
+        jobs=4,
+    )
+
+    assert sorted(p.name for p in Path(project_dir).iterdir()) == [
+        'docs.py.txt',
+        'format.py.txt',
+        'git_init.py.txt',
+        'lock.py.txt',
+    ]
+
+
+def test_run_hook_dependencies_failure(tmp_path) -> None:
+    """A failing script stops its dependents and removes the project."""
+    with pytest.raises(FailedHookException):
+        generate.generate_files(
+            context={
+                'cookiecutter': {
+                    'project': 'project',
+                    '_hook_dependencies': HOOK_DEPENDENCIES,
+                }
+            },
+            repo_dir=make_staged_template(tmp_path, failing='git_init.py'),
+            output_dir=tmp_path.joinpath('output'),
+            jobs=4,
+        )
+
+    assert not tmp_path.joinpath('output', 'project').exists()
+
+
+def test_hook_stage_directory_needs_dependencies(tmp_path) -> None:
+    """Scripts in a stage directory are left alone without dependencies."""
+    project_dir = generate.generate_files(
+        context={'cookiecutter': {'project': 'project'}},
+        repo_dir=make_staged_template(tmp_path),
+        output_dir=tmp_path.joinpath('output'),
+    )
+
+    assert not any(Path(project_dir).iterdir())
@@ -76,6 +76,14 @@ def test_get_config() -> None:
             'bb': 'https://bitbucket.org/{0}',
             'helloworld': 'https://github.com/hackebrot/helloworld',
         },
+        'cache_dir': None,
+        'cache_max_size': 256 * 1024 * 1024,
+        'shallow_clone': False,
+        'refresh': None,
+        'refresh_ttl': 3600,
+        'content_addressed_clones': False,
+        'download_chunk_size': 64 * 1024,
+        'hook_limits': {},
     }
     assert conf == expected_conf
 
@@ -119,6 +127,14 @@ def test_get_config_with_defaults() -> None:
             'gl': 'https://gitlab.com/{0}.git',
             'bb': 'https://bitbucket.org/{0}',
         },
+        'cache_dir': None,
+        'cache_max_size': 256 * 1024 * 1024,
+        'shallow_clone': False,
+        'refresh': None,
+        'refresh_ttl': 3600,
+        'content_addressed_clones': False,
+        'download_chunk_size': 64 * 1024,
+        'hook_limits': {},
     }
     assert conf == expected_conf
 
@@ -149,3 +165,26 @@ def test_get_config_invalid_file_with_multiple_docs() -> None:
     with pytest.raises(InvalidConfiguration) as exc_info:
         config.get_config('tests/test-config/invalid-config-w-multiple-docs.yaml')
     assert expected_error_msg in str(exc_info.value)
+
+
+def test_get_config_invalid_refresh_strategy() -> None:
+    """An exception should be raised for an unknown refresh strategy."""
+    expected_error_msg = (
+        "Invalid refresh strategy 'sometimes' in "
+        'tests/test-config/invalid-config-w-refresh.yaml, '
+        'expected one of: always, if-stale, never.'
+    )
+    with pytest.raises(InvalidConfiguration) as exc_info:
+        config.get_config('tests/test-config/invalid-config-w-refresh.yaml')
+    assert expected_error_msg in str(exc_info.value)
+
+
+def test_get_config_invalid_hook_limits() -> None:
+    """An exception should be raised for an unknown hook limit."""
+    expected_error_msg = (
+        'Invalid hook_limits in tests/test-config/invalid-config-w-hook-limits.yaml: '
+        'Unknown hook limits wall_time, expected some of: timeout, cpu_time, memory.'
+    )
+    with pytest.raises(InvalidConfiguration) as exc_info:
+        config.get_config('tests/test-config/invalid-config-w-hook-limits.yaml')
+    assert expected_error_msg in str(exc_info.value)
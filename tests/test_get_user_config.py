@@ -64,6 +64,14 @@ def custom_config():
             'bb': 'https://bitbucket.org/{0}',
             'helloworld': 'https://github.com/hackebrot/helloworld',
         },
+        'cache_dir': None,
+        'cache_max_size': 256 * 1024 * 1024,
+        'shallow_clone': False,
+        'refresh': None,
+        'refresh_ttl': 3600,
+        'content_addressed_clones': False,
+        'download_chunk_size': 64 * 1024,
+        'hook_limits': {},
     }
 
 
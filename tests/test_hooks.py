@@ -1,10 +1,15 @@
 """Tests for `cookiecutter.hooks` module."""
 
 import errno
+import logging
 import os
 import stat
+import subprocess
 import sys
+import tempfile
 import textwrap
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -275,3 +280,418 @@ def test_ignore_hook_backup_files(monkeypatch, dir_with_hooks) -> None:
     monkeypatch.chdir(dir_with_hooks)
     assert hooks.find_hook('pre_gen_project') is None
     assert hooks.find_hook('post_gen_project') is None
+
+
+def test_run_python_in_process(tmp_path) -> None:
+    """Run a Python hook in its own namespace, from the working directory."""
+    argv = sys.argv
+    source = textwrap.dedent(
+        """
+        import os
+        import sys
+
+        with open('hook.txt', 'w') as fh:
+            fh.write(f'{__name__} {sys.argv} {os.getcwd()}')
+        sys.exit(0)
+        """
+    )
+
+    hooks.run_python_in_process(source, 'post_gen_project.py', tmp_path)
+
+    assert tmp_path.joinpath('hook.txt').read_text() == (
+        f"__main__ ['post_gen_project.py'] {tmp_path}"
+    )
+    assert sys.argv is argv
+    assert os.getcwd() != str(tmp_path)
+
+
+def test_run_python_in_process_restores_state(monkeypatch, tmp_path) -> None:
+    """Changes of a Python hook to the interpreter's global state are undone."""
+    monkeypatch.setenv('COOKIECUTTER_HOOK_CHANGED', 'before')
+    monkeypatch.setenv('COOKIECUTTER_HOOK_REMOVED', 'before')
+    monkeypatch.delenv('COOKIECUTTER_HOOK_ADDED', raising=False)
+    tmp_path.joinpath('hook_helper.py').write_text('VALUE = 1\n')
+    path, stdout = list(sys.path), sys.stdout
+    source = textwrap.dedent(
+        f"""
+        import io
+        import os
+        import sys
+
+        sys.path.insert(0, {str(tmp_path)!r})
+        import hook_helper
+
+        os.environ['COOKIECUTTER_HOOK_ADDED'] = 'after'
+        os.environ['COOKIECUTTER_HOOK_CHANGED'] = 'after'
+        del os.environ['COOKIECUTTER_HOOK_REMOVED']
+        sys.stdout = io.StringIO()
+        """
+    )
+
+    hooks.run_python_in_process(source, 'post_gen_project.py', tmp_path)
+
+    assert sys.path == path
+    assert 'hook_helper' not in sys.modules
+    assert 'COOKIECUTTER_HOOK_ADDED' not in os.environ
+    assert os.environ['COOKIECUTTER_HOOK_CHANGED'] == 'before'
+    assert os.environ['COOKIECUTTER_HOOK_REMOVED'] == 'before'
+    assert sys.stdout is stdout
+
+
+@pytest.mark.parametrize(
+    'source, exit_status',
+    [
+        ('import sys; sys.exit(3)', 3),
+        ("import sys; sys.exit('Invalid module name')", 1),
+        ("raise ValueError('Invalid module name')", 1),
+    ],
+)
+def test_run_python_in_process_failure(tmp_path, source, exit_status) -> None:
+    """A Python hook run in process fails like one run in a subprocess."""
+    with pytest.raises(
+        exceptions.FailedHookException, match=rf'\(exit status: {exit_status}\)'
+    ):
+        hooks.run_python_in_process(source, 'pre_gen_project.py', tmp_path)
+
+
+def test_run_script_with_context_in_process(mocker, tmp_path) -> None:
+    """Python hooks of templates setting `_in_process_hooks` run in process."""
+    popen = mocker.patch('subprocess.Popen')
+    hook_path = tmp_path.joinpath('post_gen_project.py')
+    hook_path.write_text("open('{{cookiecutter.file}}', 'w').close()\n")
+    context = {'cookiecutter': {'file': 'context_post.txt', '_in_process_hooks': True}}
+
+    hooks.run_script_with_context(hook_path, tmp_path, context)
+
+    assert tmp_path.joinpath('context_post.txt').is_file()
+    popen.assert_not_called()
+
+
+def test_find_hooks() -> None:
+    """Find the scripts of every hook of a template at once."""
+    assert hooks.find_hooks('tests/test-pyhooks') == {
+        'pre_prompt': [os.path.abspath('tests/test-pyhooks/hooks/pre_prompt.py')],
+        'pre_gen_project': [
+            os.path.abspath('tests/test-pyhooks/hooks/pre_gen_project.py')
+        ],
+        'post_gen_project': [
+            os.path.abspath('tests/test-pyhooks/hooks/post_gen_project.py')
+        ],
+    }
+
+
+def test_run_script_with_context_renders_every_time(tmp_path) -> None:
+    """Rendered hooks are not cached, their output may change between runs."""
+    hook_path = tmp_path.joinpath('post_gen_project.py')
+    hook_path.write_text(
+        "open('secrets.txt', 'a').write('{{ random_ascii_string(16) }}\\n')\n"
+    )
+    cache_dir = tmp_path.joinpath('cache')
+
+    for _ in range(2):
+        hooks.run_script_with_context(hook_path, tmp_path, {}, cache_dir)
+
+    first, second = tmp_path.joinpath('secrets.txt').read_text().split()
+    assert first != second
+    assert not cache_dir.exists()
+
+
+@pytest.mark.skipif(sys.platform.startswith('win'), reason='Shell script')
+def test_run_script_with_context_cache(tmp_path) -> None:
+    """Hooks without template markup are kept in the cache by their source."""
+    hook_path = tmp_path.joinpath('post_gen_project.sh')
+    hook_path.write_text('#!/bin/sh\necho run >> hook.txt\n')
+    cache_dir = tmp_path.joinpath('cache')
+
+    for _ in range(2):
+        hooks.run_script_with_context(hook_path, tmp_path, {}, cache_dir)
+
+    assert tmp_path.joinpath('hook.txt').read_text() == 'run\nrun\n'
+    assert len(list(cache_dir.joinpath('hooks').iterdir())) == 1
+    assert not os.access(hook_path, os.X_OK)
+
+
+def test_run_script_with_context_removes_rendered_script(mocker, tmp_path) -> None:
+    """Hooks rendered without a cache directory are removed once run."""
+    mkdtemp = mocker.spy(tempfile, 'mkdtemp')
+    hook_path = tmp_path.joinpath('post_gen_project.py')
+    hook_path.write_text("open('{{cookiecutter.file}}', 'w').close()\n")
+
+    hooks.run_script_with_context(
+        hook_path, tmp_path, {'cookiecutter': {'file': 'context_post.txt'}}
+    )
+
+    assert tmp_path.joinpath('context_post.txt').is_file()
+    assert not os.path.exists(mkdtemp.spy_return)
+
+
+def test_run_script_with_context_without_markup(mocker, tmp_path) -> None:
+    """Python hooks without template markup run in place, unrendered."""
+    from_string = mocker.spy(utils.create_env_with_context({}), 'from_string')
+    hook_path = tmp_path.joinpath('post_gen_project.py')
+    hook_path.write_text("open('hook.txt', 'w').write(__file__)\n")
+
+    hooks.run_script_with_context(hook_path, tmp_path, {}, tmp_path / 'cache')
+
+    assert tmp_path.joinpath('hook.txt').read_text() == str(hook_path)
+    assert not tmp_path.joinpath('cache').exists()
+    from_string.assert_not_called()
+
+
+def write_hook(tmp_path: Path, source: str) -> str:
+    """Write a Python hook script and return its path."""
+    hook_path = tmp_path.joinpath('post_gen_project.py')
+    hook_path.write_text(textwrap.dedent(source))
+    return str(hook_path)
+
+
+def test_run_script_output_on_failure(capfd, tmp_path) -> None:
+    """A failing hook with a timeout has the end of its output attached."""
+    hook_path = write_hook(
+        tmp_path,
+        """
+        import sys
+
+        print('x' * 100_000)
+        print('Invalid module name', file=sys.stderr)
+        sys.exit(2)
+        """,
+    )
+
+    with pytest.raises(exceptions.FailedHookException) as excinfo:
+        hooks.run_script(hook_path, tmp_path, hooks.HookLimits(timeout=30))
+
+    assert 'exit status: 2' in str(excinfo.value)
+    assert len(excinfo.value.stdout) == hooks.HOOK_OUTPUT_LIMIT
+    assert excinfo.value.stdout.strip() == b'x' * (hooks.HOOK_OUTPUT_LIMIT - 1)
+    assert excinfo.value.stderr.strip() == b'Invalid module name'
+    assert (excinfo.value.duration or 0) > 0
+    out, err = capfd.readouterr()
+    assert out.strip() == 'x' * 100_000
+    assert err.strip() == 'Invalid module name'
+
+
+def test_run_script_without_timeout_shares_terminal(mocker, tmp_path) -> None:
+    """A hook without a timeout inherits the output and session of Cookiecutter."""
+    hook_path = write_hook(tmp_path, "import sys\nsys.exit(3)\n")
+    popen = mocker.spy(subprocess, 'Popen')
+
+    with pytest.raises(exceptions.FailedHookException) as excinfo:
+        hooks.run_script(hook_path, tmp_path)
+
+    assert 'exit status: 3' in str(excinfo.value)
+    assert excinfo.value.stdout == excinfo.value.stderr == b''
+    assert (excinfo.value.duration or 0) > 0
+    assert popen.call_args.kwargs['stdout'] is None
+    assert popen.call_args.kwargs['stderr'] is None
+    assert not popen.call_args.kwargs['start_new_session']
+
+
+def test_run_script_timeout(tmp_path) -> None:
+    """A hook running for longer than its timeout is killed."""
+    hook_path = write_hook(
+        tmp_path,
+        """
+        import time
+
+        print('started', flush=True)
+        time.sleep(60)
+        """,
+    )
+
+    with pytest.raises(exceptions.FailedHookException) as excinfo:
+        hooks.run_script(hook_path, tmp_path, hooks.HookLimits(timeout=0.5))
+
+    assert str(excinfo.value) == 'Hook script timed out after 0.5 seconds'
+    assert excinfo.value.stdout.strip() == b'started'
+    assert 0 < (excinfo.value.duration or 0) < 30
+
+
+@pytest.mark.skipif(sys.platform.startswith('win'), reason='POSIX resource limits')
+def test_run_script_memory_limit(capfd, tmp_path) -> None:
+    """A hook allocating more memory than its limit fails."""
+    hook_path = write_hook(tmp_path, "b'x' * (1024 * 1024 * 1024)\n")
+
+    with pytest.raises(exceptions.FailedHookException, match='exit status: 1'):
+        hooks.run_script(
+            hook_path, tmp_path, hooks.HookLimits(memory=512 * 1024 * 1024)
+        )
+
+    assert 'MemoryError' in capfd.readouterr().err
+
+
+@pytest.mark.skipif(sys.platform.startswith('win'), reason='POSIX resource limits')
+def test_run_script_limited_missing_shebang(tmp_path) -> None:
+    """A limited hook that cannot be executed fails with a helpful message."""
+    hook_path = tmp_path.joinpath('post_gen_project.sh')
+    hook_path.write_text('echo no shebang\n')
+
+    with pytest.raises(exceptions.FailedHookException) as excinfo:
+        hooks.run_script(str(hook_path), tmp_path, hooks.HookLimits(cpu_time=10))
+
+    assert str(excinfo.value) == (
+        'Hook script failed, might be an empty file or missing a shebang'
+    )
+
+
+def process_ended(pid: int) -> bool:
+    """Return whether a process ended, waiting a few seconds for it."""
+    stat = Path(f'/proc/{pid}/stat')
+    for _ in range(50):
+        # Orphans left unreaped in containers show up as zombies.
+        if not stat.exists() or stat.read_text().split()[2] == 'Z':
+            return True
+        time.sleep(0.1)
+    return False
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='Uses /proc')
+def test_run_script_timeout_kills_children(tmp_path) -> None:
+    """Processes started by a hook are killed with it when it times out."""
+    hook_path = tmp_path.joinpath('post_gen_project.sh')
+    hook_path.write_text('#!/bin/sh\nsleep 37 &\necho $! > sleep.pid\nsleep 37\n')
+
+    with pytest.raises(exceptions.FailedHookException, match='timed out'):
+        hooks.run_script(str(hook_path), tmp_path, hooks.HookLimits(timeout=1))
+
+    assert process_ended(int(tmp_path.joinpath('sleep.pid').read_text()))
+
+
+def test_run_script_with_context_reports_time(caplog, tmp_path) -> None:
+    """The wall time of every hook is logged at the info level."""
+    hook_path = write_hook(tmp_path, "print('hello')\n")
+
+    with caplog.at_level(logging.INFO, logger='cookiecutter.hooks'):
+        hooks.run_script_with_context(hook_path, tmp_path, {})
+
+    (record,) = [r for r in caplog.records if hasattr(r, 'hook_duration')]
+    assert record.levelno == logging.INFO
+    assert record.hook_script == hook_path
+    assert record.hook_duration > 0
+    assert not record.hook_failed
+
+
+def test_hook_limits_stricter() -> None:
+    """The stricter of two limits applies, with `None` for no limit."""
+    template_limits = hooks.HookLimits.from_dict({'timeout': 60, 'memory': 1024})
+    user_limits = hooks.HookLimits.from_dict({'timeout': 30, 'cpu_time': 10})
+
+    assert template_limits.stricter(user_limits) == hooks.HookLimits(30, 10, 1024)
+    assert template_limits.stricter(None) == template_limits
+    with pytest.raises(ValueError, match='Unknown hook limits wall_time'):
+        hooks.HookLimits.from_dict({'wall_time': 60})
+
+
+def test_run_script_with_context_limits(mocker, tmp_path) -> None:
+    """Limits of the template and the user are combined, even in process."""
+    run_script = mocker.patch('cookiecutter.hooks.run_script')
+    hook_path = write_hook(tmp_path, "print('hello')\n")
+    context = {
+        'cookiecutter': {
+            '_in_process_hooks': True,
+            '_hook_limits': {'timeout': 60, 'memory': 1024},
+        }
+    }
+
+    hooks.run_script_with_context(
+        hook_path, tmp_path, context, limits=hooks.HookLimits(timeout=30)
+    )
+
+    run_script.assert_called_once_with(
+        hook_path, tmp_path, hooks.HookLimits(timeout=30, memory=1024)
+    )
+
+
+def test_run_script_with_context_invalid_limits(tmp_path) -> None:
+    """Unknown limits in the template fail the hook."""
+    hook_path = write_hook(tmp_path, "print('hello')\n")
+    context = {'cookiecutter': {'_hook_limits': {'wall_time': 60}}}
+
+    with pytest.raises(exceptions.FailedHookException, match='Invalid _hook_limits'):
+        hooks.run_script_with_context(hook_path, tmp_path, context)
+
+
+def test_find_hook_stage_directory(tmp_path) -> None:
+    """Scripts in a directory named after the hook follow the other ones.
+
+    They are only found for templates declaring their hook dependencies.
+    """
+    hooks_dir = tmp_path.joinpath('hooks')
+    stage_dir = hooks_dir.joinpath('post_gen_project')
+    stage_dir.joinpath('nested').mkdir(parents=True)
+    for name in ('post_gen_project.py', 'post_gen_project/b.sh'):
+        hooks_dir.joinpath(name).write_text('')
+    for name in ('a.py', 'a.py~', '.hidden.py'):
+        stage_dir.joinpath(name).write_text('')
+
+    assert hooks.find_hook('post_gen_project', str(hooks_dir)) == [
+        str(hooks_dir.joinpath('post_gen_project.py'))
+    ]
+    assert hooks.find_hook('post_gen_project', str(hooks_dir), stages=True) == [
+        str(hooks_dir.joinpath('post_gen_project.py')),
+        str(stage_dir.joinpath('a.py')),
+        str(stage_dir.joinpath('b.sh')),
+    ]
+
+
+def test_hook_graph() -> None:
+    """Scripts depend on other scripts of the hook by their name."""
+    scripts = ['/hooks/post_gen_project.py', '/hooks/post_gen_project/lock.py']
+
+    assert hooks.hook_graph(
+        'post_gen_project',
+        scripts,
+        {'post_gen_project/lock.py': ['post_gen_project.py']},
+    ) == {scripts[0]: [], scripts[1]: [scripts[0]]}
+    with pytest.raises(exceptions.FailedHookException, match='unknown'):
+        hooks.hook_graph(
+            'post_gen_project',
+            scripts,
+            {'post_gen_project.py': ['pre_gen_project.py']},
+        )
+
+
+def test_run_hook_graph_order() -> None:
+    """Scripts run after their dependencies, independent ones at once."""
+    barrier = threading.Barrier(2, timeout=10)
+    finished = []
+
+    def run(script: str) -> None:
+        if script in {'lock', 'docs'}:
+            # Fails unless both scripts run at the same time.
+            barrier.wait()
+        finished.append(script)
+
+    hooks.run_hook_graph(
+        {'git_init': [], 'lock': ['git_init'], 'format': ['lock'], 'docs': []},
+        run,
+        jobs=2,
+    )
+
+    assert finished.index('git_init') < finished.index('lock')
+    assert finished.index('lock') < finished.index('format')
+    assert sorted(finished) == ['docs', 'format', 'git_init', 'lock']
+
+
+def test_run_hook_graph_failure() -> None:
+    """Scripts depending on a failing script do not run."""
+    finished = []
+
+    def run(script: str) -> None:
+        if script == 'lock':
+            msg = 'Hook script failed'
+            raise exceptions.FailedHookException(msg)
+        finished.append(script)
+
+    with pytest.raises(exceptions.FailedHookException, match='Hook script failed'):
+        hooks.run_hook_graph(
+            {'git_init': [], 'lock': ['git_init'], 'format': ['lock']}, run
+        )
+
+    assert finished == ['git_init']
+
+
+def test_run_hook_graph_cycle() -> None:
+    """Scripts cannot depend on each other in a cycle."""
+    with pytest.raises(exceptions.FailedHookException, match='cycle'):
+        hooks.run_hook_graph({'lock': ['format'], 'format': ['lock']}, print)
@@ -0,0 +1,148 @@
+"""Tests for incremental regeneration with a generation manifest."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from cookiecutter import generate, main, source
+from cookiecutter.manifest import MANIFEST_FILE, Manifest
+
+
+@pytest.fixture
+def template(tmp_path):
+    """Fixture. Create a small template with a text and a copy only file."""
+    template_dir = tmp_path.joinpath('template', '{{cookiecutter.repo_name}}')
+    template_dir.mkdir(parents=True)
+    template_dir.joinpath('README.md').write_text('# {{cookiecutter.repo_name}}\n')
+    template_dir.joinpath('LICENSE').write_text('{{ cookiecutter.license }}\n')
+    template_dir.joinpath('static.txt').write_text('{{ not rendered }}\n')
+    return template_dir.parent
+
+
+def generate_project(template: Path, tmp_path: Path, **context: str) -> Path:
+    """Generate the project into the output dir, with a manifest."""
+    return Path(
+        generate.generate_files(
+            repo_dir=template,
+            context={
+                'cookiecutter': {
+                    'repo_name': 'example',
+                    'license': 'MIT',
+                    '_copy_without_render': ['static.txt'],
+                    **context,
+                }
+            },
+            output_dir=tmp_path.joinpath('output'),
+            overwrite_if_exists=True,
+            manifest=True,
+        )
+    )
+
+
+def read_statuses(project_dir: Path) -> dict[str, str]:
+    """Return the status of every file recorded in the manifest."""
+    data = json.loads(project_dir.joinpath(MANIFEST_FILE).read_text())
+    return {path: entry['status'] for path, entry in data['files'].items()}
+
+
+def test_manifest_records_added_files(template, tmp_path) -> None:
+    """Verify the first generation records every file as added."""
+    project_dir = generate_project(template, tmp_path)
+
+    assert read_statuses(project_dir) == {
+        'LICENSE': 'added',
+        'README.md': 'added',
+        'static.txt': 'added',
+    }
+
+
+def test_manifest_leaves_unchanged_files_alone(mocker, template, tmp_path) -> None:
+    """Verify files with unchanged inputs are neither rendered nor written."""
+    project_dir = generate_project(template, tmp_path)
+    mtimes = {p.name: p.stat().st_mtime_ns for p in project_dir.iterdir()}
+    generate_file = mocker.spy(generate, 'generate_file')
+    copy_file = mocker.spy(source, 'copy_file')
+
+    generate_project(template, tmp_path)
+
+    generate_file.assert_not_called()
+    copy_file.assert_not_called()
+    assert read_statuses(project_dir) == dict.fromkeys(
+        ['LICENSE', 'README.md', 'static.txt'], 'unchanged'
+    )
+    for name in ['LICENSE', 'README.md', 'static.txt']:
+        assert project_dir.joinpath(name).stat().st_mtime_ns == mtimes[name]
+
+
+def test_manifest_regenerates_on_context_change(template, tmp_path) -> None:
+    """Verify a changed context regenerates files and reports changed output."""
+    generate_project(template, tmp_path)
+
+    project_dir = generate_project(template, tmp_path, license='BSD')
+
+    assert project_dir.joinpath('LICENSE').read_text() == 'BSD\n'
+    assert read_statuses(project_dir) == {
+        'LICENSE': 'changed',
+        'README.md': 'unchanged',
+        'static.txt': 'unchanged',
+    }
+
+
+def test_manifest_regenerates_changed_template_file(template, tmp_path) -> None:
+    """Verify editing a template file regenerates only that file."""
+    project_dir = generate_project(template, tmp_path)
+    template.joinpath('{{cookiecutter.repo_name}}', 'README.md').write_text(
+        '# {{cookiecutter.repo_name}}!\n'
+    )
+
+    generate_project(template, tmp_path)
+
+    assert project_dir.joinpath('README.md').read_text() == '# example!\n'
+    assert read_statuses(project_dir)['README.md'] == 'changed'
+    assert read_statuses(project_dir)['LICENSE'] == 'unchanged'
+
+
+def test_manifest_restores_edited_output(template, tmp_path) -> None:
+    """Verify an output file edited since the last run is generated again."""
+    project_dir = generate_project(template, tmp_path)
+    project_dir.joinpath('README.md').write_text('local edit\n')
+
+    generate_project(template, tmp_path)
+
+    assert project_dir.joinpath('README.md').read_text() == '# example\n'
+    assert read_statuses(project_dir)['README.md'] == 'changed'
+
+
+def test_manifest_ignores_template_location(mocker, tmp_path) -> None:
+    """Verify a template copied away by its pre_prompt hook hits the manifest."""
+    output_dir = tmp_path.joinpath('output')
+    generate_file = mocker.spy(generate, 'generate_file')
+
+    for _ in range(2):
+        project_dir = Path(
+            main.cookiecutter(
+                'tests/test-pyhooks',
+                no_input=True,
+                output_dir=str(output_dir),
+                overwrite_if_exists=True,
+                manifest=True,
+            )
+        )
+
+    assert generate_file.call_count == 1
+    assert read_statuses(project_dir) == {'README.rst': 'unchanged'}
+
+
+def test_manifest_save_reports_statuses(template, tmp_path) -> None:
+    """Verify saving the manifest returns the paths for every status."""
+    project_dir = generate_project(template, tmp_path, license='BSD')
+    manifest = Manifest(project_dir, 'hash')
+    manifest.record('README.md', str(project_dir / 'README.md'), 'a', None)
+    manifest.record('LICENSE', str(project_dir / 'LICENSE'), 'b', 'other')
+
+    assert manifest.save() == {
+        'added': ['README.md'],
+        'changed': ['LICENSE'],
+        'unchanged': [],
+    }
@@ -0,0 +1,66 @@
+"""Tests for rendering file and directory paths with `render_path`."""
+
+import pytest
+from jinja2.exceptions import UndefinedError
+
+from cookiecutter import generate
+from cookiecutter.environment import StrictEnvironment
+
+
+@pytest.fixture
+def env():
+    """Fixture. Strict environment as used while generating files."""
+    return StrictEnvironment(keep_trailing_newline=True)
+
+
+@pytest.fixture
+def context():
+    """Fixture. Minimal cookiecutter context."""
+    return {'cookiecutter': {'project_slug': 'pizza'}}
+
+
+def test_render_path_without_markup_skips_jinja(mocker, env, context) -> None:
+    """Verify plain paths are returned without compiling a template."""
+    from_string = mocker.spy(env, 'from_string')
+
+    assert generate.render_path('docs/index.rst', context, env) == 'docs/index.rst'
+    from_string.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    'path, expected',
+    [
+        ('{{cookiecutter.project_slug}}/setup.py', 'pizza/setup.py'),
+        ('{% if True %}docs{% endif %}/index.rst', 'docs/index.rst'),
+        ('notes{# hidden #}.txt', 'notes.txt'),
+    ],
+)
+def test_render_path_with_markup(env, context, path, expected) -> None:
+    """Verify paths with variables, blocks or comments are rendered."""
+    assert generate.render_path(path, context, env) == expected
+
+
+def test_render_path_compiles_each_path_once(mocker, env, context) -> None:
+    """Verify compiled path templates are reused."""
+    from_string = mocker.spy(env, 'from_string')
+
+    for _ in range(3):
+        generate.render_path('{{cookiecutter.project_slug}}/cached', context, env)
+
+    from_string.assert_called_once_with('{{cookiecutter.project_slug}}/cached')
+
+
+def test_render_path_respects_custom_delimiters(context) -> None:
+    """Verify the markup check follows the environment delimiters."""
+    env = StrictEnvironment(variable_start_string='[[', variable_end_string=']]')
+
+    assert generate.render_path('{{literal}}', context, env) == '{{literal}}'
+    assert generate.render_path('[[cookiecutter.project_slug]]', context, env) == (
+        'pizza'
+    )
+
+
+def test_render_path_raises_undefined_error(env, context) -> None:
+    """Verify undefined variables still raise while rendering paths."""
+    with pytest.raises(UndefinedError):
+        generate.render_path('{{cookiecutter.foobar}}', context, env)
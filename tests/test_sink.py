@@ -0,0 +1,267 @@
+"""Tests for writing generated projects elsewhere than to a directory."""
+
+from __future__ import annotations
+
+import io
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from cookiecutter import generate, main, sink
+from cookiecutter.exceptions import InvalidModeException, UndefinedVariableInTemplate
+
+Tree = dict[str, tuple[bytes | None, int]]
+
+REPOS = [
+    (
+        'tests/test-generate-copy-without-render',
+        {
+            'repo_name': 'test_copy_without_render',
+            'render_test': 'I have been rendered!',
+            '_copy_without_render': [
+                '*not-rendered',
+                'rendered/not_rendered.yml',
+                '*.txt',
+                '{{cookiecutter.repo_name}}-rendered/README.md',
+            ],
+        },
+    ),
+    ('tests/test-generate-binaries', {'binary_test': 'binary_files'}),
+    ('tests/test-generate-files-permissions', {'permissions': 'permissions'}),
+    ('tests/test-generate-files', {'food': 'pizzä', '_stream_render': True}),
+]
+
+
+class UnseekableStream(io.BytesIO):
+    """A file object that can only be written to in order, like a socket."""
+
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, offset: int, whence: int = 0) -> int:  # noqa: ARG002
+        raise io.UnsupportedOperation
+
+    def tell(self) -> int:
+        raise io.UnsupportedOperation
+
+
+def read_tree(path: Path) -> Tree:
+    """Return the content and permission bits of everything in a tree."""
+    return {
+        p.relative_to(path).as_posix(): (
+            p.read_bytes() if p.is_file() else None,
+            p.stat().st_mode & 0o777,
+        )
+        for p in path.rglob('*')
+    }
+
+
+def generate_to_directory(
+    tmp_path: Path, repo_dir: str, context: dict[str, Any]
+) -> Tree:
+    """Generate a project to a directory and return its tree."""
+    project_dir = generate.generate_files(
+        repo_dir=repo_dir,
+        context={'cookiecutter': context},
+        output_dir=tmp_path.joinpath('directory'),
+    )
+    return read_tree(Path(project_dir))
+
+
+@pytest.mark.parametrize('repo_dir, context', REPOS)
+def test_generate_files_to_memory(tmp_path, repo_dir, context) -> None:
+    """A project kept in memory should match one written to a directory."""
+    expected = generate_to_directory(tmp_path, repo_dir, context)
+    output_dir = tmp_path.joinpath('memory')
+    memory_sink = sink.MemorySink()
+
+    project_dir = generate.generate_files(
+        repo_dir=repo_dir,
+        context={'cookiecutter': context},
+        output_dir=output_dir,
+        sink=memory_sink,
+    )
+
+    assert not output_dir.exists()
+    project_name = os.path.basename(project_dir)
+    assert {
+        name.removeprefix(f'{project_name}/'): (
+            memory_sink.files.get(name),
+            mode & 0o777,
+        )
+        for name, mode in memory_sink.modes.items()
+        if name != project_name
+    } == expected
+
+
+@pytest.mark.parametrize('repo_dir, context', REPOS)
+def test_generate_files_to_zip_stream(tmp_path, repo_dir, context) -> None:
+    """A project streamed out as a zipfile should match one written to disk."""
+    expected = generate_to_directory(tmp_path, repo_dir, context)
+    stream = UnseekableStream()
+
+    with sink.ZipSink(stream) as zip_sink:
+        project_dir = generate.generate_files(
+            repo_dir=repo_dir, context={'cookiecutter': context}, sink=zip_sink
+        )
+
+    with zipfile.ZipFile(io.BytesIO(stream.getvalue())) as zip_file:
+        zip_file.extractall(tmp_path.joinpath('zip'))  # noqa: S202
+        for info in zip_file.infolist():
+            # zipfile does not restore permission bits when extracting.
+            path = tmp_path.joinpath('zip', info.filename)
+            path.chmod((info.external_attr >> 16) & 0o777)
+    project_name = os.path.basename(project_dir)
+    assert read_tree(tmp_path.joinpath('zip', project_name)) == expected
+
+
+@pytest.mark.parametrize('repo_dir, context', REPOS)
+def test_generate_files_to_tar_stream(tmp_path, repo_dir, context) -> None:
+    """A project streamed out as a tar file should match one written to disk."""
+    expected = generate_to_directory(tmp_path, repo_dir, context)
+    stream = UnseekableStream()
+
+    with sink.TarSink(stream, 'w|xz') as tar_sink:
+        project_dir = generate.generate_files(
+            repo_dir=repo_dir, context={'cookiecutter': context}, sink=tar_sink
+        )
+
+    with tarfile.open(fileobj=io.BytesIO(stream.getvalue())) as tar_file:
+        tar_file.extractall(tmp_path.joinpath('tar'))  # noqa: S202
+    project_name = os.path.basename(project_dir)
+    assert read_tree(tmp_path.joinpath('tar', project_name)) == expected
+
+
+def test_cookiecutter_to_zip_file(tmp_path) -> None:
+    """The main entry point should write the project to the given sink."""
+    zip_path = tmp_path.joinpath('project.zip')
+    output_dir = tmp_path.joinpath('output')
+
+    with sink.ZipSink(zip_path) as zip_sink:
+        main.cookiecutter(
+            'tests/fake-repo-pre',
+            no_input=True,
+            output_dir=str(output_dir),
+            sink=zip_sink,
+        )
+
+    assert not output_dir.exists()
+    with zipfile.ZipFile(zip_path) as zip_file:
+        assert 'fake-project/README.rst' in zip_file.namelist()
+
+
+def test_generate_files_to_memory_failure(tmp_path) -> None:
+    """The project should be removed from the sink if generating it fails."""
+    memory_sink = sink.MemorySink()
+
+    with pytest.raises(UndefinedVariableInTemplate):
+        generate.generate_files(
+            repo_dir='tests/undefined-variable/file-content',
+            context={'cookiecutter': {'project_slug': 'testproject'}},
+            output_dir=tmp_path,
+            sink=memory_sink,
+        )
+
+    assert memory_sink.files == {}
+    assert memory_sink.modes == {}
+
+
+def generate_failing_project(output_sink: sink.OutputSink, output_dir: Path) -> None:
+    """Generate a project failing halfway through into `output_sink`."""
+    with pytest.raises(UndefinedVariableInTemplate):
+        generate.generate_files(
+            repo_dir='tests/undefined-variable/file-content',
+            context={'cookiecutter': {'project_slug': 'testproject'}},
+            output_dir=output_dir,
+            sink=output_sink,
+        )
+
+
+def test_zip_file_failure(tmp_path) -> None:
+    """A zipfile should not be put in place if generating the project fails."""
+    archives_dir = tmp_path.joinpath('archives')
+    archives_dir.mkdir()
+
+    with sink.ZipSink(archives_dir.joinpath('project.zip')) as zip_sink:
+        generate_failing_project(zip_sink, tmp_path.joinpath('output'))
+
+    assert list(archives_dir.iterdir()) == []
+
+
+def test_zip_stream_failure(tmp_path) -> None:
+    """A zipfile streamed out should be left unreadable if generating fails."""
+    stream = UnseekableStream()
+    zip_sink = sink.ZipSink(stream)
+
+    generate_failing_project(zip_sink, tmp_path)
+    zip_sink.close()
+
+    assert stream.getvalue()
+    with pytest.raises(zipfile.BadZipFile):
+        zipfile.ZipFile(io.BytesIO(stream.getvalue()))
+
+
+def test_tar_stream_failure(tmp_path) -> None:
+    """A compressed tar file streamed out should be cut off if generating fails."""
+    stream = UnseekableStream()
+
+    with pytest.raises(UndefinedVariableInTemplate), sink.TarSink(stream) as tar_sink:
+        generate.generate_files(
+            repo_dir='tests/undefined-variable/file-content',
+            context={'cookiecutter': {'project_slug': 'testproject'}},
+            output_dir=tmp_path,
+            sink=tar_sink,
+            keep_project_on_failure=True,
+        )
+
+    with (
+        pytest.raises((EOFError, tarfile.TarError)),
+        tarfile.open(fileobj=io.BytesIO(stream.getvalue())) as tar_file,
+    ):
+        tar_file.getmembers()
+
+
+def test_generate_files_to_memory_with_hooks(tmp_path) -> None:
+    """Hooks need the project on disk, they can only be turned off."""
+    with pytest.raises(InvalidModeException):
+        generate.generate_files(
+            repo_dir='tests/test-pyhooks',
+            context={'cookiecutter': {'pyhooks': 'pyhooks'}},
+            output_dir=tmp_path,
+            sink=sink.MemorySink(),
+        )
+
+    memory_sink = sink.MemorySink()
+    generate.generate_files(
+        repo_dir='tests/test-pyhooks',
+        context={'cookiecutter': {'pyhooks': 'pyhooks'}},
+        output_dir=tmp_path,
+        accept_hooks=False,
+        sink=memory_sink,
+    )
+    assert 'inputpyhooks/README.rst' in memory_sink.files
+
+
+def test_generate_files_to_memory_with_manifest(tmp_path) -> None:
+    """A manifest needs the project on disk."""
+    with pytest.raises(InvalidModeException):
+        generate.generate_files(
+            repo_dir='tests/fake-repo-pre',
+            context={'cookiecutter': {'repo_name': 'fake-project'}},
+            output_dir=tmp_path,
+            manifest=True,
+            sink=sink.MemorySink(),
+        )
+
+
+def test_entry_sink_outside_output_directory(tmp_path) -> None:
+    """Entries cannot be written outside of the output directory."""
+    memory_sink = sink.MemorySink()
+    memory_sink.begin(tmp_path.joinpath('output'))
+
+    with pytest.raises(ValueError, match='outside of the output directory'):
+        memory_sink.write(tmp_path.joinpath('escape.txt'), b'')
@@ -0,0 +1,203 @@
+"""Tests for rendering project templates straight from a zip file."""
+
+from __future__ import annotations
+
+import os
+import zipfile
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+import pytest
+from jinja2 import TemplateNotFound
+
+from cookiecutter import generate, main, sink, source, utils
+from cookiecutter import zipfile as cookiecutter_zipfile
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def make_zip(repo_dir: str, zip_path: Path) -> Path:
+    """Pack the repository `repo_dir` into a zip file with a `repo` directory."""
+    with zipfile.ZipFile(zip_path, 'w') as zip_file:
+        zip_file.write(repo_dir, 'repo')
+        for root, dirs, files in os.walk(repo_dir):
+            for name in sorted(dirs) + sorted(files):
+                path = os.path.join(root, name)
+                zip_file.write(path, f'repo/{os.path.relpath(path, repo_dir)}')
+    return zip_path
+
+
+def read_tree(path: Path) -> dict[str, tuple[bytes | None, int]]:
+    """Return the content and permission bits of everything in a tree."""
+    return {
+        str(p.relative_to(path)): (
+            p.read_bytes() if p.is_file() else None,
+            p.stat().st_mode & 0o777,
+        )
+        for p in sorted(path.rglob('*'))
+    }
+
+
+def test_unzip_leaves_template_in_archive(tmp_path) -> None:
+    """Only the files besides the project template should be unpacked."""
+    zip_path = make_zip('tests/fake-repo-pre', tmp_path.joinpath('repo.zip'))
+    with zipfile.ZipFile(zip_path, 'a') as zip_file:
+        zip_file.writestr('repo/hooks/post_gen_project.py', '')
+
+    repo_dir = cookiecutter_zipfile.unzip(
+        str(zip_path), is_url=False, render_from_archive=True
+    )
+
+    assert Path(repo_dir, 'cookiecutter.json').is_file()
+    assert Path(repo_dir, 'hooks', 'post_gen_project.py').is_file()
+    assert not any(Path(repo_dir, '{{cookiecutter.repo_name}}').iterdir())
+    zip_source = source.archive_source(repo_dir, '{{cookiecutter.repo_name}}')
+    assert zip_source is not None
+    with zip_source:
+        assert zip_source.template_dir == 'repo/{{cookiecutter.repo_name}}'
+
+
+@pytest.mark.parametrize(
+    'zip_name', ['protected-fake-repo-tmpl.zip', 'fake-repo-pre-prompt.zip']
+)
+def test_unzip_unpacks_in_full(tmp_path, zip_name) -> None:
+    """Protected zip files and templates with a pre_prompt hook are unpacked."""
+    zip_path = Path('tests/files', zip_name)
+    if zip_name == 'fake-repo-pre-prompt.zip':
+        zip_path = make_zip('tests/test-pyhooks', tmp_path.joinpath(zip_name))
+
+    repo_dir = cookiecutter_zipfile.unzip(
+        str(zip_path), is_url=False, password='sekrit', render_from_archive=True
+    )
+
+    assert not Path(repo_dir, source.ARCHIVE_REFERENCE_FILE).exists()
+
+
+@pytest.mark.parametrize(
+    'repo_dir, context',
+    [
+        (
+            'tests/test-generate-copy-without-render',
+            {
+                'repo_name': 'test_copy_without_render',
+                'render_test': 'I have been rendered!',
+                '_copy_without_render': [
+                    '*not-rendered',
+                    'rendered/not_rendered.yml',
+                    '*.txt',
+                    '{{cookiecutter.repo_name}}-rendered/README.md',
+                ],
+            },
+        ),
+        ('tests/test-generate-binaries', {'binary_test': 'binary_files'}),
+        ('tests/test-generate-files-permissions', {'permissions': 'permissions'}),
+    ],
+)
+def test_generate_files_from_archive(tmp_path, repo_dir, context) -> None:
+    """A project rendered from a zip file should match one rendered from disk."""
+    zip_path = make_zip(repo_dir, tmp_path.joinpath('repo.zip'))
+    unzipped_dir = cookiecutter_zipfile.unzip(
+        str(zip_path), is_url=False, render_from_archive=True
+    )
+
+    expected = generate.generate_files(
+        repo_dir=repo_dir,
+        context={'cookiecutter': context},
+        output_dir=tmp_path.joinpath('from-directory'),
+    )
+    project_dir = generate.generate_files(
+        repo_dir=unzipped_dir,
+        context={'cookiecutter': context},
+        output_dir=tmp_path.joinpath('from-archive'),
+    )
+
+    assert read_tree(Path(project_dir)) == read_tree(Path(expected))
+
+
+@pytest.mark.parametrize('template', ['include', 'extends', 'super'])
+def test_cookiecutter_renders_zip_file_without_unpacking(
+    mocker, tmp_path, template
+) -> None:
+    """A one-shot generation from a zip file should read the template from it."""
+    extractall = mocker.spy(zipfile.ZipFile, 'extractall')
+    zip_path = make_zip(f'tests/test-templates/{template}', tmp_path / 'repo.zip')
+
+    project_dir = main.cookiecutter(
+        str(zip_path),
+        no_input=True,
+        output_dir=str(tmp_path.joinpath('output')),
+        template_cache=False,
+    )
+
+    assert Path(project_dir, 'requirements.txt').read_text().split() == [
+        'pip',
+        'Click',
+        'pytest',
+    ]
+    members = extractall.call_args.kwargs['members']
+    assert 'repo/cookiecutter.json' in members
+    assert not any('{{' in member for member in members)
+
+
+@pytest.fixture
+def zip_source(tmp_path):
+    """Fixture. Source of the template of `tests/test-templates/include`."""
+    zip_path = make_zip('tests/test-templates/include', tmp_path / 'repo.zip')
+    with source.ZipSource(
+        zipfile.ZipFile(zip_path), 'repo/{{cookiecutter.project_slug}}'
+    ) as zip_source:
+        yield zip_source
+
+
+def test_zip_source_walk(zip_source) -> None:
+    """Walking a zip file should follow `os.walk` from the template directory."""
+    with utils.work_in('tests/test-templates/include/{{cookiecutter.project_slug}}'):
+        expected = list(os.walk('.'))
+
+    assert list(zip_source.walk()) == [
+        (root, sorted(dirs), sorted(files)) for root, dirs, files in expected
+    ]
+
+
+def test_zip_source_loader(zip_source) -> None:
+    """Templates should be found in the template and shared directories."""
+    loader = zip_source.loader()
+
+    assert loader.get_source(None, 'requirements.txt')[0].startswith('pip')
+    assert 'Click' in loader.get_source(None, 'click-requirements.jinja')[0]
+    with pytest.raises(TemplateNotFound):
+        loader.get_source(None, 'missing.txt')
+
+
+class WalkedSource(source.TemplateSource):
+    """A source only implementing the walk, counting how often it is walked."""
+
+    def __init__(self, template_dir: str) -> None:
+        self.template_dir = template_dir
+        self.walks = 0
+
+    def walk(self) -> Iterator[tuple[str, list[str], list[str]]]:
+        self.walks += 1
+        with utils.work_in(self.template_dir):
+            yield from os.walk('.')
+
+    def open(self, path: str) -> IO[bytes]:
+        return open(os.path.join(self.template_dir, path), 'rb')
+
+    def mode(self, path: str) -> int | None:
+        return os.stat(os.path.join(self.template_dir, path)).st_mode & 0o777
+
+
+def test_template_source_copy_tree_walks_once(tmp_path) -> None:
+    """Copying a tree should walk the template once, not once per directory."""
+    walked_source = WalkedSource('tests/test-generate-copy-without-render')
+    memory_sink = sink.MemorySink()
+    memory_sink.begin(tmp_path)
+
+    memory_sink.copy_tree(walked_source, '.', tmp_path.joinpath('copy'))
+
+    assert walked_source.walks == 1
+    assert 'copy/{{cookiecutter.repo_name}}/rendered/not_rendered.yml' in (
+        memory_sink.files
+    )
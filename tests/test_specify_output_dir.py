@@ -1,8 +1,11 @@
 """Tests for cookiecutter's output directory customization feature."""
 
+import os
+
 import pytest
 
-from cookiecutter import main
+from cookiecutter import hooks, main
+from cookiecutter.config import DEFAULT_CONFIG
 
 
 @pytest.fixture
@@ -59,6 +62,11 @@ def test_api_invocation(mocker, template, output_dir, context) -> None:
         output_dir=output_dir,
         accept_hooks=True,
         keep_project_on_failure=False,
+        jobs=1,
+        cache_dir=os.path.join(str(DEFAULT_CONFIG['cookiecutters_dir']), '.cache'),
+        manifest=False,
+        sink=None,
+        hook_limits=hooks.HookLimits(),
     )
 
 
@@ -76,4 +84,18 @@ def test_default_output_dir(mocker, template, context) -> None:
         output_dir='.',
         accept_hooks=True,
         keep_project_on_failure=False,
+        jobs=1,
+        cache_dir=os.path.join(str(DEFAULT_CONFIG['cookiecutters_dir']), '.cache'),
+        manifest=False,
+        sink=None,
+        hook_limits=hooks.HookLimits(),
     )
+
+
+def test_api_invocation_without_template_cache(mocker, template) -> None:
+    """Verify no cache directory is passed when the template cache is disabled."""
+    mock_gen_files = mocker.patch('cookiecutter.main.generate_files')
+
+    main.cookiecutter(template, template_cache=False)
+
+    assert mock_gen_files.call_args.kwargs['cache_dir'] is None
@@ -1,12 +1,16 @@
 """Tests for `cookiecutter.utils` module."""
 
+import os
+import shutil
 import stat
 import sys
+import threading
+import time
 from pathlib import Path
 
 import pytest
 
-from cookiecutter import utils
+from cookiecutter import generate, utils
 
 
 def make_readonly(path) -> None:
@@ -109,3 +113,244 @@ def test_create_tmp_repo_dir(tmp_path) -> None:
 
     assert new_repo_dir.exists()
     assert new_repo_dir.glob('*')
+
+
+def test_create_tmp_repo_dir_leaves_out_vcs_metadata(tmp_path) -> None:
+    """Verify the copy of a repository leaves its version control data out."""
+    repo_dir = tmp_path / 'repo'
+    repo_dir.joinpath('.git', 'objects').mkdir(parents=True)
+    repo_dir.joinpath('{{cookiecutter.slug}}', '.git').mkdir(parents=True)
+    repo_dir.joinpath('cookiecutter.json').write_text('{}')
+
+    new_repo_dir = utils.create_tmp_repo_dir(repo_dir)
+
+    assert sorted(p.name for p in new_repo_dir.iterdir()) == [
+        'cookiecutter.json',
+        '{{cookiecutter.slug}}',
+    ]
+    assert new_repo_dir.joinpath('{{cookiecutter.slug}}', '.git').is_dir()
+
+
+def fake_reflink(src, dst) -> bool:
+    """Stand in for a successful reflink on any filesystem."""
+    shutil.copyfile(src, dst)
+    return True
+
+
+@pytest.mark.parametrize('reflink', [fake_reflink, lambda _src, _dst: False])
+def test_create_tmp_repo_dir_reflinks_files(mocker, tmp_path, reflink) -> None:
+    """Verify the copy of a repository clones its files where possible."""
+    reflink_mock = mocker.patch('cookiecutter.utils._reflink', side_effect=reflink)
+    repo_dir = tmp_path / 'repo'
+    repo_dir.mkdir()
+    repo_dir.joinpath('cookiecutter.json').write_text('{}')
+    repo_dir.joinpath('cookiecutter.json').chmod(0o600)
+
+    new_repo_dir = utils.create_tmp_repo_dir(repo_dir)
+
+    new_file = new_repo_dir / 'cookiecutter.json'
+    reflink_mock.assert_called_once_with(
+        str(repo_dir / 'cookiecutter.json'), str(new_file)
+    )
+    assert new_file.read_text() == '{}'
+    assert new_file.stat().st_mode & 0o777 == 0o600
+
+
+def test_create_env_with_context_shares_environment() -> None:
+    """Verify contexts with the same Jinja settings share one environment."""
+    utils.clear_env_cache()
+    first = utils.create_env_with_context({'cookiecutter': {'project': 'a'}})
+    second = utils.create_env_with_context({'cookiecutter': {'project': 'b'}})
+
+    assert first is second
+
+
+def test_create_env_with_context_keys_on_jinja_settings() -> None:
+    """Verify different extensions or env vars get their own environment."""
+    utils.clear_env_cache()
+    default_env = utils.create_env_with_context({'cookiecutter': {}})
+    custom_env = utils.create_env_with_context(
+        {'cookiecutter': {'_jinja2_env_vars': {'lstrip_blocks': True}}}
+    )
+    extension_env = utils.create_env_with_context(
+        {'cookiecutter': {'_extensions': ['jinja2.ext.i18n']}}
+    )
+
+    assert default_env is not custom_env
+    assert default_env is not extension_env
+    assert custom_env.lstrip_blocks is True
+    assert 'jinja2.ext.InternationalizationExtension' in extension_env.extensions
+
+
+def test_generate_files_does_not_leak_loader(tmp_path) -> None:
+    """Verify the template loader set while generating stays off the shared env."""
+    context = {'cookiecutter': {'food': 'pizzä'}}
+    utils.clear_env_cache()
+    env = utils.create_env_with_context(context)
+
+    generate.generate_files(
+        context=context, repo_dir='tests/test-generate-files', output_dir=tmp_path
+    )
+
+    assert utils.create_env_with_context(context) is env
+    assert env.loader is None
+
+
+def test_copy_file(tmp_path) -> None:
+    """Verify `copy_file` copies the contents and the permission bits."""
+    src = tmp_path.joinpath('src.bin')
+    src.write_bytes(b'\x00\x01data')
+    src.chmod(0o755)
+    dst = tmp_path.joinpath('dst.bin')
+
+    utils.copy_file(src, dst)
+
+    assert dst.read_bytes() == b'\x00\x01data'
+    assert stat.S_IMODE(dst.stat().st_mode) == 0o755
+
+
+def test_copy_file_skips_identical_destination(mocker, tmp_path) -> None:
+    """Verify `copy_file` does not write a destination with the same content."""
+    src = tmp_path.joinpath('src.bin')
+    src.write_bytes(b'\x00\x01data')
+    dst = tmp_path.joinpath('dst.bin')
+    dst.write_bytes(b'\x00\x01data')
+    os.utime(dst, ns=(1_000_000_000, 1_000_000_000))
+    copyfile = mocker.spy(shutil, 'copyfile')
+
+    assert utils.copy_file(src, dst) is False
+
+    copyfile.assert_not_called()
+    assert dst.stat().st_mtime_ns == 1_000_000_000
+
+
+def test_write_if_changed(tmp_path) -> None:
+    """Verify `write_if_changed` only writes files with different content."""
+    path = tmp_path.joinpath('file.txt')
+
+    assert utils.write_if_changed(path, b'content') is True
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    assert utils.write_if_changed(path, b'content') is False
+    assert path.stat().st_mtime_ns == 1_000_000_000
+
+    assert utils.write_if_changed(path, b'contents') is True
+    assert utils.write_if_changed(path, b'CONTENTS') is True
+    assert path.read_bytes() == b'CONTENTS'
+
+
+def test_copy_file_falls_back_without_reflink(mocker, tmp_path) -> None:
+    """Verify `copy_file` falls back to a regular copy if reflinks fail."""
+    mocker.patch('cookiecutter.utils._reflink', return_value=False)
+    copyfile = mocker.spy(shutil, 'copyfile')
+    src = tmp_path.joinpath('src.txt')
+    src.write_text('content')
+    dst = tmp_path.joinpath('dst.txt')
+    dst.write_text('old content that is longer')
+
+    utils.copy_file(src, dst)
+
+    copyfile.assert_called_once_with(src, dst)
+    assert dst.read_text() == 'content'
+
+
+def test_copy_file_with_unsupported_reflink(mocker, tmp_path) -> None:
+    """Verify a filesystem without reflink support still gets a copy."""
+    fcntl = pytest.importorskip('fcntl')
+    mocker.patch('cookiecutter.utils.sys.platform', 'linux')
+    ioctl = mocker.patch.object(
+        fcntl, 'ioctl', side_effect=OSError(95, 'Operation not supported')
+    )
+    src = tmp_path.joinpath('src.txt')
+    src.write_text('content')
+    dst = tmp_path.joinpath('dst.txt')
+
+    utils.copy_file(src, dst)
+
+    ioctl.assert_called_once()
+    assert dst.read_text() == 'content'
+
+
+def test_sync_tree_copies_tree(tmp_path) -> None:
+    """Verify `sync_tree` copies a whole tree into a new directory."""
+    src = tmp_path.joinpath('src')
+    src.joinpath('nested').mkdir(parents=True)
+    src.joinpath('top.txt').write_text('top')
+    src.joinpath('nested', 'inner.txt').write_text('inner')
+
+    utils.sync_tree(src, tmp_path.joinpath('dst'))
+
+    assert tmp_path.joinpath('dst', 'top.txt').read_text() == 'top'
+    assert tmp_path.joinpath('dst', 'nested', 'inner.txt').read_text() == 'inner'
+
+
+def test_sync_tree_only_copies_changed_files(mocker, tmp_path) -> None:
+    """Verify unchanged files are left alone and stale ones removed."""
+    src = tmp_path.joinpath('src')
+    src.mkdir()
+    src.joinpath('same.txt').write_text('same')
+    src.joinpath('changed.txt').write_text('before')
+    dst = tmp_path.joinpath('dst')
+    utils.sync_tree(src, dst)
+    dst.joinpath('stale.txt').write_text('stale')
+    dst.joinpath('stale-dir').mkdir()
+    src.joinpath('changed.txt').write_text('after, longer')
+    copy_file = mocker.spy(utils, 'copy_file')
+
+    utils.sync_tree(src, dst)
+
+    copy_file.assert_called_once_with(
+        str(src.joinpath('changed.txt')), str(dst.joinpath('changed.txt'))
+    )
+    assert dst.joinpath('changed.txt').read_text() == 'after, longer'
+    assert sorted(p.name for p in dst.iterdir()) == ['changed.txt', 'same.txt']
+
+
+def test_file_lock_uncontended(tmp_path) -> None:
+    """Verify a free lock is taken without waiting."""
+    pytest.importorskip('fcntl')
+    lock_path = tmp_path.joinpath('locks', 'entry.lock')
+
+    with utils.file_lock(lock_path) as waited:
+        assert not waited
+        assert lock_path.is_file()
+
+
+def test_file_lock_waits_for_holder(tmp_path) -> None:
+    """Verify a held lock is waited for, and reported as such."""
+    pytest.importorskip('fcntl')
+    lock_path = tmp_path.joinpath('entry.lock')
+    events = []
+    holding = threading.Event()
+
+    def hold() -> None:
+        with utils.file_lock(lock_path):
+            holding.set()
+            time.sleep(0.2)
+            events.append('released')
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    holding.wait()
+    with utils.file_lock(lock_path) as waited:
+        events.append('acquired')
+    holder.join()
+
+    assert waited
+    assert events == ['released', 'acquired']
+
+
+def test_file_lock_shared(tmp_path) -> None:
+    """Verify shared locks only exclude exclusive ones."""
+    pytest.importorskip('fcntl')
+    lock_path = tmp_path.joinpath('entry.lock')
+
+    with (
+        utils.file_lock(lock_path, shared=True),
+        utils.file_lock(lock_path, shared=True, blocking=False) as waited,
+    ):
+        assert not waited
+        with pytest.raises(BlockingIOError), utils.file_lock(lock_path, blocking=False):
+            pass
+
+    with utils.file_lock(lock_path, blocking=False) as waited:
+        assert not waited
@@ -0,0 +1,62 @@
+"""pytest fixtures for cloning local git repositories."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from shutil import which
+
+import pytest
+
+GIT = which('git') or 'git'
+
+
+class GitRepo:
+    """A bare git repo to clone from, with a working copy to commit with."""
+
+    def __init__(self, tmp_path: Path) -> None:
+        """Create the repo with three commits, a `v1` tag and a `stable` branch."""
+        self.work_dir = tmp_path.joinpath('work')
+        self.work_dir.mkdir()
+        self.bare_dir = tmp_path.joinpath('template.git')
+        self.url = self.bare_dir.as_uri()
+        self.shas: list[str] = []
+
+        self.git('init', '--quiet', '--initial-branch', 'main')
+        self.commit('1')
+        self.git('tag', 'v1')
+        self.git('branch', 'stable')
+        self.commit('2')
+        self.commit('3')
+        self.git('clone', '--quiet', '--bare', str(self.work_dir), str(self.bare_dir))
+        self.git('remote', 'add', 'origin', self.url)
+
+    def git(self, *args: str, cwd: Path | str | None = None) -> str:
+        """Run a git command, in the working copy by default."""
+        return subprocess.check_output(
+            [GIT, *args], cwd=cwd or self.work_dir, text=True
+        ).strip()
+
+    def commit(self, version: str) -> str:
+        """Commit a new VERSION file and return the SHA of the commit."""
+        self.work_dir.joinpath('VERSION').write_text(version)
+        self.git('add', 'VERSION')
+        self.git('commit', '--quiet', '-m', f'Version {version}')
+        sha = self.git('rev-parse', 'HEAD')
+        self.shas.append(sha)
+        return sha
+
+    def push(self) -> None:
+        """Push the commits of the working copy to the bare repo."""
+        self.git('push', '--quiet', 'origin', 'main')
+
+
+@pytest.fixture
+def git_repo(tmp_path, monkeypatch) -> GitRepo:
+    """Fixture. Create a local bare git repo to clone through a file:// URL."""
+    if which('git') is None:
+        pytest.skip('git is not installed')
+    for name in ('AUTHOR', 'COMMITTER'):
+        monkeypatch.setenv(f'GIT_{name}_NAME', 'Cookiecutter')
+        monkeypatch.setenv(f'GIT_{name}_EMAIL', 'cookiecutter@example.com')
+    return GitRepo(tmp_path)
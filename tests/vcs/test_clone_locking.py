@@ -0,0 +1,76 @@
+"""Stress tests for populating the template cache from many processes."""
+
+import multiprocessing
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from cookiecutter import repository
+
+PROCESSES = 8
+
+
+@pytest.fixture
+def template_repo(git_repo):
+    """Fixture. Turn the git repo into a template with a cookiecutter.json."""
+    git_repo.work_dir.joinpath('cookiecutter.json').write_text('{"name": "x"}')
+    git_repo.git('add', 'cookiecutter.json')
+    git_repo.git('commit', '--quiet', '-m', 'Add cookiecutter.json')
+    git_repo.push()
+    return git_repo
+
+
+@pytest.mark.parametrize('content_addressed', [False, True])
+def test_concurrent_processes_clone_once(
+    mocker, template_repo, clone_dir, tmp_path, content_addressed
+) -> None:
+    """Verify processes racing for one template clone it once and share it."""
+    pytest.importorskip('fcntl')
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        pytest.skip('needs the fork start method')
+
+    clones_log = tmp_path.joinpath('clones.log')
+    check_output = subprocess.check_output
+
+    def slow_clone(command, **kwargs):
+        if command[1] == 'clone':
+            # Give every process time to start waiting for the lock.
+            with clones_log.open('a') as fh:
+                fh.write('clone\n')
+            time.sleep(0.5)
+        return check_output(command, **kwargs)
+
+    mocker.patch('cookiecutter.vcs.subprocess.check_output', side_effect=slow_clone)
+
+    context = multiprocessing.get_context('fork')
+    barrier = context.Barrier(PROCESSES)
+    results = context.Queue()
+
+    def generate() -> None:
+        barrier.wait()
+        try:
+            repo_dir, _cleanup = repository.determine_repo_dir(
+                f'git+{template_repo.url}',
+                abbreviations={},
+                clone_to_dir=clone_dir,
+                checkout=None,
+                no_input=True,
+                content_addressed=content_addressed,
+            )
+        except Exception as error:
+            results.put(f'error: {error!r}')
+        else:
+            results.put(repo_dir)
+
+    processes = [context.Process(target=generate) for _ in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    repo_dirs = {results.get(timeout=60) for _ in processes}
+    for process in processes:
+        process.join(timeout=60)
+
+    (repo_dir,) = repo_dirs
+    assert Path(repo_dir, 'cookiecutter.json').is_file()
+    assert clones_log.read_text() == 'clone\n'
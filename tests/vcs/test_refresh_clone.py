@@ -0,0 +1,158 @@
+"""Tests for updating cached clones in place."""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from cookiecutter import vcs
+
+
+def clone(git_repo, clone_dir: Path, checkout: str | None = None, **kwargs) -> Path:
+    """Clone the repo, or refresh the existing clone of it."""
+    return Path(
+        vcs.clone(
+            f'git+{git_repo.url}',
+            checkout=checkout,
+            clone_to_dir=clone_dir,
+            no_input=True,
+            **kwargs,
+        )
+    )
+
+
+@pytest.fixture
+def cached_clone(git_repo, clone_dir) -> Path:
+    """Fixture. Clone the repo once, leaving a marker file in the clone."""
+    repo_dir = clone(git_repo, clone_dir)
+    repo_dir.joinpath('marker').write_text('cached')
+    return repo_dir
+
+
+@pytest.fixture
+def prompt_and_delete(mocker):
+    """Fixture. Spy on the deletion of cached clones."""
+    return mocker.patch('cookiecutter.vcs.prompt_and_delete', return_value=False)
+
+
+def test_clone_writes_refresh_stamp(cached_clone) -> None:
+    """Verify a fresh clone is marked as just updated."""
+    assert cached_clone.joinpath('.git', vcs.REFRESH_STAMP).is_file()
+
+
+@pytest.mark.usefixtures('prompt_and_delete')
+def test_refresh_always_fetches_new_commits(git_repo, clone_dir, cached_clone) -> None:
+    """Verify the cached clone is updated to the latest commit in place."""
+    git_repo.commit('4')
+    git_repo.push()
+
+    repo_dir = clone(git_repo, clone_dir, refresh='always')
+
+    assert repo_dir == cached_clone
+    assert repo_dir.joinpath('VERSION').read_text() == '4'
+    assert repo_dir.joinpath('marker').read_text() == 'cached'
+
+
+def test_refresh_discards_local_changes(git_repo, clone_dir, cached_clone) -> None:
+    """Verify edits to tracked files of the cached clone are reset."""
+    cached_clone.joinpath('VERSION').write_text('edited')
+
+    clone(git_repo, clone_dir, refresh='always')
+
+    assert cached_clone.joinpath('VERSION').read_text() == '3'
+
+
+@pytest.mark.parametrize('checkout', ['v1', 'stable'])
+def test_refresh_tag_or_branch(git_repo, clone_dir, cached_clone, checkout) -> None:
+    """Verify the cached clone is reset to the requested tag or branch."""
+    clone(git_repo, clone_dir, checkout, refresh='always')
+
+    assert cached_clone.joinpath('VERSION').read_text() == '1'
+
+
+def test_refresh_keeps_local_branches(git_repo, clone_dir, cached_clone) -> None:
+    """Verify checking out another branch leaves the local branch where it was."""
+    clone(git_repo, clone_dir, 'stable', refresh='always')
+
+    assert git_repo.git('rev-parse', 'main', cwd=cached_clone) == git_repo.shas[2]
+
+    clone(git_repo, clone_dir, 'main', refresh='never')
+
+    assert cached_clone.joinpath('VERSION').read_text() == '3'
+
+
+def test_refresh_branch_named_like_sha(git_repo, clone_dir, cached_clone) -> None:
+    """Verify a branch named like an abbreviated SHA is fetched as a branch."""
+    git_repo.git('branch', 'cafe123', git_repo.shas[1])
+    git_repo.git('push', '--quiet', 'origin', 'cafe123')
+
+    clone(git_repo, clone_dir, 'cafe123', refresh='always')
+
+    assert cached_clone.joinpath('VERSION').read_text() == '2'
+    assert cached_clone.joinpath('marker').read_text() == 'cached'
+
+
+@pytest.mark.parametrize('length', [40, 10])
+def test_refresh_commit_sha(git_repo, clone_dir, length) -> None:
+    """Verify a shallow cached clone is reset to full and abbreviated SHAs."""
+    repo_dir = clone(git_repo, clone_dir, shallow=True)
+
+    clone(git_repo, clone_dir, git_repo.shas[1][:length], refresh='always')
+
+    assert repo_dir.joinpath('VERSION').read_text() == '2'
+
+
+def test_refresh_if_stale(git_repo, clone_dir, cached_clone) -> None:
+    """Verify the cached clone is only fetched once it is older than the TTL."""
+    git_repo.commit('4')
+    git_repo.push()
+
+    clone(git_repo, clone_dir, refresh='if-stale', refresh_ttl=3600)
+    assert cached_clone.joinpath('VERSION').read_text() == '3'
+
+    stamp = cached_clone.joinpath('.git', vcs.REFRESH_STAMP)
+    os.utime(stamp, (0, 0))
+    clone(git_repo, clone_dir, refresh='if-stale', refresh_ttl=3600)
+    assert cached_clone.joinpath('VERSION').read_text() == '4'
+    assert stamp.stat().st_mtime > 0
+
+
+def test_refresh_never_stays_offline(mocker, git_repo, clone_dir, cached_clone) -> None:
+    """Verify a checkout is resolved from the cached clone without fetching."""
+    check_output = mocker.spy(subprocess, 'check_output')
+
+    clone(git_repo, clone_dir, 'v1', refresh='never')
+
+    assert cached_clone.joinpath('VERSION').read_text() == '1'
+    assert all(call.args[0][1] != 'fetch' for call in check_output.call_args_list)
+
+
+def test_refresh_failure_clones_again(
+    mocker, git_repo, clone_dir, cached_clone, prompt_and_delete
+) -> None:
+    """Verify a clone that cannot be updated falls back to deleting it."""
+    check_output = subprocess.check_output
+
+    def refuse_fetch(command, **kwargs):
+        if command[1] == 'fetch':
+            raise subprocess.CalledProcessError(128, command, output=b'offline')
+        return check_output(command, **kwargs)
+
+    mocker.patch('cookiecutter.vcs.subprocess.check_output', side_effect=refuse_fetch)
+
+    clone(git_repo, clone_dir, refresh='always')
+
+    prompt_and_delete.assert_called_once_with(str(cached_clone), no_input=True)
+
+
+def test_refresh_ignores_directories_that_are_not_clones(
+    git_repo, clone_dir, prompt_and_delete
+) -> None:
+    """Verify a plain directory in place of the clone is never updated."""
+    repo_dir = clone_dir.joinpath('template')
+    repo_dir.mkdir()
+
+    clone(git_repo, clone_dir, refresh='always')
+
+    prompt_and_delete.assert_called_once_with(str(repo_dir), no_input=True)
@@ -0,0 +1,78 @@
+"""Tests for shallow and partial clones of local git repositories."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from cookiecutter import exceptions, vcs
+
+
+def clone_and_describe(
+    git_repo, clone_dir: Path, checkout: str | None = None
+) -> tuple[str, int]:
+    """Shallow clone the repo and return its VERSION and commit count."""
+    repo_dir = Path(
+        vcs.clone(
+            f'git+{git_repo.url}',
+            checkout=checkout,
+            clone_to_dir=clone_dir,
+            no_input=True,
+            shallow=True,
+        )
+    )
+    commits = int(git_repo.git('rev-list', '--count', 'HEAD', cwd=repo_dir))
+    return repo_dir.joinpath('VERSION').read_text(), commits
+
+
+def test_shallow_clone_default_branch(git_repo, clone_dir) -> None:
+    """Verify only the latest commit of the default branch is downloaded."""
+    assert clone_and_describe(git_repo, clone_dir) == ('3', 1)
+    assert clone_dir.joinpath('template').is_dir()
+
+
+@pytest.mark.parametrize('checkout', ['v1', 'stable'])
+def test_shallow_clone_tag_or_branch(git_repo, clone_dir, checkout) -> None:
+    """Verify tags and branches are cloned without their history."""
+    assert clone_and_describe(git_repo, clone_dir, checkout) == ('1', 1)
+
+
+def test_shallow_clone_full_commit_sha(git_repo, clone_dir) -> None:
+    """Verify a full commit SHA is fetched on its own."""
+    assert clone_and_describe(git_repo, clone_dir, git_repo.shas[1]) == ('2', 1)
+
+
+def test_shallow_clone_refused_commit_sha(mocker, git_repo, clone_dir) -> None:
+    """Verify a commit the server refuses to fetch falls back to a partial clone."""
+    check_output = subprocess.check_output
+
+    def refuse_fetch(command, **kwargs):
+        if command[1] == 'fetch':
+            raise subprocess.CalledProcessError(128, command, output=b'not our ref')
+        return check_output(command, **kwargs)
+
+    mocker.patch('cookiecutter.vcs.subprocess.check_output', side_effect=refuse_fetch)
+
+    version, _commits = clone_and_describe(git_repo, clone_dir, git_repo.shas[1])
+    assert version == '2'
+
+
+def test_shallow_clone_abbreviated_commit_sha(git_repo, clone_dir) -> None:
+    """Verify an abbreviated commit SHA is checked out from a partial clone."""
+    checkout = git_repo.shas[0][:10]
+
+    assert clone_and_describe(git_repo, clone_dir, checkout) == ('1', 1)
+
+
+def test_shallow_clone_branch_named_like_sha(git_repo, clone_dir) -> None:
+    """Verify a branch named like an abbreviated SHA is cloned as a branch."""
+    git_repo.git('branch', 'cafe123', git_repo.shas[1])
+    git_repo.git('push', '--quiet', 'origin', 'cafe123')
+
+    assert clone_and_describe(git_repo, clone_dir, 'cafe123') == ('2', 1)
+
+
+def test_shallow_clone_unknown_branch(git_repo, clone_dir) -> None:
+    """Verify a missing branch raises `RepositoryCloneFailed`."""
+    with pytest.raises(exceptions.RepositoryCloneFailed):
+        clone_and_describe(git_repo, clone_dir, 'unknown_branch')
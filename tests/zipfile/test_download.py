@@ -0,0 +1,208 @@
+"""Tests for conditional and resumable downloads of zip templates."""
+
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+import requests
+
+from cookiecutter import zipfile
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+PAYLOAD = Path('tests/files/fake-repo-tmpl.zip').read_bytes()
+
+
+class ZipServer(ThreadingHTTPServer):
+    """Local stand-in for a server hosting a zip template."""
+
+    def __init__(self) -> None:
+        """Serve `PAYLOAD` on a free port of localhost."""
+        super().__init__(('127.0.0.1', 0), ZipHandler)
+        self.payload = PAYLOAD
+        self.etag: str | None = '"v1"'
+        self.last_modified: str | None = 'Mon, 05 Oct 2026 10:00:00 GMT'
+        self.truncate = False
+        self.requests: list[dict[str, str]] = []
+
+    @property
+    def url(self) -> str:
+        """URL of the zip file."""
+        return f'http://127.0.0.1:{self.server_address[1]}/fake-repo-tmpl.zip'
+
+
+class ZipHandler(BaseHTTPRequestHandler):
+    """Answer with the zip of the server, honouring validators and ranges."""
+
+    server: ZipServer
+
+    def do_GET(self) -> None:
+        """Send the zip file, a part of it, or that it did not change."""
+        server = self.server
+        server.requests.append(dict(self.headers))
+        validator = server.etag or server.last_modified
+        if validator is not None and validator in (
+            self.headers.get('If-None-Match'),
+            self.headers.get('If-Modified-Since'),
+        ):
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start = 0
+        byte_range = self.headers.get('Range', '')
+        if byte_range.startswith('bytes=') and self.headers.get('If-Range') in (
+            server.etag,
+            server.last_modified,
+        ):
+            start = int(byte_range.removeprefix('bytes=').rstrip('-'))
+            self.send_response(206)
+            self.send_header(
+                'Content-Range',
+                f'bytes {start}-{len(server.payload) - 1}/{len(server.payload)}',
+            )
+        else:
+            self.send_response(200)
+        body = server.payload[start:]
+        self.send_header('Content-Length', str(len(body)))
+        if server.etag:
+            self.send_header('ETag', server.etag)
+        if server.last_modified:
+            self.send_header('Last-Modified', server.last_modified)
+        self.end_headers()
+        if server.truncate:
+            # Drop the connection halfway, like a network failure would.
+            body = body[: len(body) // 2]
+            self.close_connection = True
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        """Keep the test output clean."""
+
+
+@pytest.fixture
+def zip_server() -> Iterator[ZipServer]:
+    """Fixture. Run a local HTTP server hosting a zip template."""
+    server = ZipServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def prompt_and_delete(mocker):
+    """Fixture. Spy on the prompt to download a cached zip file again."""
+    return mocker.patch(
+        'cookiecutter.zipfile.prompt_and_delete', return_value=True, autospec=True
+    )
+
+
+def test_unzip_downloads_through_session(zip_server, clone_dir) -> None:
+    """Verify a zip template is downloaded and unpacked."""
+    output_dir = zipfile.unzip(zip_server.url, is_url=True, clone_to_dir=clone_dir)
+
+    assert Path(output_dir, 'cookiecutter.json').is_file()
+    assert clone_dir.joinpath('fake-repo-tmpl.zip').read_bytes() == PAYLOAD
+    assert not clone_dir.joinpath('fake-repo-tmpl.zip.part').exists()
+
+
+@pytest.mark.parametrize(
+    'etag, last_modified, header',
+    [
+        ('"v1"', None, 'If-None-Match'),
+        (None, 'Mon, 05 Oct 2026 10:00:00 GMT', 'If-Modified-Since'),
+    ],
+)
+def test_download_revalidates_unchanged_file(
+    zip_server, clone_dir, prompt_and_delete, etag, last_modified, header
+) -> None:
+    """Verify an unchanged zip file is neither prompted for nor downloaded."""
+    zip_server.etag = etag
+    zip_server.last_modified = last_modified
+    zip_path = str(clone_dir.joinpath('fake-repo-tmpl.zip'))
+    zipfile.download(zip_server.url, zip_path)
+
+    zipfile.download(zip_server.url, zip_path)
+
+    assert zip_server.requests[-1][header] == (etag or last_modified)
+    assert not prompt_and_delete.called
+    assert Path(zip_path).read_bytes() == PAYLOAD
+
+
+def test_download_changed_file(zip_server, clone_dir, prompt_and_delete) -> None:
+    """Verify a zip file changed on the server is downloaded again."""
+    zip_path = str(clone_dir.joinpath('fake-repo-tmpl.zip'))
+    zipfile.download(zip_server.url, zip_path)
+    zip_server.payload = PAYLOAD[::-1]
+    zip_server.etag = '"v2"'
+
+    zipfile.download(zip_server.url, zip_path, no_input=True)
+
+    prompt_and_delete.assert_called_once_with(zip_path, no_input=True)
+    assert Path(zip_path).read_bytes() == PAYLOAD[::-1]
+
+
+def test_download_without_validators_prompts(
+    zip_server, clone_dir, prompt_and_delete
+) -> None:
+    """Verify a zip file that cannot be revalidated is prompted for."""
+    zip_server.etag = zip_server.last_modified = None
+    zip_path = str(clone_dir.joinpath('fake-repo-tmpl.zip'))
+    zipfile.download(zip_server.url, zip_path)
+
+    zipfile.download(zip_server.url, zip_path)
+
+    assert prompt_and_delete.call_count == 1
+    assert 'If-None-Match' not in zip_server.requests[-1]
+
+
+def test_download_resumes_interrupted_download(zip_server, clone_dir) -> None:
+    """Verify an interrupted download continues where it stopped."""
+    zip_path = str(clone_dir.joinpath('fake-repo-tmpl.zip'))
+    zip_server.truncate = True
+    with pytest.raises(requests.RequestException):
+        zipfile.download(zip_server.url, zip_path, chunk_size=128)
+    downloaded = Path(f'{zip_path}.part').stat().st_size
+    assert 0 < downloaded < len(PAYLOAD)
+
+    zip_server.truncate = False
+    zipfile.download(zip_server.url, zip_path)
+
+    assert zip_server.requests[-1]['Range'] == f'bytes={downloaded}-'
+    assert zip_server.requests[-1]['If-Range'] == '"v1"'
+    assert Path(zip_path).read_bytes() == PAYLOAD
+
+
+def test_download_restarts_if_file_changed(zip_server, clone_dir) -> None:
+    """Verify a partial download of an older version is started over."""
+    zip_path = str(clone_dir.joinpath('fake-repo-tmpl.zip'))
+    zip_server.truncate = True
+    with pytest.raises(requests.RequestException):
+        zipfile.download(zip_server.url, zip_path, chunk_size=128)
+
+    zip_server.truncate = False
+    zip_server.etag = '"v2"'
+    zip_server.payload = PAYLOAD[::-1]
+    zipfile.download(zip_server.url, zip_path)
+
+    assert Path(zip_path).read_bytes() == PAYLOAD[::-1]
+
+
+def test_download_chunk_size(mocker, zip_server, clone_dir) -> None:
+    """Verify the response is read in chunks of the configured size."""
+    iter_content = mocker.spy(requests.Response, 'iter_content')
+    zip_path = str(clone_dir.joinpath('fake-repo-tmpl.zip'))
+
+    zipfile.download(zip_server.url, zip_path, chunk_size=128)
+
+    iter_content.assert_called_once_with(mocker.ANY, chunk_size=128)
+    assert Path(zip_path).read_bytes() == PAYLOAD
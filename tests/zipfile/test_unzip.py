@@ -2,16 +2,25 @@
 
 from __future__ import annotations
 
+import contextlib
 import shutil
 import tempfile
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING
+from zipfile import ZipFile
 
 import pytest
 
 from cookiecutter import zipfile
+from cookiecutter.cache import prune_cache
 from cookiecutter.exceptions import InvalidZipRepository
 
+if TYPE_CHECKING:
+    from unittest.mock import MagicMock
+
+    from pytest_mock import MockerFixture
+
 
 def mock_download() -> Iterator[bytes]:
     """Fake download function."""
@@ -32,6 +41,18 @@ def mock_download_with_empty_chunks() -> Iterator[None | bytes]:
             chunk = zf.read(1024)
 
 
+def mock_session_get(
+    mocker: MockerFixture, content: Iterable[bytes | None] = ()
+) -> MagicMock:
+    """Make the shared HTTP session answer with `content`, returning its `get`."""
+    response = mocker.MagicMock(status_code=200, headers={})
+    response.iter_content.return_value = content
+    get_session = mocker.patch('cookiecutter.zipfile.get_session', autospec=True)
+    session_get: MagicMock = get_session.return_value.get
+    session_get.return_value = response
+    return session_get
+
+
 def test_unzip_local_file(mocker, clone_dir) -> None:
     """Local file reference can be unzipped."""
     mock_prompt_and_delete = mocker.patch(
@@ -171,14 +192,7 @@ def test_unzip_url(mocker, clone_dir) -> None:
         'cookiecutter.zipfile.prompt_and_delete', return_value=True, autospec=True
     )
 
-    request = mocker.MagicMock()
-    request.iter_content.return_value = mock_download()
-
-    mocker.patch(
-        'cookiecutter.zipfile.requests.get',
-        return_value=request,
-        autospec=True,
-    )
+    mock_session_get(mocker, mock_download())
 
     output_dir = zipfile.unzip(
         'https://example.com/path/to/fake-repo-tmpl.zip',
@@ -196,14 +210,7 @@ def test_unzip_url_with_empty_chunks(mocker, clone_dir) -> None:
         'cookiecutter.zipfile.prompt_and_delete', return_value=True, autospec=True
     )
 
-    request = mocker.MagicMock()
-    request.iter_content.return_value = mock_download_with_empty_chunks()
-
-    mocker.patch(
-        'cookiecutter.zipfile.requests.get',
-        return_value=request,
-        autospec=True,
-    )
+    mock_session_get(mocker, mock_download_with_empty_chunks())
 
     output_dir = zipfile.unzip(
         'https://example.com/path/to/fake-repo-tmpl.zip',
@@ -221,14 +228,7 @@ def test_unzip_url_existing_cache(mocker, clone_dir) -> None:
         'cookiecutter.zipfile.prompt_and_delete', return_value=True, autospec=True
     )
 
-    request = mocker.MagicMock()
-    request.iter_content.return_value = mock_download()
-
-    mocker.patch(
-        'cookiecutter.zipfile.requests.get',
-        return_value=request,
-        autospec=True,
-    )
+    mock_session_get(mocker, mock_download())
 
     # Create an existing cache of the zipfile
     existing_zip = clone_dir.joinpath('fake-repo-tmpl.zip')
@@ -246,14 +246,7 @@ def test_unzip_url_existing_cache(mocker, clone_dir) -> None:
 
 def test_unzip_url_existing_cache_no_input(mocker, clone_dir) -> None:
     """If no_input is provided, the existing file should be removed."""
-    request = mocker.MagicMock()
-    request.iter_content.return_value = mock_download()
-
-    mocker.patch(
-        'cookiecutter.zipfile.requests.get',
-        return_value=request,
-        autospec=True,
-    )
+    mock_session_get(mocker, mock_download())
 
     # Create an existing cache of the zipfile
     existing_zip = clone_dir.joinpath('fake-repo-tmpl.zip')
@@ -275,10 +268,7 @@ def test_unzip_should_abort_if_no_redownload(mocker, clone_dir) -> None:
         'cookiecutter.zipfile.prompt_and_delete', side_effect=SystemExit, autospec=True
     )
 
-    mock_requests_get = mocker.patch(
-        'cookiecutter.zipfile.requests.get',
-        autospec=True,
-    )
+    mock_requests_get = mock_session_get(mocker)
 
     # Create an existing cache of the zipfile
     existing_zip = clone_dir.joinpath('fake-repo-tmpl.zip')
@@ -312,3 +302,109 @@ def test_unzip_is_ok_to_reuse(mocker, clone_dir) -> None:
     assert output_dir.startswith(tempfile.gettempdir())
     assert mock_prompt_and_delete.call_count == 1
     assert request.iter_content.call_count == 0
+
+
+def test_unzip_url_reuse_existing(mocker, clone_dir) -> None:
+    """An already downloaded zipfile should be reused as is when asked to."""
+    mock_prompt_and_delete = mocker.patch(
+        'cookiecutter.zipfile.prompt_and_delete', return_value=True, autospec=True
+    )
+    mock_requests_get = mock_session_get(mocker)
+    shutil.copy('tests/files/fake-repo-tmpl.zip', clone_dir)
+
+    output_dir = zipfile.unzip(
+        'https://example.com/path/to/fake-repo-tmpl.zip',
+        is_url=True,
+        clone_to_dir=str(clone_dir),
+        no_input=True,
+        reuse_existing=True,
+    )
+
+    assert output_dir.startswith(tempfile.gettempdir())
+    assert not mock_prompt_and_delete.called
+    assert not mock_requests_get.called
+
+
+def test_unzip_cache_reuses_extracted_tree(mocker, tmp_path) -> None:
+    """A zipfile unpacked into the cache before should not be unpacked again."""
+    extractall = mocker.spy(ZipFile, 'extractall')
+    cache_dir = tmp_path.joinpath('cache')
+
+    first = zipfile.unzip(
+        'tests/files/fake-repo-tmpl.zip', is_url=False, cache_dir=cache_dir
+    )
+    second = zipfile.unzip(
+        'tests/files/fake-repo-tmpl.zip', is_url=False, cache_dir=cache_dir
+    )
+
+    assert first == second
+    assert first.startswith(str(cache_dir.joinpath(zipfile.ARCHIVES_DIR_NAME)))
+    assert Path(first, 'cookiecutter.json').is_file()
+    assert extractall.call_count == 1
+    assert [p.name for p in cache_dir.joinpath('archives').iterdir()] == [
+        Path(first).parent.name
+    ]
+
+
+def test_unzip_cache_locked_while_used(tmp_path) -> None:
+    """A zipfile unpacked into the cache should not be pruned while used."""
+    pytest.importorskip('fcntl')
+    cache_dir = tmp_path.joinpath('cache')
+
+    with contextlib.ExitStack() as lock_stack:
+        unzip_path = zipfile.unzip(
+            'tests/files/fake-repo-tmpl.zip',
+            is_url=False,
+            cache_dir=cache_dir,
+            lock_stack=lock_stack,
+        )
+        prune_cache(cache_dir, max_size=0)
+        assert Path(unzip_path, 'cookiecutter.json').is_file()
+
+    prune_cache(cache_dir, max_size=0)
+    assert not Path(unzip_path).exists()
+
+
+def test_unzip_cache_keys_on_content(tmp_path) -> None:
+    """A zipfile with different content should be unpacked on its own."""
+    cache_dir = tmp_path.joinpath('cache')
+    changed_zip = tmp_path.joinpath('fake-repo-tmpl.zip')
+    shutil.copy('tests/files/fake-repo-tmpl.zip', changed_zip)
+    with changed_zip.open('ab') as fh:
+        fh.write(b'trailing bytes')
+
+    first = zipfile.unzip(
+        'tests/files/fake-repo-tmpl.zip', is_url=False, cache_dir=cache_dir
+    )
+    second = zipfile.unzip(str(changed_zip), is_url=False, cache_dir=cache_dir)
+
+    assert first != second
+
+
+def test_unzip_cache_protected_not_cached(tmp_path) -> None:
+    """A protected zipfile is unpacked into a temporary directory every time."""
+    cache_dir = tmp_path.joinpath('cache')
+    first = zipfile.unzip(
+        'tests/files/protected-fake-repo-tmpl.zip',
+        is_url=False,
+        password='sekrit',
+        cache_dir=cache_dir,
+    )
+    assert not zipfile.in_archive_cache(first, cache_dir)
+    assert not cache_dir.joinpath(zipfile.ARCHIVES_DIR_NAME).exists()
+
+    with pytest.raises(InvalidZipRepository):
+        zipfile.unzip(
+            'tests/files/protected-fake-repo-tmpl.zip',
+            is_url=False,
+            password='wrong',
+            cache_dir=cache_dir,
+        )
+    second = zipfile.unzip(
+        'tests/files/protected-fake-repo-tmpl.zip',
+        is_url=False,
+        password='sekrit',
+        cache_dir=cache_dir,
+    )
+
+    assert second != first